@@ -0,0 +1,143 @@
+import argparse
+import sys
+import time
+from os import path
+
+import pandas as pd
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'etl'))
+
+from overall_records import aggregate_batting, aggregate_bowling, aggregate_fielding
+from synthetic import synthetic_batting_frame, synthetic_bowling_frame, synthetic_fielding_frame
+
+
+# Columns whose definition changed since the lambda version (see career_metrics.py and
+# best_hs in overall_records.py)
+RECOMPUTED_COLUMNS = ['HS', 'Not_out_status', 'Ave', 'SR', 'Overs', 'Ave_bowl', 'Econ', 'SR_bowl', 'D/I']
+
+
+# --- REFERENCE: the per-group lambda aggregations these functions replaced ---
+def legacy_aggregate_batting(df_bat):
+    numeric_cols = ['Mat', 'Inns', 'NO', 'Runs', 'HS_Numeric', 'BF', 'Fours', 'Sixes', 'Ducks', 'Fifties', 'Hundreds']
+    for col in numeric_cols:
+        df_bat[col] = pd.to_numeric(df_bat[col], errors='coerce').fillna(0)
+    df_bat['Player_ID'] = pd.to_numeric(df_bat['Player_ID'], errors='coerce').fillna(0).astype(int)
+    df_bat_grouped = df_bat.groupby('Player', as_index=False).agg({
+        'Player_ID': 'first', 'Full_Name': 'first',
+        'Season': lambda x: x.nunique(),
+        'Mat': 'sum', 'Inns': 'sum', 'NO': 'sum', 'Runs': 'sum',
+        'HS': 'first', 'HS_Numeric': 'max', 'Not_out_status': 'first',
+        'Ave': lambda x: pd.to_numeric(x, errors='coerce').mean(skipna=True),
+        'BF': 'sum', 'SR': lambda x: pd.to_numeric(x, errors='coerce').mean(skipna=True),
+        'Hundreds': 'sum', 'Fifties': 'sum', 'Ducks': 'sum', 'Fours': 'sum', 'Sixes': 'sum'
+    })
+    df_bat_grouped = df_bat_grouped.rename(columns={'Season': 'Seasons_Played'})
+    df_bat_grouped['Player_ID'] = df_bat_grouped['Player_ID'].replace(0, pd.NA).combine_first(df_bat_grouped['Player_ID'])
+    return df_bat_grouped
+
+
+def legacy_aggregate_bowling(df_bowl):
+    numeric_cols = ['Mat', 'Inns', 'Overs', 'Mdns', 'Runs', 'Wkts', 'Ave', 'Econ', 'SR', '4_Wkts', '5_Wkts']
+    for col in numeric_cols:
+        df_bowl[col] = pd.to_numeric(df_bowl[col], errors='coerce').fillna(0)
+    df_bowl['Player_ID'] = pd.to_numeric(df_bowl['Player_ID'], errors='coerce').fillna(0).astype(int)
+    df_bowl['BBI'] = df_bowl['BBI'].astype(str).str.strip()
+    df_bowl['BBI'] = df_bowl['BBI'].apply(lambda x: x if '/' in x else '-')
+
+    def best_bbi(series):
+        valid = [s for s in series if isinstance(s, str) and '/' in s]
+        if not valid:
+            return '-'
+        try:
+            parsed = [(int(s.split('/')[0]), int(s.split('/')[1])) for s in valid]
+            best = sorted(parsed, key=lambda x: (-x[0], x[1]))[0]
+            return f"{best[0]}/{best[1]}"
+        except Exception:
+            return valid[0]
+
+    df_bowl_grouped = df_bowl.groupby(['Player'], as_index=False).agg({
+        'Player_ID': 'first', 'Full_Name': 'first',
+        'Season': lambda x: x.nunique(),
+        'Mat': 'sum', 'Inns': 'sum', 'Overs': 'sum', 'Mdns': 'sum', 'Runs': 'sum', 'Wkts': 'sum',
+        'BBI': best_bbi,
+        'Ave': lambda x: pd.to_numeric(x, errors='coerce').mean(skipna=True),
+        'Econ': lambda x: pd.to_numeric(x, errors='coerce').mean(skipna=True),
+        'SR': lambda x: pd.to_numeric(x, errors='coerce').mean(skipna=True),
+        '4_Wkts': 'sum', '5_Wkts': 'sum'
+    })
+    df_bowl_grouped = df_bowl_grouped.rename(columns={
+        'Season': 'Seasons_Played', 'Mat': 'Mat_bowl', 'Inns': 'Inns_bowl', 'Runs': 'Runs_bowl',
+        'Ave': 'Ave_bowl', 'SR': 'SR_bowl'
+    })
+    df_bowl_grouped['BBI'] = df_bowl_grouped['BBI'].astype(str)
+    return df_bowl_grouped
+
+
+def legacy_aggregate_fielding(df_field):
+    df_field['MD_Full_String'] = df_field['MD'].astype(str)
+    df_field['MD_Numeric'] = df_field['MD'].astype(str).str.extract(r'(\d+)').fillna(0)
+    df_field['MD_Numeric'] = pd.to_numeric(df_field['MD_Numeric'], errors='coerce').fillna(0)
+    for col in ['Mat_field', 'Inns_field', 'Dis', 'Ct', 'St', 'Ct_Wk', 'Ct_Fi', 'D/I']:
+        df_field[col] = pd.to_numeric(df_field[col], errors='coerce').fillna(0)
+    df_field['Player_ID'] = pd.to_numeric(df_field['Player_ID'], errors='coerce').fillna(0).astype(int)
+
+    def get_max_md_string(series):
+        valid = [s for s in series if s not in ['0', 'nan', '-', '0.0'] and '(' in s]
+        if valid:
+            return max(valid, key=len)
+        valid_fallback = [s for s in series if s not in ['0', 'nan', '-', '0.0']]
+        if valid_fallback:
+            return valid_fallback[0]
+        return '-'
+
+    df_field_grouped = df_field.groupby(['Player'], as_index=False).agg({
+        'Player_ID': 'first', 'Full_Name': 'first',
+        'Season': lambda x: x.nunique(),
+        'Mat_field': 'sum', 'Inns_field': 'sum', 'Dis': 'sum', 'Ct': 'sum', 'St': 'sum',
+        'Ct_Wk': 'sum', 'Ct_Fi': 'sum', 'MD_Numeric': 'sum',
+        'MD_Full_String': get_max_md_string,
+        'D/I': 'mean'
+    })
+    df_field_grouped = df_field_grouped.rename(columns={'Season': 'Seasons_Played', 'MD_Full_String': 'MD_String'})
+    return df_field_grouped.drop(columns=['MD_Numeric'], errors='ignore').rename(columns={'MD_String': 'MD'})
+# -------------------------------------
+
+
+def _time(func, df, repeat):
+    """Best wall time of `repeat` runs, each on a fresh copy of the input."""
+    best, result = None, None
+    for _ in range(repeat):
+        data = df.copy()
+        start = time.perf_counter()
+        result = func(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(n_players=100_000, n_seasons=20, repeat=1):
+    print(f"--- Aggregation benchmark: {n_players:,} players x {n_seasons} seasons ---")
+    cases = [
+        ('Batting', synthetic_batting_frame, legacy_aggregate_batting, aggregate_batting),
+        ('Bowling', synthetic_bowling_frame, legacy_aggregate_bowling, aggregate_bowling),
+        ('Fielding', synthetic_fielding_frame, legacy_aggregate_fielding, aggregate_fielding),
+    ]
+    print(f"{'Stage':<10}{'Rows':>12}{'Lambda (s)':>14}{'Vectorized (s)':>17}{'Speedup':>10}")
+    for name, make_frame, legacy_func, new_func in cases:
+        df = make_frame(n_players, n_seasons)
+        legacy_time, expected = _time(legacy_func, df, repeat)
+        new_time, actual = _time(new_func, df, repeat)
+        # Same result, except the career ratios (and Overs) that are now computed from totals
+        # instead of averaging the seasonal values
+        shared = [c for c in expected.columns if c not in RECOMPUTED_COLUMNS]
+        pd.testing.assert_frame_equal(actual[shared], expected[shared], check_dtype=False, check_exact=False, rtol=1e-9)
+        print(f"{name:<10}{len(df):>12,}{legacy_time:>14.2f}{new_time:>17.2f}{legacy_time / new_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lambda vs vectorized groupby aggregations in overall_records.")
+    parser.add_argument('--players', type=int, default=100_000)
+    parser.add_argument('--seasons', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    run_benchmark(args.players, args.seasons, args.repeat)
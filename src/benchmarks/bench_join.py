@@ -0,0 +1,107 @@
+import argparse
+import sys
+import time
+import tracemalloc
+from os import path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'etl'))
+
+from overall_records import aggregate_batting, aggregate_bowling, aggregate_fielding
+from player_join import multiway_join
+from synthetic import synthetic_batting_frame, synthetic_bowling_frame, synthetic_fielding_frame
+
+# --- CONFIGURATION ---
+BOWLER_SHARE = 0.6 # Share of players with a bowling row
+FIELDER_SHARE = 0.95
+# -------------------------------------
+
+
+# --- REFERENCE: the chained string-keyed outer merges multiway_join replaced ---
+def legacy_join(df_bat_grouped, df_bowl_grouped, df_field_grouped, span):
+    df_final = pd.merge(
+        df_bat_grouped.drop(columns=['Seasons_Played', 'Player_ID', 'Span_Years'], errors='ignore'),
+        df_bowl_grouped.drop(columns=['Seasons_Played', 'Player_ID', 'Full_Name', 'Span_Years'], errors='ignore'),
+        on="Player", how="outer", suffixes=('_bat', '_bowl'))
+    df_final = pd.merge(
+        df_final,
+        df_field_grouped.drop(columns=['Seasons_Played', 'Player_ID', 'Full_Name', 'Span_Years'], errors='ignore'),
+        on="Player", how="outer", suffixes=('_bat_bowl', '_field'))
+    df_final = pd.merge(df_final, span[['Player', 'Span_Years']], on='Player', how='left')
+
+    df_seasons = pd.concat([
+        df_bat_grouped[['Player', 'Seasons_Played']].rename(columns={'Seasons_Played': 'SP_bat'}),
+        df_bowl_grouped[['Player', 'Seasons_Played']].rename(columns={'Seasons_Played': 'SP_bowl'}),
+        df_field_grouped[['Player', 'Seasons_Played']].rename(columns={'Seasons_Played': 'SP_field'})
+    ]).groupby('Player').max().reset_index()
+    df_seasons['Seasons_Played'] = df_seasons[['SP_bat', 'SP_bowl', 'SP_field']].max(axis=1)
+    df_final = pd.merge(df_final, df_seasons[['Player', 'Seasons_Played']], on='Player', how='left')
+
+    df_ids = pd.concat([
+        df_bat_grouped[['Player', 'Player_ID']],
+        df_bowl_grouped[['Player', 'Player_ID']],
+        df_field_grouped[['Player', 'Player_ID']]
+    ]).groupby('Player')['Player_ID'].max().reset_index()
+    df_final = pd.merge(df_final, df_ids.rename(columns={'Player_ID': 'Player_ID_master'}), on='Player', how='left')
+    df_final['Player_ID'] = df_final['Player_ID_master'].fillna(0).astype(int)
+    return df_final.drop(columns=['Player_ID_master'], errors='ignore')
+# -------------------------------------
+
+
+def keyed_join(df_bat_grouped, df_bowl_grouped, df_field_grouped, span):
+    """The join as combine_all_records now does it."""
+    per_table = lambda suffix: {'Seasons_Played': f'SP{suffix}', 'Player_ID': f'ID{suffix}'}
+    df_final = multiway_join(
+        [df_bat_grouped.drop(columns=['Span_Years'], errors='ignore').rename(columns=per_table('_bat')),
+         df_bowl_grouped.drop(columns=['Full_Name', 'Span_Years'], errors='ignore').rename(columns=per_table('_bowl')),
+         df_field_grouped.drop(columns=['Full_Name', 'Span_Years'], errors='ignore').rename(columns=per_table('_field'))],
+        on='Player', suffixes=['_bat', '_bowl', '_field', '_span'], attach=[span[['Player', 'Span_Years']]])
+    df_final['Seasons_Played'] = df_final[['SP_bat', 'SP_bowl', 'SP_field']].max(axis=1)
+    df_final['Player_ID'] = df_final[['ID_bat', 'ID_bowl', 'ID_field']].max(axis=1).fillna(0).astype(int)
+    return df_final
+
+
+def _measure(func, tables):
+    """(wall seconds, peak traced MB, result) of one run."""
+    start = time.perf_counter()
+    func(*tables)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = func(*tables)
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def run_benchmark(n_players=50_000, n_seasons=18):
+    print(f"--- Player join benchmark: {n_players:,} players x {n_seasons} seasons ---")
+    df_bat = synthetic_batting_frame(n_players, n_seasons)
+    tables = [aggregate_batting(df_bat), aggregate_bowling(synthetic_bowling_frame(n_players, n_seasons)),
+              aggregate_fielding(synthetic_fielding_frame(n_players, n_seasons))]
+    # As in the real tables, not every player bowls (and a few never field), so the player
+    # sets differ and no join can reuse a table's row order as is
+    rng = np.random.default_rng(0)
+    tables[1] = tables[1][rng.random(len(tables[1])) < BOWLER_SHARE].reset_index(drop=True)
+    tables[2] = tables[2][rng.random(len(tables[2])) < FIELDER_SHARE].reset_index(drop=True)
+    span = df_bat.groupby('Player')['Season'].agg(['min', 'max']).reset_index()
+    span['Span_Years'] = span['min'].astype(str) + '-' + span['max'].astype(str)
+
+    legacy_time, legacy_peak, expected = _measure(legacy_join, tables + [span])
+    new_time, new_peak, actual = _measure(keyed_join, tables + [span])
+    shared = [c for c in expected.columns if c in actual.columns]
+    pd.testing.assert_frame_equal(actual[shared], expected[shared], check_dtype=False)
+
+    print(f"{'Join':<14}{'Time (s)':>10}{'Peak (MB)':>12}")
+    print(f"{'Chained merge':<14}{legacy_time:>10.2f}{legacy_peak:>12.1f}")
+    print(f"{'Integer key':<14}{new_time:>10.2f}{new_peak:>12.1f}")
+    print(f"Speedup {legacy_time / new_time:.1f}x, peak memory {new_peak / legacy_peak:.0%} of the chained merges")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chained outer merges vs the integer-keyed multiway join.")
+    parser.add_argument('--players', type=int, default=50_000)
+    parser.add_argument('--seasons', type=int, default=18)
+    args = parser.parse_args()
+    run_benchmark(args.players, args.seasons)
@@ -0,0 +1,217 @@
+import argparse
+import csv
+import gc
+import io
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from os import path
+
+import numpy as np
+import pandas as pd
+
+ETL_DIR = path.join(path.dirname(path.abspath(__file__)), '..', 'etl')
+sys.path.insert(0, ETL_DIR)
+
+import clean_excel
+import instrumentation
+import parquet_output
+from json_ingest import load_season_json
+from overall_records import combine_all_records
+from synthetic import RAW_WORKBOOKS, write_synthetic_inputs
+
+# --- CONFIGURATION ---
+MERGE_SCRIPT = path.join(ETL_DIR, '..', 'scraper', 'merge_csk_player_data.py')
+
+# Stage -> description; run in this order for every size
+STAGES = {
+    'clean_in_place': 'clean_excel.transform_*_sheets (openpyxl insert/delete_cols)',
+    'clean_columnar': 'clean_excel.transform_sheets_columnar',
+    'json_ingest': 'json_ingest.load_season_json',
+    'combine': 'overall_records.combine_all_records',
+    'merge_csk': 'scraper/merge_csk_player_data.py'
+}
+
+# Sizes of a scaling run when --sizes is not given, for each axis
+DEFAULT_SIZES = {
+    'players': [50, 100, 200, 400],
+    'seasons': [4, 8, 16, 32],
+    'teams': [1, 2, 4, 8]
+}
+
+# A log-log slope above this (time or memory against size) is flagged as superlinear
+SUPERLINEAR_SLOPE = 1.3
+# -------------------------------------
+
+
+def _reset_registry():
+    """Empties clean_excel's in-memory player registry so every run assigns IDs from scratch."""
+    clean_excel.GLOBAL_PLAYER_ID_MAP.clear()
+    clean_excel.PLAYER_ID_BY_FULL_NAME.clear()
+    clean_excel._REGISTRY_PERSISTED.clear()
+    clean_excel.CURRENT_PLAYER_ID_COUNTER = 1
+
+
+def _clean_in_place(team_dirs):
+    transforms = {'Batting': clean_excel.transform_batting_sheets, 'Bowling': clean_excel.transform_bowling_sheets,
+                  'Fielding': clean_excel.transform_fielding_sheets}
+    for team_dir in team_dirs.values():
+        for record_type, transform in transforms.items():
+            transform(path.join(team_dir, RAW_WORKBOOKS[record_type]))
+
+
+def _clean_columnar(team_dirs):
+    for team_dir in team_dirs.values():
+        for record_type, file_name in RAW_WORKBOOKS.items():
+            clean_excel.transform_sheets_columnar(record_type, path.join(team_dir, file_name))
+
+
+def _json_ingest(team_dirs):
+    """Cleaned tables of every team, with each season's rows of all teams in one table."""
+    records = {}
+    for team_dir in team_dirs.values():
+        for record_type in RAW_WORKBOOKS:
+            for sheet_name, df in load_season_json(record_type, team_dir).items():
+                records.setdefault(record_type, {}).setdefault(sheet_name, []).append(df)
+    return {record_type: {sheet_name: pd.concat(frames, ignore_index=True) for sheet_name, frames in sheets.items()}
+            for record_type, sheets in records.items()}
+
+
+def _merge_csk(team_dirs):
+    """Runs the merge script once per team, from a working directory laid out as it expects."""
+    cwd = os.getcwd()
+    try:
+        for team_dir in team_dirs.values():
+            raw_dir = path.join(team_dir, 'data', 'raw_temp')
+            os.makedirs(raw_dir, exist_ok=True)
+            for file_name in RAW_WORKBOOKS.values():
+                shutil.copy(path.join(team_dir, file_name), raw_dir)
+            os.chdir(team_dir)
+            runpy.run_path(MERGE_SCRIPT, run_name='__main__')
+    finally:
+        os.chdir(cwd)
+
+
+def _measure(func, memory):
+    """(wall seconds, peak traced MB or None, result); tracing slows the run, so it is optional."""
+    gc.collect()
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()): # The ETL scripts print a line per sheet
+        result = func()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def run_stages(n_players, n_seasons, n_teams, stages=None, memory=False, work_dir=None):
+    """
+    Generates one synthetic input set and runs each ETL stage on it, with every output
+    redirected to a scratch directory. Returns [{stage, players, seasons, teams, rows, seconds, peak_mb}].
+    """
+    stages = stages or list(STAGES)
+    work_dir = tempfile.mkdtemp(prefix='csk_bench_', dir=work_dir)
+    out_dir = path.join(work_dir, 'final_excel')
+    os.makedirs(out_dir)
+    saved_dirs = clean_excel.OUTPUT_DIR, clean_excel.PARQUET_DIR
+    clean_excel.OUTPUT_DIR, clean_excel.PARQUET_DIR = out_dir, path.join(out_dir, 'parquet')
+
+    try:
+        team_dirs = write_synthetic_inputs(path.join(work_dir, 'raw'), n_players, n_seasons, n_teams)
+        _, _, records = _measure(lambda: _json_ingest(team_dirs), False)
+        rows = sum(len(df) for sheets in records.values() for df in sheets.values())
+
+        runners = {
+            'clean_in_place': lambda: _clean_in_place(team_dirs),
+            'clean_columnar': lambda: _clean_columnar(team_dirs),
+            'json_ingest': lambda: _json_ingest(team_dirs),
+            'combine': lambda: combine_all_records(records, base_path=out_dir),
+            'merge_csk': lambda: _merge_csk(team_dirs)
+        }
+        results = []
+        for stage in stages:
+            _reset_registry()
+            instrumentation.start_run(stage) # Drops the spans collected by the previous stage
+            seconds, peak_mb, _ = _measure(runners[stage], memory)
+            results.append({'stage': stage, 'players': n_players, 'seasons': n_seasons, 'teams': n_teams,
+                            'rows': rows, 'seconds': seconds, 'peak_mb': peak_mb})
+        return results
+    finally:
+        clean_excel.OUTPUT_DIR, clean_excel.PARQUET_DIR = saved_dirs
+        _reset_registry()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def scaling_slope(sizes, values):
+    """Log-log slope of values against sizes: ~1 is linear, ~2 quadratic (NaN if undefined)."""
+    sizes, values = np.asarray(sizes, dtype=float), np.asarray(values, dtype=float)
+    ok = (values > 0) & np.isfinite(values)
+    if ok.sum() < 2 or len(np.unique(sizes[ok])) < 2:
+        return float('nan')
+    return float(np.polyfit(np.log(sizes[ok]), np.log(values[ok]), 1)[0])
+
+
+def run_scaling(axis, sizes, players, seasons, teams, stages=None, memory=False, csv_path=None):
+    """
+    Runs every stage at each size along one axis (players, seasons or teams), the other two
+    fixed, and prints the time/memory curve of each stage with its fitted scaling exponent.
+    """
+    base = {'players': players, 'seasons': seasons, 'teams': teams}
+    print(f"--- Pipeline scaling along {axis}: {sizes} "
+          f"(players={players}, seasons={seasons}, teams={teams}, formats={parquet_output.OUTPUT_FORMATS}) ---")
+    results = []
+    for size in sizes:
+        dims = {**base, axis: size}
+        results.extend(run_stages(dims['players'], dims['seasons'], dims['teams'], stages, memory))
+        print(f"  {axis}={size}: {results[-1]['rows']:,} season rows done")
+
+    df = pd.DataFrame(results)
+    rows_by_size = df.groupby(axis)['rows'].first()
+    header = f"{'Stage':<16}" + ''.join(f"{f'{axis}={s}':>14}" for s in sizes) + f"{'Slope':>8}"
+    for metric, unit in [('seconds', 's'), ('peak_mb', 'MB')] if memory else [('seconds', 's')]:
+        print(f"\n{metric} ({unit}), slope = log-log exponent against season rows:")
+        print(header)
+        for stage, group in df.groupby('stage', sort=False):
+            values = group.set_index(axis)[metric]
+            slope = scaling_slope(rows_by_size[values.index], values)
+            flag = '  <- superlinear' if slope > SUPERLINEAR_SLOPE else ''
+            print(f"{stage:<16}" + ''.join(f"{v:>14.2f}" for v in values) + f"{slope:>8.2f}{flag}")
+
+    if csv_path:
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"\n✅ Results saved to {csv_path}")
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Times (and optionally memory-profiles) every ETL stage on "
+                                                 "synthetic inputs of growing size.")
+    parser.add_argument('--axis', choices=list(DEFAULT_SIZES), default='players')
+    parser.add_argument('--sizes', type=lambda s: [int(v) for v in s.split(',')],
+                        help="comma-separated sizes along --axis (default depends on the axis)")
+    parser.add_argument('--players', type=int, default=100, help="players per team")
+    parser.add_argument('--seasons', type=int, default=16)
+    parser.add_argument('--teams', type=int, default=1)
+    parser.add_argument('--stages', type=lambda s: s.split(','), help=f"subset of {','.join(STAGES)}")
+    parser.add_argument('--formats', type=lambda s: tuple(s.split(',')),
+                        help="override OUTPUT_FORMATS, e.g. excel or excel,parquet")
+    parser.add_argument('--memory', action='store_true', help="also record peak traced memory (slower)")
+    parser.add_argument('--csv', help="write the raw measurements to this CSV file")
+    args = parser.parse_args()
+
+    if args.formats:
+        parquet_output.OUTPUT_FORMATS = args.formats
+    run_scaling(args.axis, args.sizes or DEFAULT_SIZES[args.axis], args.players, args.seasons, args.teams,
+                args.stages, args.memory, args.csv)
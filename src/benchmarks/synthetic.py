@@ -0,0 +1,221 @@
+import json
+import os
+from os import path
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+# --- CONFIGURATION ---
+FIRST_SEASON = 2008
+PARTICIPATION = 0.5 # Chance that a player appears in a given season
+
+# Raw season sheets as scrape_players_seasonwise.js writes them: Statsguru headers in page
+# order, every value a string, and the empty trailing colNN column
+RAW_HEADERS = {
+    'Batting': ['0', '50', '100', 'Player', 'Mat', 'Inns', 'NO', 'Runs', 'HS', 'Ave', 'BF', 'SR', '4s', '6s', 'col15'],
+    'Bowling': ['4', '5', 'Player', 'Mat', 'Inns', 'Overs', 'Mdns', 'Runs', 'Wkts', 'BBI', 'Ave', 'Econ', 'SR', 'col14'],
+    'Fielding': ['Player', 'Mat', 'Inns', 'Dis', 'Ct', 'St', 'Ct Wk', 'Ct Fi', 'MD', 'D/I', 'col11']
+}
+# Cleaned column -> raw Statsguru header (the reverse of the renames in clean_excel.py)
+RAW_NAMES = {
+    'Batting': {'Ducks': '0', 'Fifties': '50', 'Hundreds': '100', 'Fours': '4s', 'Sixes': '6s'},
+    'Bowling': {'4_Wkts': '4', '5_Wkts': '5'},
+    'Fielding': {'Mat_field': 'Mat', 'Inns_field': 'Inns', 'Ct_Wk': 'Ct Wk', 'Ct_Fi': 'Ct Fi'}
+}
+# File names the pipeline expects for each record type
+RAW_WORKBOOKS = {
+    'Batting': 'batting_records_csk.xlsx',
+    'Bowling': 'bowling_records_csk.xlsx',
+    'Fielding': 'fielding_records_csk.xlsx'
+}
+RAW_JSON_PREFIXES = {
+    'Batting': 'batting',
+    'Bowling': 'bowling',
+    'Fielding': 'fielding'
+}
+# -------------------------------------
+
+
+def _player_names(n_players):
+    """Initials-style short names, unique per player (e.g. 'AB Player00042')."""
+    width = len(str(n_players))
+    return np.array([f"{chr(65 + i % 26)}{chr(65 + (i // 26) % 26)} Player{i:0{width}d}" for i in range(n_players)])
+
+
+def _season_rows(n_players, n_seasons, rng):
+    """(player index, season) pairs for every player-season that exists."""
+    mask = rng.random((n_players, n_seasons)) < PARTICIPATION
+    mask[np.arange(n_players), rng.integers(0, n_seasons, n_players)] = True # Every player plays at least once
+    player_idx, season_idx = np.nonzero(mask)
+    return player_idx, FIRST_SEASON + season_idx
+
+
+def _with_dashes(values, rng, share=0.1):
+    """Formats numbers as text and replaces a share of them with '-' like Statsguru does."""
+    text = values.astype(str).astype(object)
+    text[rng.random(len(text)) < share] = '-'
+    return text
+
+
+def synthetic_batting_frame(n_players, n_seasons, seed=0):
+    """Concatenated season rows in the shape read_all_sheets('Batting') returns."""
+    rng = np.random.default_rng(seed)
+    names = _player_names(n_players)
+    player_idx, seasons = _season_rows(n_players, n_seasons, rng)
+    n = len(player_idx)
+    inns = rng.integers(1, 17, n)
+    not_outs = rng.integers(0, 4, n).clip(max=inns)
+    runs = rng.integers(0, 700, n)
+    hs = rng.integers(0, 120, n)
+    hs_text = np.where(rng.random(n) < 0.2, np.char.add(hs.astype(str), '*'), hs.astype(str)).astype(object)
+    hs_text[rng.random(n) < 0.05] = '-'
+    no_innings = hs_text == '-'
+    hs_numeric = np.where(no_innings, np.nan, hs)
+    not_out_status = np.where(no_innings, '-', np.where(np.char.endswith(hs_text.astype(str), '*'), 'Not Out', 'Out'))
+    balls = (runs * rng.uniform(0.6, 1.0, n)).astype(int) + 1
+    return pd.DataFrame({
+        'Player_ID': np.char.zfill((player_idx + 1).astype(str), 3),
+        'Player': names[player_idx],
+        'Full_Name': names[player_idx],
+        'Season': seasons,
+        'Mat': inns + rng.integers(0, 3, n),
+        'Inns': inns,
+        'NO': not_outs,
+        'Runs': runs,
+        'HS': hs_text,
+        'HS_Numeric': hs_numeric,
+        'Not_out_status': not_out_status,
+        'Ave': _with_dashes(np.round(runs / np.maximum(inns - not_outs, 1), 2), rng),
+        'BF': balls,
+        'SR': _with_dashes(np.round(100 * runs / balls, 2), rng),
+        'Fours': rng.integers(0, 60, n),
+        'Sixes': rng.integers(0, 30, n),
+        'Ducks': rng.integers(0, 3, n),
+        'Fifties': rng.integers(0, 5, n),
+        'Hundreds': rng.integers(0, 2, n),
+    })
+
+
+def synthetic_bowling_frame(n_players, n_seasons, seed=1):
+    """Concatenated season rows in the shape read_all_sheets('Bowling', dtype=str) returns."""
+    rng = np.random.default_rng(seed)
+    names = _player_names(n_players)
+    player_idx, seasons = _season_rows(n_players, n_seasons, rng)
+    n = len(player_idx)
+    overs = rng.integers(0, 60, n)
+    balls = rng.integers(0, 6, n)
+    runs = overs * 8 + balls + rng.integers(0, 40, n)
+    wkts = rng.integers(0, 25, n)
+    bbi = np.char.add(np.char.add(rng.integers(0, 6, n).astype(str), '/'), rng.integers(5, 60, n).astype(str)).astype(object)
+    bbi[rng.random(n) < 0.1] = '-'
+    df = pd.DataFrame({
+        'Player_ID': np.char.zfill((player_idx + 1).astype(str), 3),
+        'Player': names[player_idx],
+        'Full_Name': names[player_idx],
+        'Season': seasons,
+        'Mat': rng.integers(1, 17, n),
+        'Inns': rng.integers(1, 17, n),
+        'Overs': np.char.add(np.char.add(overs.astype(str), '.'), balls.astype(str)),
+        'Mdns': rng.integers(0, 3, n),
+        'Runs': runs,
+        'Wkts': wkts,
+        'BBI': bbi,
+        'Ave': _with_dashes(np.round(runs / np.maximum(wkts, 1), 2), rng),
+        'Econ': _with_dashes(np.round(runs / np.maximum(overs, 1), 2), rng),
+        'SR': _with_dashes(np.round(6 * overs / np.maximum(wkts, 1), 1), rng),
+        '4_Wkts': rng.integers(0, 2, n),
+        '5_Wkts': rng.integers(0, 2, n),
+    })
+    return df.astype(str)
+
+
+def synthetic_fielding_frame(n_players, n_seasons, seed=2):
+    """Concatenated season rows in the shape read_all_sheets('Fielding') returns."""
+    rng = np.random.default_rng(seed)
+    names = _player_names(n_players)
+    player_idx, seasons = _season_rows(n_players, n_seasons, rng)
+    n = len(player_idx)
+    ct = rng.integers(0, 12, n)
+    st = rng.integers(0, 3, n)
+    md_ct = rng.integers(0, 3, n)
+    md = np.char.add(np.char.add(np.char.add((md_ct + 1).astype(str), ' ('), md_ct.astype(str)), 'ct 1st)').astype(object)
+    md[rng.random(n) < 0.2] = '0'
+    md[rng.random(n) < 0.05] = '-'
+    mat = rng.integers(1, 17, n)
+    return pd.DataFrame({
+        'Player_ID': np.char.zfill((player_idx + 1).astype(str), 3),
+        'Player': names[player_idx],
+        'Full_Name': names[player_idx],
+        'Season': seasons,
+        'Mat_field': mat,
+        'Inns_field': mat,
+        'Dis': ct + st,
+        'Ct': ct,
+        'St': st,
+        'Ct_Wk': ct // 2,
+        'Ct_Fi': ct - ct // 2,
+        'MD': md,
+        'D/I': np.round((ct + st) / mat, 3),
+    })
+
+
+SYNTHETIC_FRAMES = {
+    'Batting': synthetic_batting_frame,
+    'Bowling': synthetic_bowling_frame,
+    'Fielding': synthetic_fielding_frame
+}
+
+
+def synthetic_raw_seasons(record_type, n_players, n_seasons, n_teams=1, seed=0):
+    """
+    Raw season tables for every team, as {team: {season: DataFrame}} with RAW_HEADERS columns
+    and string values ('' for blanks). Each team has its own squad of n_players, so a sheet
+    grows with players and the file count with seasons and teams.
+    """
+    df = SYNTHETIC_FRAMES[record_type](n_players * n_teams, n_seasons, seed=seed)
+    team = (df['Player_ID'].astype(int) - 1) // n_players
+    raw = df.rename(columns=RAW_NAMES[record_type]).reindex(columns=RAW_HEADERS[record_type])
+    raw = raw.astype(str).where(raw.notna(), '')
+    raw[RAW_HEADERS[record_type][-1]] = ''
+
+    tables = {}
+    for (t, season), rows in raw.groupby([team, df['Season']], sort=True):
+        tables.setdefault(t + 1, {})[int(season)] = rows.reset_index(drop=True)
+    return tables
+
+
+def write_raw_workbook(seasons, file_path):
+    """Writes {season: raw DataFrame} as one 'Season_YYYY' sheet per season, blanks left empty."""
+    wb = openpyxl.Workbook(write_only=True)
+    for season, df in seasons.items():
+        ws = wb.create_sheet(title=f"Season_{season}")
+        ws.append(list(df.columns))
+        for row in df.itertuples(index=False, name=None):
+            ws.append([value if value != '' else None for value in row])
+    wb.save(file_path)
+    return file_path
+
+
+def write_raw_json(record_type, seasons, out_dir):
+    """Writes {season: raw DataFrame} as '<prefix>_<season>.json' files of string records."""
+    for season, df in seasons.items():
+        file_path = path.join(out_dir, f"{RAW_JSON_PREFIXES[record_type]}_{season}.json")
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(df.to_dict(orient='records'), f, ensure_ascii=False)
+    return out_dir
+
+
+def write_synthetic_inputs(out_dir, n_players, n_seasons, n_teams=1, seed=0):
+    """
+    Writes raw workbooks and season JSON files for every record type into one directory per
+    team (<out_dir>/team_01, ...). Returns {team: directory}.
+    """
+    team_dirs = {}
+    for i, record_type in enumerate(RAW_HEADERS):
+        for team, seasons in synthetic_raw_seasons(record_type, n_players, n_seasons, n_teams, seed + i).items():
+            team_dir = team_dirs.setdefault(team, path.join(out_dir, f"team_{team:02d}"))
+            os.makedirs(team_dir, exist_ok=True)
+            write_raw_workbook(seasons, path.join(team_dir, RAW_WORKBOOKS[record_type]))
+            write_raw_json(record_type, seasons, team_dir)
+    return team_dirs
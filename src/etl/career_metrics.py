@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+# --- CONFIGURATION ---
+# Additive per-player statistics. Every career ratio below is a function of these, so they
+# can be summed across seasons (or added/subtracted for one season) without losing exactness.
+SUFFICIENT_STATS = ['Runs', 'Dismissals', 'BF', 'Runs_bowl', 'Wkts', 'Balls_bowl', 'Dis', 'Inns_field']
+
+# Ratio -> (numerator, denominator, scale, decimals). Statsguru truncates rather than rounds
+# (14 runs off 12 balls is shown as 116.66), and the career values follow the same rule.
+CAREER_RATIOS = {
+    'Ave': ('Runs', 'Dismissals', 1, 2),
+    'SR': ('Runs', 'BF', 100, 2),
+    'Ave_bowl': ('Runs_bowl', 'Wkts', 1, 2),
+    'Econ': ('Runs_bowl', 'Balls_bowl', 6, 2),
+    'SR_bowl': ('Balls_bowl', 'Wkts', 1, 1),
+    'D/I': ('Dis', 'Inns_field', 1, 3)
+}
+# -------------------------------------
+
+
+def overs_to_balls(overs):
+    """Converts cricket overs notation (37.2 = 37 overs and 2 balls) to a ball count."""
+    overs = pd.to_numeric(overs, errors='coerce').fillna(0)
+    whole = np.floor(overs)
+    return (whole * 6 + np.round((overs - whole) * 10)).astype(int)
+
+
+def balls_to_overs(balls):
+    """Converts a ball count back to overs notation (224 -> 37.2)."""
+    balls = pd.to_numeric(balls, errors='coerce').fillna(0).astype(int)
+    return balls // 6 + (balls % 6) / 10
+
+
+def parse_hs(hs):
+    """
+    Splits HS values ('100*', '95', '-') into (HS_Numeric, Not_out_status), vectorized:
+    the score as a nullable integer and 'Not Out' / 'Out', or '-' when there was no innings.
+    Blank or unreadable values give a missing score and status.
+    """
+    hs = pd.Series(hs, dtype=object)
+    text = hs.astype(str).str.strip()
+    score = pd.to_numeric(text.str.replace('*', '', regex=False), errors='coerce')
+    no_innings = text == '-'
+    readable = hs.notna() & score.notna()
+
+    status = pd.Series(np.where(text.str.contains('*', regex=False), 'Not Out', 'Out'), index=hs.index, dtype=object)
+    status = status.where(readable, None)
+    status[no_innings] = '-'
+    return score.where(readable).astype('Int64'), status
+
+
+def season_stats(df_bat=None, df_bowl=None, df_field=None):
+    """
+    Sufficient statistics per (Player, Season) from the cleaned season rows. Any of the
+    three frames may be omitted; missing statistics are 0.
+    """
+    parts = []
+    if df_bat is not None:
+        parts.append(pd.DataFrame({
+            'Player': df_bat['Player'], 'Season': df_bat['Season'],
+            'Runs': pd.to_numeric(df_bat['Runs'], errors='coerce').fillna(0),
+            'Dismissals': (pd.to_numeric(df_bat['Inns'], errors='coerce').fillna(0)
+                           - pd.to_numeric(df_bat['NO'], errors='coerce').fillna(0)),
+            'BF': pd.to_numeric(df_bat['BF'], errors='coerce').fillna(0)
+        }))
+    if df_bowl is not None:
+        parts.append(pd.DataFrame({
+            'Player': df_bowl['Player'], 'Season': df_bowl['Season'],
+            'Runs_bowl': pd.to_numeric(df_bowl['Runs'], errors='coerce').fillna(0),
+            'Wkts': pd.to_numeric(df_bowl['Wkts'], errors='coerce').fillna(0),
+            'Balls_bowl': overs_to_balls(df_bowl['Overs'])
+        }))
+    if df_field is not None:
+        parts.append(pd.DataFrame({
+            'Player': df_field['Player'], 'Season': df_field['Season'],
+            'Dis': pd.to_numeric(df_field['Dis'], errors='coerce').fillna(0),
+            'Inns_field': pd.to_numeric(df_field['Inns_field'], errors='coerce').fillna(0)
+        }))
+    if not parts:
+        return pd.DataFrame(columns=SUFFICIENT_STATS)
+
+    stats = pd.concat(parts, ignore_index=True)
+    stats['Season'] = pd.to_numeric(stats['Season'], errors='coerce')
+    stats = stats.reindex(columns=['Player', 'Season'] + SUFFICIENT_STATS).fillna({c: 0 for c in SUFFICIENT_STATS})
+    return stats.groupby(['Player', 'Season']).sum().sort_index()
+
+
+def career_stats(stats_by_season):
+    """Career totals per player: one groupby-sum over all sufficient statistics."""
+    return stats_by_season.groupby(level='Player').sum()
+
+
+def update_career_stats(career, new_season, old_season=None):
+    """
+    Applies one season's change to career totals without touching other seasons: adds the
+    new season's statistics and, when a season is being replaced, subtracts its old ones.
+    """
+    new_totals = career_stats(new_season)
+    updated = career.add(new_totals, fill_value=0)
+    if old_season is not None:
+        updated = updated.sub(career_stats(old_season), fill_value=0)
+    return updated
+
+
+def rolling_stats(stats_by_season, window):
+    """Per-player totals over each player's last `window` seasons played, at every season."""
+    return (stats_by_season.groupby(level='Player', group_keys=False)
+                           .rolling(window, min_periods=1).sum()
+                           .droplevel(0))
+
+
+def compute_ratios(stats, ratios=None):
+    """True career ratios (NaN where the denominator is 0), in one vectorized pass."""
+    out = {}
+    for name in ratios or CAREER_RATIOS:
+        numerator, denominator, scale, decimals = CAREER_RATIOS[name]
+        denom = stats[denominator].where(stats[denominator] != 0)
+        factor = 10 ** decimals
+        # Small epsilon so values such as 0.29 * 100 = 28.999... truncate to 29
+        out[name] = np.floor(scale * stats[numerator] / denom * factor + 1e-9) / factor
+    return pd.DataFrame(out, index=stats.index)
@@ -1,19 +1,32 @@
+import os
+import csv
 import openpyxl
 from os import path
+from concurrent.futures import ProcessPoolExecutor
 from openpyxl.utils import get_column_letter
+from openpyxl.cell import WriteOnlyCell
 import re
 import math # Used for safety checks
 
+from career_metrics import parse_hs
+from instrumentation import finish_run, span, start_run
+from parquet_output import columns_to_frame, excel_enabled, parquet_enabled, write_cleaned_seasons
+from player_names import NameResolver
+
 # --- CONFIGURATION: FILE PATHS ---
 # CHANGED: Input and output paths now use the 'final_excel' directory.
 INPUT_DIR = 'F:\\Data Analytics\\Projects\\csk_analysis\\data\\raw_temp'
 OUTPUT_DIR = 'F:\\Data Analytics\\Projects\\csk_analysis\\data\\final_excel'
 
-FILE_PATHS = {
-    'Batting': path.join(INPUT_DIR, 'batting_records_csk.xlsx'),
-    'Bowling': path.join(INPUT_DIR, 'bowling_records_csk.xlsx'),
-    'Fielding': path.join(INPUT_DIR, 'fielding_records_csk.xlsx')
-}
+# Team whose workbooks are cleaned (franchises.py runs every team in franchises.TEAMS)
+TEAM = 'csk'
+RAW_FILE_NAME = '{record}_records_{team}.xlsx'
+
+FILE_PATHS = {record_type: path.join(INPUT_DIR, RAW_FILE_NAME.format(record=record_type.lower(), team=TEAM))
+              for record_type in ['Batting', 'Bowling', 'Fielding']}
+
+# Parquet copies of the cleaned season tables (see OUTPUT_FORMATS in parquet_output.py)
+PARQUET_DIR = path.join(OUTPUT_DIR, 'parquet')
 
 # --- BATTING CONFIG ---
 BATTING_RENAMES = {
@@ -43,13 +56,52 @@ FIELDING_RENAMES = {
 }
 FIELDING_COLS_TO_DELETE = ['col11']
 
+# --- COLUMNAR ENGINE CONFIG ---
+# When True, run_all_transformations() uses the columnar engine (load once, transform in
+# memory, write once) instead of editing each worksheet in place with insert/delete_cols.
+USE_COLUMNAR_ENGINE = False
+
+# Worker processes for run_all_transformations(). Anything above 1 cleans the season sheets
+# in parallel with the columnar engine; 1 keeps the single-process run.
+PARALLEL_WORKERS = 1
+
+RECORD_CONFIGS = {
+    'Batting': {
+        'delete': BATTING_COLS_TO_DELETE,
+        'renames': BATTING_RENAMES,
+        'move_to_end': BATTING_COLS_TO_MOVE_TO_END,
+        'hs_columns': True,
+        'text_cols': []
+    },
+    'Bowling': {
+        'delete': BOWLING_COLS_TO_DELETE,
+        'renames': BOWLING_RENAMES,
+        'move_to_end': BOWLING_COLS_TO_MOVE_TO_END,
+        'hs_columns': False,
+        'text_cols': ['BBI']
+    },
+    'Fielding': {
+        'delete': FIELDING_COLS_TO_DELETE,
+        'renames': FIELDING_RENAMES,
+        'move_to_end': [],
+        'hs_columns': False,
+        'text_cols': []
+    }
+}
+
 # --- GLOBAL PLAYER ID & FULL NAME CONFIGURATION ---
 GLOBAL_PLAYER_ID_MAP = {}
 CURRENT_PLAYER_ID_COUNTER = 1
 
+# On-disk player registry (Player_ID, Player, Full_Name). Loaded before cleaning so known
+# players keep their IDs across runs; only newly seen players are appended afterwards.
+PLAYER_REGISTRY_PATH = path.join(OUTPUT_DIR, 'player_registry.csv')
+PLAYER_ID_BY_FULL_NAME = {} # Alias index: a new short name with a known full name reuses that ID
+_REGISTRY_PERSISTED = set() # Short names already written to the registry file
+
 FULL_PLAYER_NAMES = {
-    'A Flintoff': 'Andrew Flintoff', 'A Kamboj': 'Akash Kamboj', 'A Mhatre': 'Aniruddha Mhatre',
-    'A Mukund': 'Abhinav Mukund', 'A Nehra': 'Ashish Nehra', 'AM Rahane': 'Ajinkya Madhukar Rahane',
+    'A Flintoff': 'Andrew Flintoff', 'A Kamboj': 'Akash Kamboj', 'A Mhatre': 'Ayush Mhatre',
+    'A Mukund': 'Abhinav Mukund', 'AF Milne': 'Adam Fraser Milne', 'A Nehra': 'Ashish Nehra', 'AM Rahane': 'Ajinkya Madhukar Rahane',
     'AS Rajpoot': 'Ankit Singh Rajpoot', 'AT Rayudu': 'Ambati Tirupati Rayudu', 'Akash Singh': 'Akash Singh',
     'B Laughlin': 'Ben Laughlin', 'BA Stokes': 'Ben Andrew Stokes', 'BB McCullum': 'Brendon Barrie McCullum',
     'BW Hilfenhaus': 'Ben Warwick Hilfenhaus', 'CH Morris': 'Christopher Henry Morris', 'CJ Jordan': 'Christopher James Jordan',
@@ -71,13 +123,14 @@ FULL_PLAYER_NAMES = {
     'MM Sharma': 'Mohit Mahipal Sharma', 'MS Dhoni': 'Mahendra Singh Dhoni', 'MS Gony': 'Manpreet Singh Gony',
     'Monu Kumar': 'Monu Kumar', 'Mukesh Choudhary': 'Mukesh Choudhary', 'Mustafizur Rahman': 'Mustafizur Rahman',
     'N Jagadeesan': 'Narayan Jagadeesan', 'Noor Ahmad': 'Noor Ahmad Lakanwal', 'P Amarnath': 'P Amarnath',
+    'NLTC Perera': 'Narangoda Liyanaarachchilage Thisara Chirantha Perera',
     'P Negi': 'Pawan Negi', 'PA Patel': 'Parthiv Ajay Patel', 'PH Solanki': 'Prashant Harikisan Solanki',
     'PP Chawla': 'Piyush Pramod Chawla', 'R Ashwin': 'Ravichandran Ashwin', 'R Ravindra': 'Rachin Ravindra',
     'RA Jadeja': 'Ravindrasinh Anirudhsinh Jadeja', 'RA Tripathi': 'Rahul Ajay Tripathi', 'RD Gaikwad': 'Ruturaj Dashrat Gaikwad',
     'RG More': 'Rituraj Gajanan More', 'RJ Gleeson': 'Richard James Gleeson', 'RS Hangargekar': 'Rajvardhan Santosh Hangargekar',
     'RV Uthappa': 'Robin Venu Uthappa', 'S Anirudha': 'Srikkanth Anirudha', 'S Badree': 'Samuel Badree',
     'S Badrinath': 'Subramaniam Badrinath', 'S Dube': 'Shivam Dube', 'S Randiv': 'Suraj Randiv',
-    'S Tyagi': 'Shardul Thakur', 'S Vidyut': 'Suresh Vidyut', 'SB Jakati': 'Shadab Bashir Jakati',
+    'S Tyagi': 'Sudeep Tyagi', 'S Vidyut': 'Suresh Vidyut', 'SB Jakati': 'Shadab Bashir Jakati',
     'SB Styris': 'Scott Bernard Styris', 'SC Kuggeleijn': 'Scott Christopher Kuggeleijn', 'SK Raina': 'Suresh Kumar Raina',
     'SK Rasheed': 'Sk Rasheed', 'SM Curran': 'Samuel Matthew Curran', 'SN Thakur': 'Shardul Narendra Thakur',
     'SP Fleming': 'Stephen Paul Fleming', 'SR Watson': 'Shane Robert Watson', 'SSB Magala': 'Sisanda Sandile Bruce Magala',
@@ -86,6 +139,10 @@ FULL_PLAYER_NAMES = {
     'UM Patel': 'Urvil Manish Patel', 'V Shankar': 'Vijay Shankar', 'VY Mahesh': 'Veerabhadran Yele Mahesh',
     'WP Saha': 'Wriddhiman Prasanta Saha'
 }
+
+# Scorecard spellings are resolved against FULL_PLAYER_NAMES (see player_names.py); names it
+# cannot resolve keep their short name and are listed in unresolved_player_names.csv
+NAME_RESOLVER = NameResolver(FULL_PLAYER_NAMES)
 # -------------------------------------
 
 
@@ -153,13 +210,99 @@ def _move_columns_to_end(ws, col_names_to_move):
             print(f"    - Moved column '{col_name}' to the end ({get_column_letter(new_max_col)}).")
 
 
+# --- PLAYER REGISTRY ---
+def load_player_registry(registry_path=None):
+    """Loads the on-disk registry into GLOBAL_PLAYER_ID_MAP and resumes the ID counter after it."""
+    global CURRENT_PLAYER_ID_COUNTER
+
+    registry_path = registry_path or PLAYER_REGISTRY_PATH
+    if not path.exists(registry_path):
+        print(f"    - No player registry at {registry_path}, IDs will be assigned from scratch.")
+        return 0
+
+    with open(registry_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            player_name = row['Player']
+            GLOBAL_PLAYER_ID_MAP[player_name] = row['Player_ID']
+            # Same alias key as _get_or_assign_player_id, not the stored (possibly resolved) Full_Name
+            PLAYER_ID_BY_FULL_NAME.setdefault(FULL_PLAYER_NAMES.get(player_name, player_name), row['Player_ID'])
+            _REGISTRY_PERSISTED.add(player_name)
+            CURRENT_PLAYER_ID_COUNTER = max(CURRENT_PLAYER_ID_COUNTER, int(row['Player_ID']) + 1)
+
+    print(f"    - Loaded {len(_REGISTRY_PERSISTED)} players from registry {registry_path}.")
+    return len(_REGISTRY_PERSISTED)
+
+
+def read_player_registry(registry_path=None):
+    """
+    The on-disk registry as {Player: (Player_ID, Full_Name)}, read without touching the
+    in-memory registry; names that share a directory full name also map to the first one's ID.
+    """
+    registry_path = registry_path or PLAYER_REGISTRY_PATH
+    if not path.exists(registry_path):
+        return {}
+    players, by_full_name = {}, {}
+    with open(registry_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            players[row['Player']] = (int(row['Player_ID']), row['Full_Name'])
+            by_full_name.setdefault(FULL_PLAYER_NAMES.get(row['Player'], row['Player']), players[row['Player']])
+    # Aliases come from exact directory entries only, as in _get_or_assign_player_id
+    for player_name, full_name in FULL_PLAYER_NAMES.items():
+        if player_name not in players and full_name in by_full_name:
+            players[player_name] = by_full_name[full_name]
+    return players
+
+
+def save_player_registry(registry_path=None):
+    """Appends players that are not yet in the registry file; existing rows are never rewritten."""
+    registry_path = registry_path or PLAYER_REGISTRY_PATH
+    new_players = [p for p in GLOBAL_PLAYER_ID_MAP if p not in _REGISTRY_PERSISTED]
+    if not new_players:
+        return 0
+
+    write_header = not path.exists(registry_path)
+    with open(registry_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(['Player_ID', 'Player', 'Full_Name'])
+        for player_name in new_players:
+            writer.writerow([GLOBAL_PLAYER_ID_MAP[player_name], player_name, NAME_RESOLVER.full_name(player_name)])
+            _REGISTRY_PERSISTED.add(player_name)
+
+    print(f"    - Appended {len(new_players)} new player(s) to registry {registry_path}.")
+    return len(new_players)
+
+
+def report_unresolved_names(output_dir=None):
+    """Resolves every registered player name in one batch and writes the names left unresolved."""
+    NAME_RESOLVER.resolve(list(GLOBAL_PLAYER_ID_MAP)) # Also covers names seen by parallel workers
+    return NAME_RESOLVER.write_unresolved_report(output_dir or OUTPUT_DIR)
+
+
+def _get_or_assign_player_id(player_name):
+    """O(1) registry lookup; unknown names reuse an alias's ID or get the next free ID."""
+    global CURRENT_PLAYER_ID_COUNTER
+
+    player_id = GLOBAL_PLAYER_ID_MAP.get(player_name)
+    if player_id is not None:
+        return player_id
+
+    # Aliases come from exact directory entries only: a resolved guess must never merge two players
+    full_name = FULL_PLAYER_NAMES.get(player_name)
+    player_id = PLAYER_ID_BY_FULL_NAME.get(full_name) if full_name else None
+    if player_id is None:
+        player_id = f"{CURRENT_PLAYER_ID_COUNTER:03d}"
+        CURRENT_PLAYER_ID_COUNTER += 1
+        PLAYER_ID_BY_FULL_NAME.setdefault(FULL_PLAYER_NAMES.get(player_name, player_name), player_id)
+
+    GLOBAL_PLAYER_ID_MAP[player_name] = player_id
+    return player_id
+
+
 def _process_player_ids_and_full_name(ws):
     """
     Inserts 'Player_ID' (B), 'Full_Name' (C), and assigns unique IDs globally.
     """
-    global GLOBAL_PLAYER_ID_MAP
-    global CURRENT_PLAYER_ID_COUNTER
-    
     col_map = _recalculate_col_map(ws)
     player_col_index = col_map.get('Player')
     
@@ -186,15 +329,10 @@ def _process_player_ids_and_full_name(ws):
 
             if player_name and player_name != 'None':
                 # --- ID Logic ---
-                if player_name not in GLOBAL_PLAYER_ID_MAP:
-                    new_id = f"{CURRENT_PLAYER_ID_COUNTER:03d}"
-                    GLOBAL_PLAYER_ID_MAP[player_name] = new_id
-                    CURRENT_PLAYER_ID_COUNTER += 1
-                
-                player_id = GLOBAL_PLAYER_ID_MAP[player_name]
+                player_id = _get_or_assign_player_id(player_name)
                 
                 # --- Full Name Logic ---
-                full_name = FULL_PLAYER_NAMES.get(player_name, player_name) # Fallback to short name
+                full_name = NAME_RESOLVER.full_name(player_name) # Short name if unresolved
             
             # Write to sheet
             ws.cell(row=row, column=player_col_index - 1, value=player_id) # Player_ID is one column before Player
@@ -207,11 +345,22 @@ def _process_player_ids_and_full_name(ws):
         return False
 
 
+def _hs_values(hs_values):
+    """
+    Returns the (HS_Numeric, Not_out_status) cell values for a list of HS values, parsed
+    in one vectorized pass, so the cleaned sheets hold real values rather than formulas.
+    """
+    scores, statuses = parse_hs(hs_values)
+    return scores.astype(object).where(scores.notna(), None).tolist(), statuses.tolist()
+
+
 # --- 1. BATTING TRANSFORMATION FUNCTION (MODIFIED) ---
 def transform_batting_sheets(file_path):
     """Loads the workbook, transforms all sheets, and saves the file."""
     try:
-        wb = openpyxl.load_workbook(file_path)
+        with span('load', record_type='Batting', file=path.basename(file_path)) as loaded:
+            wb = openpyxl.load_workbook(file_path)
+            loaded['rows'] = sum(ws.max_row - 1 for ws in wb.worksheets)
     except FileNotFoundError:
         print(f"❌ Error: Batting file not found at {file_path}")
         return
@@ -221,30 +370,34 @@ def transform_batting_sheets(file_path):
     for sheet_name in wb.sheetnames:
         ws = wb[sheet_name]
         print(f"\nProcessing sheet: {sheet_name}")
+        step = {'record_type': 'Batting', 'sheet': sheet_name, 'rows': ws.max_row - 1}
 
         # --- 1. IDENTIFY, RENAME, AND DELETE COLUMNS ---
         col_map = _recalculate_col_map(ws)
         
         # A. Delete unwanted columns (col15)
-        for col_name in BATTING_COLS_TO_DELETE:
-            if col_name in col_map:
-                col_to_delete_index = col_map[col_name]
-                ws.delete_cols(col_to_delete_index)
-                col_map = _recalculate_col_map(ws) 
-                print(f"    - Removed column '{col_name}'.")
+        with span('delete_cols', **step):
+            for col_name in BATTING_COLS_TO_DELETE:
+                if col_name in col_map:
+                    col_to_delete_index = col_map[col_name]
+                    ws.delete_cols(col_to_delete_index)
+                    col_map = _recalculate_col_map(ws) 
+                    print(f"    - Removed column '{col_name}'.")
 
         # B. Rename columns
-        for old_name, new_name in BATTING_RENAMES.items():
-            if old_name in col_map:
-                col_index = col_map[old_name]
-                ws.cell(row=1, column=col_index, value=new_name)
-                print(f"    - Renamed '{old_name}' to '{new_name}'.")
+        with span('rename', **step):
+            for old_name, new_name in BATTING_RENAMES.items():
+                if old_name in col_map:
+                    col_index = col_map[old_name]
+                    ws.cell(row=1, column=col_index, value=new_name)
+                    print(f"    - Renamed '{old_name}' to '{new_name}'.")
         
         col_map = _recalculate_col_map(ws)
         
         # --- NEW STEP: INSERT PLAYER_ID AND FULL_NAME (Columns B and D) ---
         # NOTE: Player column is assumed to be A, so Player_ID is B, Player is C, Full_Name is D
-        _process_player_ids_and_full_name(ws)
+        with span('assign_ids', **step):
+            _process_player_ids_and_full_name(ws)
         col_map = _recalculate_col_map(ws) 
         
         # --- EXTRACT AND INSERT SEASON COLUMN (Column E) ---
@@ -252,68 +405,70 @@ def transform_batting_sheets(file_path):
         season_year = int(season_match.group(0) if season_match else 0)
         
         # Player column is now at column C (index 3). Full_Name is D (index 4). Insert Season at E (index 5).
-        player_col_index = col_map.get('Player')
-        if player_col_index:
-            ws.insert_cols(player_col_index + 2) # Insert 2 columns after Player
-            season_col_index = player_col_index + 2
-            ws.cell(row=1, column=season_col_index, value="Season")
+        with span('insert_season', **step):
+            player_col_index = col_map.get('Player')
+            if player_col_index:
+                ws.insert_cols(player_col_index + 2) # Insert 2 columns after Player
+                season_col_index = player_col_index + 2
+                ws.cell(row=1, column=season_col_index, value="Season")
             
-            # Fill Season data
-            for row in range(2, ws.max_row + 1):
-                ws.cell(row=row, column=season_col_index, value=season_year)
+                # Fill Season data
+                for row in range(2, ws.max_row + 1):
+                    ws.cell(row=row, column=season_col_index, value=season_year)
             
-            col_map = _recalculate_col_map(ws) 
-            print("    - Inserted new column 'Season'.")
-        else:
-            print("    - WARNING: 'Player' column not found. Skipping 'Season' column insertion.")
+                col_map = _recalculate_col_map(ws) 
+                print("    - Inserted new column 'Season'.")
+            else:
+                print("    - WARNING: 'Player' column not found. Skipping 'Season' column insertion.")
 
 
         # C. Delete empty columns
-        _delete_empty_columns(ws)
+        with span('delete_empty', **step):
+            _delete_empty_columns(ws)
         col_map = _recalculate_col_map(ws)
 
         # D. Move columns to end
-        _move_columns_to_end(ws, BATTING_COLS_TO_MOVE_TO_END)
+        with span('move_columns', **step):
+            _move_columns_to_end(ws, BATTING_COLS_TO_MOVE_TO_END)
         col_map = _recalculate_col_map(ws)
 
         # --- 3. INSERT HS_Numeric and Not_out_status COLUMNS (New Columns) ---
-        hs_col_index = col_map.get('HS')
+        with span('hs_parse', **step):
+            hs_col_index = col_map.get('HS')
 
-        if hs_col_index:
-            # Insert two new columns after HS.
-            ws.insert_cols(hs_col_index + 1, amount=2) 
+            if hs_col_index:
+                # Insert two new columns after HS.
+                ws.insert_cols(hs_col_index + 1, amount=2) 
             
-            col_g_index = hs_col_index + 1
-            col_h_index = hs_col_index + 2
+                col_g_index = hs_col_index + 1
+                col_h_index = hs_col_index + 2
             
-            hs_col_letter = get_column_letter(hs_col_index)
+                hs_col_letter = get_column_letter(hs_col_index)
             
-            FORMULA_HS_NUMERIC_ADJUSTED = f'=IF({hs_col_letter}2="-", "-", VALUE(SUBSTITUTE({hs_col_letter}2,"*","")))'
-            FORMULA_NOT_OUT_STATUS_ADJUSTED = f'=IF({hs_col_letter}2="-", "-", IF(ISNUMBER(FIND("*", {hs_col_letter}2)), "Not Out", "Out"))'
-            
-            ws.cell(row=1, column=col_g_index, value="HS_Numeric")
-            ws.cell(row=1, column=col_h_index, value="Not_out_status")
-            print(f"    - Inserted new columns 'HS_Numeric' and 'Not_out_status'.")
+                ws.cell(row=1, column=col_g_index, value="HS_Numeric")
+                ws.cell(row=1, column=col_h_index, value="Not_out_status")
+                print(f"    - Inserted new columns 'HS_Numeric' and 'Not_out_status'.")
 
-            max_row = ws.max_row
+                max_row = ws.max_row
+                hs_scores, hs_statuses = _hs_values([ws.cell(row=row, column=hs_col_index).value
+                                                     for row in range(2, max_row + 1)])
             
-            for row in range(2, max_row + 1):
-                # Column G (HS_Numeric)
-                formula_g = FORMULA_HS_NUMERIC_ADJUSTED.replace('2', str(row))
-                ws.cell(row=row, column=col_g_index, value=formula_g)
-
-                # Column H (Not_out_status)
-                formula_h = FORMULA_NOT_OUT_STATUS_ADJUSTED.replace('2', str(row))
-                ws.cell(row=row, column=col_h_index, value=formula_h)
+                for row, score, status in zip(range(2, max_row + 1), hs_scores, hs_statuses):
+                    # Column G (HS_Numeric)
+                    ws.cell(row=row, column=col_g_index, value=score)
+
+                    # Column H (Not_out_status)
+                    ws.cell(row=row, column=col_h_index, value=status)
             
-            print(f"    - Applied formulas to {max_row - 1} rows, referencing '{hs_col_letter}'.")
-        else:
-            print("    - WARNING: 'HS' column not found. Skipping formula insertion.")
+                print(f"    - Parsed {max_row - 1} rows of '{hs_col_letter}' into HS_Numeric and Not_out_status.")
+            else:
+                print("    - WARNING: 'HS' column not found. Skipping HS_Numeric and Not_out_status.")
 
 
     # --- 4. SAVE THE WORKBOOK ---
     new_file_path = path.join(OUTPUT_DIR, path.basename(file_path).replace('.xlsx', '_cleaned.xlsx'))
-    wb.save(new_file_path)
+    with span('save', loaded['rows'], record_type='Batting', file=path.basename(new_file_path)):
+        wb.save(new_file_path)
     print(f"\n🎉 SUCCESS: Batting transformations saved to: {new_file_path}")
     return new_file_path
 
@@ -321,7 +476,9 @@ def transform_batting_sheets(file_path):
 def transform_bowling_sheets(file_path):
     """Loads the workbook, transforms all sheets, and saves the file."""
     try:
-        wb = openpyxl.load_workbook(file_path)
+        with span('load', record_type='Bowling', file=path.basename(file_path)) as loaded:
+            wb = openpyxl.load_workbook(file_path)
+            loaded['rows'] = sum(ws.max_row - 1 for ws in wb.worksheets)
     except FileNotFoundError:
         print(f"❌ Error: Bowling file not found at {file_path}")
         return
@@ -331,64 +488,73 @@ def transform_bowling_sheets(file_path):
     for sheet_name in wb.sheetnames:
         ws = wb[sheet_name]
         print(f"\nProcessing sheet: {sheet_name}")
+        step = {'record_type': 'Bowling', 'sheet': sheet_name, 'rows': ws.max_row - 1}
 
         col_map = _recalculate_col_map(ws)
         
         # A. Delete unwanted columns (col14)
-        for col_name in BOWLING_COLS_TO_DELETE:
-            if col_name in col_map:
-                col_to_delete_index = col_map[col_name]
-                ws.delete_cols(col_to_delete_index)
-                col_map = _recalculate_col_map(ws)
-                print(f"    - Removed column '{col_name}'.")
+        with span('delete_cols', **step):
+            for col_name in BOWLING_COLS_TO_DELETE:
+                if col_name in col_map:
+                    col_to_delete_index = col_map[col_name]
+                    ws.delete_cols(col_to_delete_index)
+                    col_map = _recalculate_col_map(ws)
+                    print(f"    - Removed column '{col_name}'.")
 
         # B. Rename columns ('4' to '4_Wkts', '5' to '5_Wkts')
-        for old_name, new_name in BOWLING_RENAMES.items():
-            if old_name in col_map:
-                col_index = col_map[old_name]
-                ws.cell(row=1, column=col_index, value=new_name)
-                print(f"    - Renamed '{old_name}' to '{new_name}'.")
+        with span('rename', **step):
+            for old_name, new_name in BOWLING_RENAMES.items():
+                if old_name in col_map:
+                    col_index = col_map[old_name]
+                    ws.cell(row=1, column=col_index, value=new_name)
+                    print(f"    - Renamed '{old_name}' to '{new_name}'.")
         
         col_map = _recalculate_col_map(ws)
         
         # --- NEW STEP: INSERT PLAYER_ID AND FULL_NAME (Columns B and D) ---
-        _process_player_ids_and_full_name(ws)
+        with span('assign_ids', **step):
+            _process_player_ids_and_full_name(ws)
         col_map = _recalculate_col_map(ws)
         
         # --- EXTRACT AND INSERT SEASON COLUMN (Column E) ---
         season_match = re.search(r'\d{4}', sheet_name)
         season_year = int(season_match.group(0) if season_match else 0)
         
-        player_col_index = col_map.get('Player')
-        if player_col_index:
-            ws.insert_cols(player_col_index + 2) # Insert 2 columns after Player
-            season_col_index = player_col_index + 2
-            ws.cell(row=1, column=season_col_index, value="Season")
+        with span('insert_season', **step):
+            player_col_index = col_map.get('Player')
+            if player_col_index:
+                ws.insert_cols(player_col_index + 2) # Insert 2 columns after Player
+                season_col_index = player_col_index + 2
+                ws.cell(row=1, column=season_col_index, value="Season")
             
-            for row in range(2, ws.max_row + 1):
-                ws.cell(row=row, column=season_col_index, value=season_year)
+                for row in range(2, ws.max_row + 1):
+                    ws.cell(row=row, column=season_col_index, value=season_year)
             
-            col_map = _recalculate_col_map(ws) 
-            print("    - Inserted new column 'Season'.")
+                col_map = _recalculate_col_map(ws) 
+                print("    - Inserted new column 'Season'.")
 
 
         # C. Delete empty columns
-        _delete_empty_columns(ws)
+        with span('delete_empty', **step):
+            _delete_empty_columns(ws)
         col_map = _recalculate_col_map(ws)
 
         # D. Change BBI datatype to text
-        bbi_col_index = col_map.get('BBI')
-        if bbi_col_index:
-            for row in range(2, ws.max_row + 1):
-                ws.cell(row=row, column=bbi_col_index).number_format = '@' 
-            print("    - Set 'BBI' column data type to Text.")
+        with span('text_format', **step):
+            bbi_col_index = col_map.get('BBI')
+            if bbi_col_index:
+                for row in range(2, ws.max_row + 1):
+                    ws.cell(row=row, column=bbi_col_index).number_format = '@' 
+                print("    - Set 'BBI' column data type to Text.")
         
         # E. Move columns to end (4_Wkts and 5_Wkts)
-        _move_columns_to_end(ws, BOWLING_COLS_TO_MOVE_TO_END)
+        with span('move_columns', **step):
+            _move_columns_to_end(ws, BOWLING_COLS_TO_MOVE_TO_END)
 
     # --- SAVE THE WORKBOOK ---
     new_file_path = path.join(OUTPUT_DIR, path.basename(file_path).replace('.xlsx', '_cleaned.xlsx'))
-    wb.save(new_file_path)
+    with span('save', loaded['rows'], record_type='Bowling', file=path.basename(new_file_path)):
+        wb.save(new_file_path)
     print(f"\n🎉 SUCCESS: Bowling transformations saved to: {new_file_path}")
     return new_file_path
 
@@ -397,7 +563,9 @@ def transform_bowling_sheets(file_path):
 def transform_fielding_sheets(file_path):
     """Loads the workbook, transforms all sheets, and saves the file."""
     try:
-        wb = openpyxl.load_workbook(file_path)
+        with span('load', record_type='Fielding', file=path.basename(file_path)) as loaded:
+            wb = openpyxl.load_workbook(file_path)
+            loaded['rows'] = sum(ws.max_row - 1 for ws in wb.worksheets)
     except FileNotFoundError:
         print(f"❌ Error: Fielding file not found at {file_path}")
         return
@@ -407,72 +575,381 @@ def transform_fielding_sheets(file_path):
     for sheet_name in wb.sheetnames:
         ws = wb[sheet_name]
         print(f"\nProcessing sheet: {sheet_name}")
+        step = {'record_type': 'Fielding', 'sheet': sheet_name, 'rows': ws.max_row - 1}
 
         col_map = _recalculate_col_map(ws)
         
         # A. Delete unwanted columns (col11)
-        for col_name in FIELDING_COLS_TO_DELETE:
-            if col_name in col_map:
-                col_to_delete_index = col_map[col_name]
-                ws.delete_cols(col_to_delete_index)
-                col_map = _recalculate_col_map(ws)
-                print(f"    - Removed column '{col_name}'.")
+        with span('delete_cols', **step):
+            for col_name in FIELDING_COLS_TO_DELETE:
+                if col_name in col_map:
+                    col_to_delete_index = col_map[col_name]
+                    ws.delete_cols(col_to_delete_index)
+                    col_map = _recalculate_col_map(ws)
+                    print(f"    - Removed column '{col_name}'.")
 
         # B. Rename columns (Ct Wk to Ct_Wk, Ct Fi to Ct_Fi) and common ones (Mat, Inns)
-        for old_name, new_name in FIELDING_RENAMES.items():
-            if old_name in col_map:
-                col_index = col_map[old_name]
-                ws.cell(row=1, column=col_index, value=new_name)
-                print(f"    - Renamed '{old_name}' to '{new_name}'.")
+        with span('rename', **step):
+            for old_name, new_name in FIELDING_RENAMES.items():
+                if old_name in col_map:
+                    col_index = col_map[old_name]
+                    ws.cell(row=1, column=col_index, value=new_name)
+                    print(f"    - Renamed '{old_name}' to '{new_name}'.")
         
         col_map = _recalculate_col_map(ws)
         
         # --- NEW STEP: INSERT PLAYER_ID AND FULL_NAME (Columns B and D) ---
-        _process_player_ids_and_full_name(ws)
+        with span('assign_ids', **step):
+            _process_player_ids_and_full_name(ws)
         col_map = _recalculate_col_map(ws)
         
         # --- EXTRACT AND INSERT SEASON COLUMN (Column E) ---
         season_match = re.search(r'\d{4}', sheet_name)
         season_year = int(season_match.group(0) if season_match else 0)
         
-        player_col_index = col_map.get('Player')
-        if player_col_index:
-            ws.insert_cols(player_col_index + 2) # Insert 2 columns after Player
-            season_col_index = player_col_index + 2
-            ws.cell(row=1, column=season_col_index, value="Season")
+        with span('insert_season', **step):
+            player_col_index = col_map.get('Player')
+            if player_col_index:
+                ws.insert_cols(player_col_index + 2) # Insert 2 columns after Player
+                season_col_index = player_col_index + 2
+                ws.cell(row=1, column=season_col_index, value="Season")
             
-            for row in range(2, ws.max_row + 1):
-                ws.cell(row=row, column=season_col_index, value=season_year)
+                for row in range(2, ws.max_row + 1):
+                    ws.cell(row=row, column=season_col_index, value=season_year)
             
-            col_map = _recalculate_col_map(ws) 
-            print("    - Inserted new column 'Season'.")
+                col_map = _recalculate_col_map(ws) 
+                print("    - Inserted new column 'Season'.")
 
 
         # C. Delete empty columns
-        _delete_empty_columns(ws)
+        with span('delete_empty', **step):
+            _delete_empty_columns(ws)
 
     # --- SAVE THE WORKBOOK ---
     new_file_path = path.join(OUTPUT_DIR, path.basename(file_path).replace('.xlsx', '_cleaned.xlsx'))
-    wb.save(new_file_path)
+    with span('save', loaded['rows'], record_type='Fielding', file=path.basename(new_file_path)):
+        wb.save(new_file_path)
     print(f"\n🎉 SUCCESS: Fielding transformations saved to: {new_file_path}")
     return new_file_path
 
 
-# --- Main Execution Block ---
-def run_all_transformations():
-    """Executes the cleaning for all three files."""
-    
-    # 1. Clean Batting File
-    batting_file_path = FILE_PATHS['Batting']
-    transform_batting_sheets(batting_file_path)
+# --- 4. COLUMNAR TRANSFORMATION ENGINE ---
+# Each sheet is read once into a header list plus one list of values per column. The
+# steps of transform_*_sheets() become list operations on that table, so no step shifts
+# the cells of the whole sheet, and the workbook is written once at the end. The cell
+# contents match the in-place openpyxl path exactly.
+
+def _columnar_col_map(headers):
+    """Same mapping as _recalculate_col_map, but 0-based over a header list."""
+    col_map = {}
+    for i, h in enumerate(headers):
+        name = str(h).strip() if h is not None else None
+        if name and name != 'None':
+            col_map[name] = i
+    return col_map
+
+
+def _read_sheet_columnar(ws):
+    """Reads a worksheet into (headers, columns), where columns[i] holds rows 2..max_row."""
+    rows = list(ws.iter_rows(values_only=True))
+    width = max((len(r) for r in rows), default=0)
+    if not rows:
+        return [], []
+    headers = list(rows[0]) + [None] * (width - len(rows[0]))
+    columns = [[] for _ in range(width)]
+    for row in rows[1:]:
+        for i in range(width):
+            columns[i].append(row[i] if i < len(row) else None)
+    return headers, columns
+
+
+def _insert_column_columnar(headers, columns, index, name, values):
+    headers.insert(index, name)
+    columns.insert(index, values)
+
+
+def _delete_column_columnar(headers, columns, index):
+    del headers[index]
+    del columns[index]
 
-    # 2. Clean Bowling File
-    bowling_file_path = FILE_PATHS['Bowling']
-    transform_bowling_sheets(bowling_file_path)
 
-    # 3. Clean Fielding File
-    fielding_file_path = FILE_PATHS['Fielding']
-    transform_fielding_sheets(fielding_file_path)
+def _delete_empty_columns_columnar(headers, columns):
+    """Deletes columns that are entirely empty from row 2 onwards."""
+    cols_deleted = 0
+    for col_index in range(len(headers) - 1, -1, -1):
+        if all(v is None or str(v).strip() == '' for v in columns[col_index]):
+            _delete_column_columnar(headers, columns, col_index)
+            cols_deleted += 1
+    return cols_deleted
+
+
+def _move_columns_to_end_columnar(headers, columns, col_names_to_move):
+    """Moves a list of columns to the end of the table, in the order given."""
+    col_map = _columnar_col_map(headers)
+    moved = []
+    for col_index in sorted((col_map[c] for c in col_names_to_move if c in col_map), reverse=True):
+        moved.append((headers[col_index], columns[col_index]))
+        _delete_column_columnar(headers, columns, col_index)
+    by_name = {str(h).strip(): (h, values) for h, values in moved}
+    for col_name in col_names_to_move:
+        if col_name in by_name:
+            header, values = by_name[col_name]
+            headers.append(header)
+            columns.append(values)
+
+
+def _is_player_name(value):
+    player_name = str(value).strip()
+    return player_name and player_name != 'None'
+
+
+def _process_player_ids_and_full_name_columnar(headers, columns):
+    """
+    Columnar version of _process_player_ids_and_full_name. Player_ID is filled with "N/A"
+    placeholders here; _assign_player_ids_columnar() replaces them with the global IDs.
+    """
+    player_col_index = _columnar_col_map(headers).get('Player')
+    if player_col_index is None:
+        return False
+
+    full_names = []
+    for value in columns[player_col_index]:
+        player_name = str(value).strip()
+        full_names.append(NAME_RESOLVER.full_name(player_name) if _is_player_name(value) else "N/A")
+
+    _insert_column_columnar(headers, columns, player_col_index, "Player_ID", ["N/A"] * len(full_names))
+    _insert_column_columnar(headers, columns, player_col_index + 2, "Full_Name", full_names)
+    return True
+
+
+def _assign_player_ids_columnar(headers, columns):
+    """Fills the Player_ID column from the player registry, assigning new IDs in row order."""
+    col_map = _columnar_col_map(headers)
+    if 'Player_ID' not in col_map or 'Player' not in col_map:
+        return
+    player_ids = columns[col_map['Player_ID']]
+    for row, value in enumerate(columns[col_map['Player']]):
+        if _is_player_name(value):
+            player_ids[row] = _get_or_assign_player_id(str(value).strip())
+
+
+def _clean_sheet_columnar(record_type, sheet_name, headers, columns, assign_ids=True):
+    """
+    Applies the transform_*_sheets() steps for one record type to an in-memory sheet.
+    With assign_ids=False the Player_ID column keeps its placeholders, so the sheet can be
+    cleaned in any process and numbered later with _assign_player_ids_columnar().
+    """
+    config = RECORD_CONFIGS[record_type]
+    n_rows = len(columns[0]) if columns else 0
+    step = {'record_type': record_type, 'sheet': sheet_name, 'rows': n_rows}
+
+    # A. Delete unwanted columns
+    with span('delete_cols', **step):
+        for col_name in config['delete']:
+            col_map = _columnar_col_map(headers)
+            if col_name in col_map:
+                _delete_column_columnar(headers, columns, col_map[col_name])
+
+    # B. Rename columns
+    with span('rename', **step):
+        col_map = _columnar_col_map(headers)
+        for old_name, new_name in config['renames'].items():
+            if old_name in col_map:
+                headers[col_map[old_name]] = new_name
+
+    # Player_ID / Full_Name, then Season right after Full_Name
+    with span('full_names', **step):
+        _process_player_ids_and_full_name_columnar(headers, columns)
+
+    with span('insert_season', **step):
+        season_match = re.search(r'\d{4}', sheet_name)
+        season_year = int(season_match.group(0) if season_match else 0)
+        player_col_index = _columnar_col_map(headers).get('Player')
+        if player_col_index is not None:
+            _insert_column_columnar(headers, columns, player_col_index + 2, "Season", [season_year] * n_rows)
+
+    # C. Delete empty columns, D. Move columns to end
+    with span('delete_empty', **step):
+        _delete_empty_columns_columnar(headers, columns)
+    with span('move_columns', **step):
+        _move_columns_to_end_columnar(headers, columns, config['move_to_end'])
+
+    # HS_Numeric and Not_out_status (batting only)
+    if config['hs_columns']:
+        with span('hs_parse', **step):
+            hs_col_index = _columnar_col_map(headers).get('HS')
+            if hs_col_index is not None:
+                hs_scores, hs_statuses = _hs_values(columns[hs_col_index])
+                _insert_column_columnar(headers, columns, hs_col_index + 1, "HS_Numeric", hs_scores)
+                _insert_column_columnar(headers, columns, hs_col_index + 2, "Not_out_status", hs_statuses)
+
+    if assign_ids:
+        with span('assign_ids', **step):
+            _assign_player_ids_columnar(headers, columns)
+    return headers, columns
+
+
+def _write_sheet_columnar(wb_out, sheet_name, headers, columns, text_cols=()):
+    """Appends one cleaned table to a write-only workbook, row by row."""
+    ws = wb_out.create_sheet(title=sheet_name)
+    text_indices = {i for i, h in enumerate(headers) if h is not None and str(h).strip() in text_cols}
+    ws.append(headers)
+    n_rows = len(columns[0]) if columns else 0
+    for r in range(n_rows):
+        row = []
+        for i, col in enumerate(columns):
+            value = col[r]
+            if i in text_indices:
+                value = WriteOnlyCell(ws, value=value)
+                value.number_format = '@'
+            row.append(value)
+        ws.append(row)
+
+
+def _write_cleaned_parquet(record_type, cleaned_sheets, parquet_dir=None):
+    """Writes [(sheet_name, headers, columns)] as one Parquet file per season under PARQUET_DIR."""
+    sheets = {sheet_name: columns_to_frame(headers, columns) for sheet_name, headers, columns in cleaned_sheets}
+    return write_cleaned_seasons(record_type, sheets, parquet_dir or PARQUET_DIR)
+
+
+def _export_cleaned_parquet(record_type, cleaned_file_path):
+    """Parquet export for the in-place path: reads the cleaned workbook it just saved. Returns the rows written."""
+    wb = openpyxl.load_workbook(cleaned_file_path, read_only=True)
+    cleaned_sheets = [(sheet_name, *_read_sheet_columnar(wb[sheet_name])) for sheet_name in wb.sheetnames]
+    wb.close()
+    _write_cleaned_parquet(record_type, cleaned_sheets)
+    return sum(len(columns[0]) if columns else 0 for _, _, columns in cleaned_sheets)
+
+
+def _save_columnar_workbook(record_type, file_path, cleaned_sheets, output_dir=None):
+    """
+    Writes [(sheet_name, headers, columns)] to the '_cleaned.xlsx' output in one pass, and
+    to per-season Parquet files, depending on OUTPUT_FORMATS. `output_dir` overrides
+    OUTPUT_DIR (the Parquet files then go to its 'parquet' subdirectory).
+    """
+    parquet_dir = path.join(output_dir, 'parquet') if output_dir else PARQUET_DIR
+    new_file_path = path.join(output_dir or OUTPUT_DIR, path.basename(file_path).replace('.xlsx', '_cleaned.xlsx'))
+    n_rows = sum(len(columns[0]) if columns else 0 for _, _, columns in cleaned_sheets)
+    if excel_enabled():
+        with span('save', n_rows, record_type=record_type, file=path.basename(new_file_path)):
+            wb_out = openpyxl.Workbook(write_only=True)
+            for sheet_name, headers, columns in cleaned_sheets:
+                _write_sheet_columnar(wb_out, sheet_name, headers, columns, RECORD_CONFIGS[record_type]['text_cols'])
+                print(f"    - {sheet_name}: {len(columns[0]) if columns else 0} rows, {len(headers)} columns.")
+            wb_out.save(new_file_path)
+        print(f"\n🎉 SUCCESS: {record_type} transformations saved to: {new_file_path}")
+
+    if parquet_enabled():
+        with span('save_parquet', n_rows, record_type=record_type):
+            _write_cleaned_parquet(record_type, cleaned_sheets, parquet_dir)
+    return new_file_path
+
+
+def transform_sheets_columnar(record_type, file_path):
+    """Loads every sheet once, transforms it in memory and saves the workbook in one pass."""
+    try:
+        wb = openpyxl.load_workbook(file_path, read_only=True)
+    except FileNotFoundError:
+        print(f"❌ Error: {record_type} file not found at {file_path}")
+        return
+
+    print(f"\n--- {record_type.upper()} (columnar): Transforming '{path.basename(file_path)}' ---")
+
+    cleaned_sheets = []
+    for sheet_name in wb.sheetnames:
+        with span('load', record_type=record_type, sheet=sheet_name) as loaded:
+            headers, columns = _read_sheet_columnar(wb[sheet_name])
+            loaded['rows'] = len(columns[0]) if columns else 0
+        _clean_sheet_columnar(record_type, sheet_name, headers, columns)
+        cleaned_sheets.append((sheet_name, headers, columns))
+    wb.close()
+
+    return _save_columnar_workbook(record_type, file_path, cleaned_sheets)
+
+
+# --- 5. PARALLEL CLEANING (PROCESS POOL) ---
+def _clean_sheet_unit(record_type, file_path, sheet_name):
+    """Worker task: cleans one (record type, season sheet) unit, leaving Player_ID unassigned."""
+    wb = openpyxl.load_workbook(file_path, read_only=True)
+    headers, columns = _read_sheet_columnar(wb[sheet_name])
+    wb.close()
+    return _clean_sheet_columnar(record_type, sheet_name, headers, columns, assign_ids=False)
+
+
+def run_parallel_transformations(workers=None):
+    """
+    Cleans every (record type, season) sheet across a process pool, then assigns Player_IDs
+    in the sequential order (Batting, Bowling, Fielding; sheets in workbook order), so IDs and
+    outputs are identical to a sequential run.
+    """
+    units = []
+    for record_type, file_path in FILE_PATHS.items():
+        try:
+            wb = openpyxl.load_workbook(file_path, read_only=True)
+        except FileNotFoundError:
+            print(f"❌ Error: {record_type} file not found at {file_path}")
+            continue
+        units.extend((record_type, file_path, sheet_name) for sheet_name in wb.sheetnames)
+        wb.close()
+
+    workers = workers or PARALLEL_WORKERS or os.cpu_count()
+    print(f"\n--- Cleaning {len(units)} sheets across {workers} worker processes ---")
+    # Spans recorded inside the workers stay in those processes; the pool is timed as one step
+    with span('clean_parallel', workers=workers) as cleaned:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_clean_sheet_unit, *zip(*units))) if units else []
+        cleaned['rows'] = sum(len(columns[0]) if columns else 0 for _, columns in results)
+
+    # Deterministic merge: number players in the same order as the sequential run
+    outputs = {}
+    for (record_type, file_path, sheet_name), (headers, columns) in zip(units, results):
+        with span('assign_ids', len(columns[0]) if columns else 0, record_type=record_type, sheet=sheet_name):
+            _assign_player_ids_columnar(headers, columns)
+        outputs.setdefault((record_type, file_path), []).append((sheet_name, headers, columns))
+
+    return [_save_columnar_workbook(record_type, file_path, sheets)
+            for (record_type, file_path), sheets in outputs.items()]
+
+
+# --- Main Execution Block ---
+def run_all_transformations(columnar=None, workers=None, registry_path=None):
+    """Executes the cleaning for all three files."""
+    if columnar is None:
+        columnar = USE_COLUMNAR_ENGINE
+    if workers is None:
+        workers = PARALLEL_WORKERS
+
+    start_run('clean_excel')
+    load_player_registry(registry_path)
+
+    if workers and workers > 1:
+        run_parallel_transformations(workers)
+    elif columnar:
+        for record_type, file_path in FILE_PATHS.items():
+            transform_sheets_columnar(record_type, file_path)
+    else:
+        # 1. Clean Batting File
+        batting_file_path = FILE_PATHS['Batting']
+        cleaned_paths = {'Batting': transform_batting_sheets(batting_file_path)}
+
+        # 2. Clean Bowling File
+        bowling_file_path = FILE_PATHS['Bowling']
+        cleaned_paths['Bowling'] = transform_bowling_sheets(bowling_file_path)
+
+        # 3. Clean Fielding File
+        fielding_file_path = FILE_PATHS['Fielding']
+        cleaned_paths['Fielding'] = transform_fielding_sheets(fielding_file_path)
+
+        # The in-place path edits workbooks, so the Parquet copy is taken from its output
+        if parquet_enabled():
+            for record_type, cleaned_path in cleaned_paths.items():
+                if cleaned_path:
+                    with span('save_parquet', record_type=record_type) as step:
+                        step['rows'] = _export_cleaned_parquet(record_type, cleaned_path)
+
+    save_player_registry(registry_path)
+    report_unresolved_names()
+    finish_run(OUTPUT_DIR)
 
 
 if __name__ == "__main__":
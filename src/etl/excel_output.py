@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+# --- CONFIGURATION ---
+# Number formats declared per column before any row is written. Text keeps figures such as
+# '3/20' (BBI) or '2 (2ct 0st)' (MD) from being reinterpreted by Excel and Power BI.
+COLUMN_FORMATS = {
+    'BBI': '@',
+    'MD': '@'
+}
+
+# Header row style, the one DataFrame.to_excel() gives its header cells (pandas < 3.0)
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
+                       bottom=Side(style='thin'))
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+# -------------------------------------
+
+
+def _cell_value(value):
+    """Plain Python value for a frame cell; NaN/NA become blank cells as with to_excel()."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+def _header_cell(ws, name):
+    cell = WriteOnlyCell(ws, value=str(name))
+    cell.font, cell.border, cell.alignment = HEADER_FONT, HEADER_BORDER, HEADER_ALIGNMENT
+    return cell
+
+
+def write_excel(tables, file_path, column_formats=None):
+    """
+    Writes {sheet_name: DataFrame} to one workbook in a single streaming pass, with a
+    write-only workbook: rows go straight to disk, so memory stays flat however many
+    players the sheets hold. Columns in column_formats get their number format as they
+    are written, so the file never has to be reopened to fix formats. The header row is
+    bold, bordered and centred, as to_excel() wrote it.
+    """
+    column_formats = COLUMN_FORMATS if column_formats is None else column_formats
+    wb = openpyxl.Workbook(write_only=True)
+    for sheet_name, df in tables.items():
+        ws = wb.create_sheet(title=sheet_name)
+        ws.append([_header_cell(ws, c) for c in df.columns])
+        formats = {i: column_formats[c] for i, c in enumerate(df.columns) if c in column_formats}
+
+        for row in df.itertuples(index=False, name=None):
+            values = [_cell_value(v) for v in row]
+            for i, number_format in formats.items():
+                cell = WriteOnlyCell(ws, value=values[i])
+                cell.number_format = number_format
+                values[i] = cell
+            ws.append(values)
+    wb.save(file_path)
+    return file_path
@@ -0,0 +1,209 @@
+import json
+import os
+from os import path
+
+import numpy as np
+import pandas as pd
+
+from career_metrics import compute_ratios, overs_to_balls, parse_hs
+from clean_excel import FILE_PATHS, OUTPUT_DIR
+
+# --- CONFIGURATION ---
+# One directory of fixed-width .npy columns, one row per (Player_ID, Season), opened with
+# np.load(mmap_mode='r') so a query only pages in the rows it reads.
+FACT_STORE_DIR = path.join(OUTPUT_DIR, 'fact_store')
+
+# Fact column -> (record type, cleaned column). Every fact is an additive int32 count, so
+# career totals are sums and ratios come from career_metrics.compute_ratios.
+FACT_COLUMNS = {
+    'Mat': ('Batting', 'Mat'), 'Inns': ('Batting', 'Inns'), 'NO': ('Batting', 'NO'),
+    'Runs': ('Batting', 'Runs'), 'BF': ('Batting', 'BF'), 'Fours': ('Batting', 'Fours'),
+    'Sixes': ('Batting', 'Sixes'), 'Ducks': ('Batting', 'Ducks'), 'Fifties': ('Batting', 'Fifties'),
+    'Hundreds': ('Batting', 'Hundreds'),
+    'Mat_bowl': ('Bowling', 'Mat'), 'Inns_bowl': ('Bowling', 'Inns'), 'Mdns': ('Bowling', 'Mdns'),
+    'Runs_bowl': ('Bowling', 'Runs'), 'Wkts': ('Bowling', 'Wkts'), '4_Wkts': ('Bowling', '4_Wkts'),
+    '5_Wkts': ('Bowling', '5_Wkts'),
+    'Mat_field': ('Fielding', 'Mat_field'), 'Inns_field': ('Fielding', 'Inns_field'), 'Dis': ('Fielding', 'Dis'),
+    'Ct': ('Fielding', 'Ct'), 'St': ('Fielding', 'St'), 'Ct_Wk': ('Fielding', 'Ct_Wk'), 'Ct_Fi': ('Fielding', 'Ct_Fi')
+}
+# Derived per-season facts: HS as a number plus its not-out flag, balls bowled (from Overs)
+# and the season's best bowling split into wickets/runs. HS/BBI are -1 where absent.
+DERIVED_COLUMNS = ['HS_Numeric', 'HS_Not_out', 'Balls_bowl', 'BBI_Wkts', 'BBI_Runs']
+# -------------------------------------
+
+
+def _concat_sheets(sheets):
+    """Concatenates the cleaned season tables of one record type, with cleaned column names."""
+    frames = []
+    for df in sheets.values():
+        df = df.copy()
+        df.columns = df.columns.str.strip().str.replace(' ', '_', regex=False)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['Player_ID', 'Player', 'Season'])
+
+
+def _season_facts(records):
+    """One row per (Player_ID, Season) with every fact column, from the cleaned season tables."""
+    keys = ['Player_ID', 'Season']
+    parts = []
+    for record_type in ['Batting', 'Bowling', 'Fielding']:
+        df = _concat_sheets(records.get(record_type, {}))
+        part = pd.DataFrame({k: pd.to_numeric(df[k], errors='coerce') for k in keys if k in df.columns})
+        for fact, (source, col) in FACT_COLUMNS.items():
+            if source == record_type and col in df.columns:
+                part[fact] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+        if record_type == 'Batting' and 'HS' in df.columns:
+            hs_numeric, not_out_status = parse_hs(df['HS'])
+            part['HS_Numeric'] = hs_numeric.fillna(-1).to_numpy()
+            part['HS_Not_out'] = (not_out_status == 'Not Out').astype(int).to_numpy()
+        if record_type == 'Bowling':
+            if 'Overs' in df.columns:
+                part['Balls_bowl'] = overs_to_balls(df['Overs'])
+            if 'BBI' in df.columns:
+                figures = df['BBI'].astype(str).str.extract(r'^\s*(\d+)\s*/\s*(\d+)\s*$')
+                part['BBI_Wkts'] = pd.to_numeric(figures[0], errors='coerce').fillna(-1)
+                part['BBI_Runs'] = pd.to_numeric(figures[1], errors='coerce').fillna(-1)
+        parts.append(part.dropna(subset=keys))
+
+    facts = pd.concat(parts, ignore_index=True)
+    columns = list(FACT_COLUMNS) + DERIVED_COLUMNS
+    facts = facts.reindex(columns=keys + columns)
+    # Absent HS/BBI stay -1 (max keeps a real value over the placeholder); counts are summed
+    fill = {c: (-1 if c in ['HS_Numeric', 'BBI_Wkts', 'BBI_Runs'] else 0) for c in columns}
+    agg = {c: ('max' if c in ['HS_Numeric', 'HS_Not_out', 'BBI_Wkts', 'BBI_Runs'] else 'sum') for c in columns}
+    facts = facts.fillna(fill).groupby(keys, as_index=False).agg(agg)
+    return facts.astype({'Player_ID': np.int32, 'Season': np.int16, **{c: np.int32 for c in columns}})
+
+
+def _player_dimension(records):
+    """Player_ID -> (Player, Full_Name), first occurrence across the cleaned tables."""
+    frames = [_concat_sheets(records.get(t, {})) for t in ['Batting', 'Bowling', 'Fielding']]
+    names = pd.concat([f.reindex(columns=['Player_ID', 'Player', 'Full_Name']) for f in frames], ignore_index=True)
+    names['Player_ID'] = pd.to_numeric(names['Player_ID'], errors='coerce')
+    names = names.dropna(subset=['Player_ID']).drop_duplicates('Player_ID').sort_values('Player_ID')
+    return {int(pid): [str(p), str(f) if pd.notna(f) else str(p)]
+            for pid, p, f in names.itertuples(index=False)}
+
+
+def build_fact_store(records, store_dir=FACT_STORE_DIR):
+    """
+    Writes the player-season fact store from cleaned tables ({record_type: {sheet_name: DataFrame}}).
+    Rows are sorted by (Player_ID, Season); player_offsets indexes the rows of each Player_ID,
+    and season_rows/season_offsets list the rows of each season.
+    """
+    print(f"--- Building player-season fact store in {store_dir} ---")
+    os.makedirs(store_dir, exist_ok=True)
+    facts = _season_facts(records).sort_values(['Player_ID', 'Season'], kind='mergesort').reset_index(drop=True)
+
+    for col in facts.columns:
+        np.save(path.join(store_dir, f"{col}.npy"), facts[col].to_numpy())
+
+    # Player index: rows of Player_ID p are player_offsets[p]:player_offsets[p + 1]
+    player_ids = facts['Player_ID'].to_numpy()
+    max_id = int(player_ids.max()) if len(player_ids) else 0
+    player_offsets = np.searchsorted(player_ids, np.arange(max_id + 2)).astype(np.int32)
+    np.save(path.join(store_dir, 'player_offsets.npy'), player_offsets)
+
+    # Season index: row numbers grouped by season, in Player_ID order within a season
+    seasons_col = facts['Season'].to_numpy()
+    season_rows = np.argsort(seasons_col, kind='stable').astype(np.int32)
+    seasons = np.unique(seasons_col).astype(np.int16)
+    season_offsets = np.searchsorted(seasons_col[season_rows], np.append(seasons, np.iinfo(np.int16).max)).astype(np.int32)
+    np.save(path.join(store_dir, 'season_rows.npy'), season_rows)
+    np.save(path.join(store_dir, 'seasons.npy'), seasons)
+    np.save(path.join(store_dir, 'season_offsets.npy'), season_offsets)
+
+    # Metadata last: a directory without meta.json is an incomplete build
+    meta = {'n_rows': len(facts), 'columns': list(facts.columns), 'players': _player_dimension(records)}
+    with open(path.join(store_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    print(f"✅ Fact store written: {len(facts)} player-seasons, {len(meta['players'])} players, "
+          f"{len(seasons)} seasons.")
+    return store_dir
+
+
+class FactStore:
+    """
+    Read-only, memory-mapped view of a fact store. Lookups slice the indexes and read only
+    the matching rows; the result is {column: numpy array}, or a DataFrame via as_frame().
+    """
+
+    def __init__(self, store_dir=FACT_STORE_DIR):
+        with open(path.join(store_dir, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.n_rows = meta['n_rows']
+        self.columns = {col: np.load(path.join(store_dir, f"{col}.npy"), mmap_mode='r') for col in meta['columns']}
+        self.player_offsets = np.load(path.join(store_dir, 'player_offsets.npy'), mmap_mode='r')
+        self.season_rows = np.load(path.join(store_dir, 'season_rows.npy'), mmap_mode='r')
+        self.season_offsets = np.load(path.join(store_dir, 'season_offsets.npy'), mmap_mode='r')
+        self.seasons = np.load(path.join(store_dir, 'seasons.npy'))
+
+        self.players = {int(pid): tuple(names) for pid, names in meta['players'].items()}
+        self._ids_by_name = {}
+        for pid, (player, full_name) in self.players.items():
+            self._ids_by_name.setdefault(player, pid)
+            self._ids_by_name.setdefault(full_name, pid)
+
+    def player_id(self, player):
+        """Player_ID for an ID, short name ('RA Jadeja') or full name; KeyError if unknown."""
+        if isinstance(player, (int, np.integer)):
+            return int(player)
+        return self._ids_by_name[player]
+
+    def _player_slice(self, player):
+        pid = self.player_id(player)
+        if pid < 0 or pid + 1 >= len(self.player_offsets):
+            return slice(0, 0)
+        return slice(int(self.player_offsets[pid]), int(self.player_offsets[pid + 1]))
+
+    def _season_row_numbers(self, season):
+        i = int(np.searchsorted(self.seasons, season))
+        if i == len(self.seasons) or self.seasons[i] != season:
+            return np.empty(0, dtype=np.int32)
+        return self.season_rows[self.season_offsets[i]:self.season_offsets[i + 1]]
+
+    def _take(self, rows, columns=None):
+        return {col: np.asarray(self.columns[col][rows]) for col in (columns or self.columns)}
+
+    def player_seasons(self, player, columns=None):
+        """Every season row of one player, ordered by season."""
+        return self._take(self._player_slice(player), columns)
+
+    def season(self, season, columns=None):
+        """Every player row of one season, ordered by Player_ID."""
+        return self._take(self._season_row_numbers(season), columns)
+
+    def top(self, column, season=None, n=10, columns=None):
+        """The n rows with the highest `column`, optionally within one season, highest first."""
+        rows = self._season_row_numbers(season) if season is not None else np.arange(self.n_rows)
+        values = np.asarray(self.columns[column][rows])
+        if len(values) > n:
+            best = np.argpartition(-values, n - 1)[:n]
+        else:
+            best = np.arange(len(values))
+        best = best[np.lexsort((best, -values[best]))] # Highest first, ties in Player_ID order
+        return self._take(rows[best], columns)
+
+    def career(self, player):
+        """Career totals of one player plus the career ratios derived from them."""
+        rows = self.player_seasons(player, list(FACT_COLUMNS) + ['Balls_bowl'])
+        totals = pd.DataFrame({col: [int(values.sum())] for col, values in rows.items()})
+        stats = totals.assign(Dismissals=totals['Inns'] - totals['NO'])
+        return pd.concat([totals, compute_ratios(stats)], axis=1).iloc[0]
+
+    def as_frame(self, result):
+        """Turns a lookup result into a DataFrame with the player names attached."""
+        df = pd.DataFrame(result)
+        if 'Player_ID' in df.columns:
+            df.insert(1, 'Player', [self.players.get(int(p), ('-', '-'))[0] for p in df['Player_ID']])
+        return df
+
+
+if __name__ == "__main__":
+    from overall_records import load_cleaned_records
+
+    cleaned_paths = {record_type: path.join(OUTPUT_DIR, path.basename(file_path).replace('.xlsx', '_cleaned.xlsx'))
+                     for record_type, file_path in FILE_PATHS.items()}
+    build_fact_store(load_cleaned_records(cleaned_paths))
@@ -0,0 +1,127 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from os import path
+
+import openpyxl
+
+from clean_excel import (INPUT_DIR, OUTPUT_DIR, RAW_FILE_NAME, RECORD_CONFIGS, _assign_player_ids_columnar,
+                         _clean_sheet_unit, _save_columnar_workbook, load_player_registry, report_unresolved_names,
+                         save_player_registry)
+from instrumentation import finish_run, span, start_run
+from overall_records import combine_all_records
+from parquet_output import columns_to_frame
+
+# --- CONFIGURATION ---
+# ESPNcricinfo team IDs (TEAM_ID in the scrapers) by the team code used in file names
+TEAMS = {
+    'csk': 4343, 'mi': 4346, 'rcb': 4340, 'kkr': 4341, 'dc': 4344,
+    'pbks': 4342, 'rr': 4345, 'srh': 5143, 'gt': 6904, 'lsg': 6903
+}
+
+# Raw workbooks are read from TEAMS_INPUT_DIR/<team>/<record>_records_<team>.xlsx (where
+# scrape_players_seasonwise.js <team> writes them, outside raw_temp, which it wipes). Outputs are
+# partitioned by team and season: TEAMS_OUTPUT_DIR/<team>/ holds that team's cleaned workbooks
+# (one sheet per season), parquet/<record>_cleaned/Season_<year>.parquet and All_Players_Records.
+# The player registry is shared by every team and stays in OUTPUT_DIR.
+TEAMS_INPUT_DIR = path.join(INPUT_DIR, '..', 'raw_teams')
+TEAMS_OUTPUT_DIR = path.join(OUTPUT_DIR, 'teams')
+
+# Worker processes for run_all_franchises() (None = one per CPU)
+FRANCHISE_WORKERS = None
+# -------------------------------------
+
+
+def team_file_paths(team, input_dir=None):
+    """Raw workbook of each record type for one team."""
+    input_dir = path.join(input_dir or TEAMS_INPUT_DIR, team)
+    return {record_type: path.join(input_dir, RAW_FILE_NAME.format(record=record_type.lower(), team=team))
+            for record_type in RECORD_CONFIGS}
+
+
+def team_output_dir(team, output_dir=None):
+    return path.join(output_dir or TEAMS_OUTPUT_DIR, team)
+
+
+def _sheet_units(teams, input_dir=None):
+    """[(team, record_type, file_path, sheet_name)] for every season sheet of the given teams."""
+    units = []
+    for team in teams:
+        for record_type, file_path in team_file_paths(team, input_dir).items():
+            try:
+                wb = openpyxl.load_workbook(file_path, read_only=True)
+            except FileNotFoundError:
+                print(f"❌ Error: {team.upper()} {record_type} file not found at {file_path}")
+                continue
+            units.extend((team, record_type, file_path, sheet_name) for sheet_name in wb.sheetnames)
+            wb.close()
+    return units
+
+
+def _save_team(team, team_dir, cleaned):
+    """
+    Worker task: writes one team's cleaned workbooks and Parquet files from
+    {(record_type, file_path): [(sheet_name, headers, columns)]}, then builds its
+    All_Players_Records from the same tables without reading them back.
+    """
+    os.makedirs(team_dir, exist_ok=True)
+    records = {}
+    for (record_type, file_path), sheets in cleaned.items():
+        _save_columnar_workbook(record_type, file_path, sheets, output_dir=team_dir)
+        records[record_type] = {sheet_name: columns_to_frame(headers, columns) for sheet_name, headers, columns in sheets}
+
+    missing = [record_type for record_type in RECORD_CONFIGS if record_type not in records]
+    if missing:
+        print(f"⚠️ Warning: {team.upper()} has no {', '.join(missing)} records; All_Players_Records not built.")
+        return team_dir
+    combine_all_records(records, base_path=team_dir, team=team)
+    return team_dir
+
+
+def run_all_franchises(teams=None, workers=None, input_dir=None, output_dir=None, registry_path=None):
+    """
+    Cleans and aggregates several teams concurrently. Every season sheet of every team is
+    cleaned in a process pool; Player_IDs are then assigned here from the one shared registry
+    (teams in the given order, then the sequential order within a team), so a player who moved
+    between teams keeps a single ID. Finally each team is saved and aggregated in its own worker.
+    Returns {team: output directory}.
+    """
+    teams = list(teams or TEAMS)
+    unknown = [team for team in teams if team not in TEAMS]
+    if unknown:
+        raise ValueError(f"Unknown team code(s) {unknown}; expected some of {list(TEAMS)}.")
+    workers = workers or FRANCHISE_WORKERS or os.cpu_count()
+    output_dir = output_dir or TEAMS_OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    start_run('franchises')
+    load_player_registry(registry_path)
+    units = _sheet_units(teams, input_dir)
+    print(f"\n--- Cleaning {len(units)} sheets of {len(teams)} team(s) across {workers} worker processes ---")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Spans recorded inside the workers stay in those processes; each pool is timed as one step
+        with span('clean_parallel', workers=workers) as step:
+            results = list(pool.map(_clean_sheet_unit, *list(zip(*units))[1:])) if units else []
+            step['rows'] = sum(len(columns[0]) if columns else 0 for _, columns in results)
+
+        by_team = {}
+        for (team, record_type, file_path, sheet_name), (headers, columns) in zip(units, results):
+            with span('assign_ids', len(columns[0]) if columns else 0, team=team, record_type=record_type,
+                      sheet=sheet_name):
+                _assign_player_ids_columnar(headers, columns)
+            by_team.setdefault(team, {}).setdefault((record_type, file_path), []).append((sheet_name, headers, columns))
+        save_player_registry(registry_path)
+
+        with span('save_parallel', step['rows'], workers=workers):
+            team_dirs = dict(zip(by_team, pool.map(_save_team, list(by_team),
+                                                   [team_output_dir(team, output_dir) for team in by_team],
+                                                   list(by_team.values()))))
+
+    report_unresolved_names(output_dir)
+    finish_run(output_dir)
+    print(f"\n🎉 SUCCESS: {len(team_dirs)} team(s) cleaned and aggregated into {output_dir}")
+    return team_dirs
+
+
+if __name__ == "__main__":
+    run_all_franchises()
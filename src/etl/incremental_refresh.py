@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+from os import path
+
+import pandas as pd
+
+from clean_excel import INPUT_DIR, OUTPUT_DIR, load_player_registry, save_player_registry
+from instrumentation import start_run
+from json_ingest import JSON_PREFIXES, _season_json_files, clean_season_json
+from leaderboards import refresh_leaderboards
+from overall_records import combine_all_records
+from season_index import build_season_index
+
+# --- CONFIGURATION ---
+# Manifest of the content hash of every season JSON file seen by the last refresh, and a
+# cache of the cleaned season tables, so unchanged seasons are never re-read or re-cleaned.
+MANIFEST_PATH = path.join(OUTPUT_DIR, 'refresh_manifest.json')
+SEASON_CACHE_DIR = path.join(OUTPUT_DIR, 'season_cache')
+SEASON_CACHE_VERSION = 2 # Bumped when clean_season_json's frames change; older cache entries are re-cleaned
+# -------------------------------------
+
+
+def file_hash(file_path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_manifest(manifest_path):
+    if not path.exists(manifest_path):
+        return {}
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest, manifest_path):
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def _cache_path(cache_dir, record_type, sheet_name):
+    return path.join(cache_dir, f"{record_type.lower()}_{sheet_name}.pkl")
+
+
+def incremental_refresh(input_dir=INPUT_DIR, manifest_path=MANIFEST_PATH, cache_dir=SEASON_CACHE_DIR,
+                        force=False):
+    """
+    Re-cleans only the season JSON files whose content hash changed since the last refresh,
+    takes every other season from the cleaned-table cache, and rebuilds All_Players_Records
+    and the cumulative season index from the in-memory tables; the leaderboards re-rank
+    only the changed seasons and all-time. Returns the records dict, or None if nothing changed.
+    """
+    print(f"--- Incremental refresh of {input_dir} ---")
+    start_run('incremental_refresh')
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = {} if force else _load_manifest(manifest_path)
+    load_player_registry()
+
+    records = {}
+    new_manifest = {}
+    changed = []
+    for record_type in JSON_PREFIXES:
+        records[record_type] = {}
+        new_manifest[record_type] = {}
+        for season, file_path in _season_json_files(record_type, input_dir):
+            sheet_name = f"Season_{season}"
+            content_hash = file_hash(file_path)
+            entry = manifest.get(record_type, {}).get(sheet_name)
+            cache_file = _cache_path(cache_dir, record_type, sheet_name)
+
+            # A file with no rows has no cache file; its manifest entry says so
+            current = entry and entry['hash'] == content_hash and entry.get('version') == SEASON_CACHE_VERSION
+            if current and entry.get('empty'):
+                df = None
+            elif current and path.exists(cache_file):
+                df = pd.read_pickle(cache_file)
+            else:
+                _, df = clean_season_json(record_type, season, file_path)
+                if df is not None:
+                    df.to_pickle(cache_file)
+                elif path.exists(cache_file):
+                    os.remove(cache_file)
+                changed.append((record_type, sheet_name))
+
+            new_manifest[record_type][sheet_name] = {'source': path.basename(file_path), 'hash': content_hash,
+                                                     'empty': df is None, 'version': SEASON_CACHE_VERSION}
+            if df is not None:
+                records[record_type][sheet_name] = df
+
+        # Seasons whose JSON file was removed drop out of the cache
+        for sheet_name in set(manifest.get(record_type, {})) - set(new_manifest[record_type]):
+            changed.append((record_type, sheet_name))
+            cache_file = _cache_path(cache_dir, record_type, sheet_name)
+            if path.exists(cache_file):
+                os.remove(cache_file)
+
+    save_player_registry()
+
+    if not changed:
+        print("✅ No season files changed since the last refresh; outputs are up to date.")
+        return None
+
+    print(f"    - Re-cleaned {len(changed)} changed season sheet(s): "
+          + ", ".join(f"{t} {s}" for t, s in changed))
+    # All_Players_Records is rebuilt from the in-memory tables rather than patched: HS, BBI, MD
+    # and Span_Years are bests and ranges, which cannot be taken back out when a season is replaced
+    combine_all_records(records, keep_spans=True)
+    build_season_index(records)
+    refresh_leaderboards(records, None if force else {int(s.split('_')[-1]) for _, s in changed})
+    # Only record the new hashes once the combined output has been written
+    _save_manifest(new_manifest, manifest_path)
+    return records
+
+
+if __name__ == "__main__":
+    incremental_refresh()
@@ -0,0 +1,116 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from os import path
+
+try:
+    import psutil
+except ImportError: # Optional: without it RSS comes from the resource module (POSIX only)
+    psutil = None
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+# --- CONFIGURATION ---
+# Every named step of a run becomes a span (wall time, rows, rows/sec, peak RSS). When the
+# run ends the spans are appended to TRACE_FILE in its output directory, one JSON object
+# per line, and summarised in a table when PRINT_SUMMARY is on.
+TRACE_ENABLED = True
+TRACE_FILE = 'etl_trace.jsonl'
+PRINT_SUMMARY = True
+# -------------------------------------
+
+SPANS = []
+_RUN = {}
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB (None if it cannot be measured)."""
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        peak = getattr(info, 'peak_wset', None) # Windows keeps the peak itself
+        if peak is not None:
+            return round(peak / 2 ** 20, 1)
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1) # bytes on macOS, KB on Linux
+    if psutil is not None:
+        return round(psutil.Process().memory_info().rss / 2 ** 20, 1) # Current RSS is the best available
+    return None
+
+
+@contextmanager
+def span(name, rows=None, **attrs):
+    """
+    Times the enclosed block as one named step. Extra keyword arguments (record_type,
+    sheet, ...) are kept on the span; when the row count is only known at the end, set
+    it on the yielded record: `with span('load') as s: ...; s['rows'] = len(df)`.
+    """
+    record = {'name': name, 'rows': rows, **attrs}
+    if not TRACE_ENABLED:
+        yield record
+        return
+
+    record['start'] = datetime.now().isoformat(timespec='milliseconds')
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        wall = time.perf_counter() - start
+        record['wall_s'] = round(wall, 6)
+        record['rows_per_s'] = round(record['rows'] / wall, 1) if record['rows'] and wall > 0 else None
+        record['peak_rss_mb'] = peak_rss_mb()
+        SPANS.append(record)
+
+
+def start_run(run_name, keep_spans=False):
+    """
+    Starts a new run: clears the collected spans and tags the ones that follow with the run.
+    With keep_spans the spans a caller has already collected are carried into this run.
+    """
+    if not keep_spans:
+        SPANS.clear()
+    _RUN.clear()
+    _RUN.update({'run': run_name, 'run_id': datetime.now().strftime('%Y%m%dT%H%M%S'), 'pid': os.getpid()})
+
+
+def summary_table(spans=None):
+    """One row per step name: calls, total wall time, rows, rows/sec and the highest peak RSS."""
+    totals = {}
+    for record in SPANS if spans is None else spans:
+        total = totals.setdefault(record['name'], {'calls': 0, 'wall_s': 0.0, 'rows': 0, 'peak_rss_mb': None})
+        total['calls'] += 1
+        total['wall_s'] += record['wall_s']
+        total['rows'] += record['rows'] or 0
+        if record['peak_rss_mb'] is not None:
+            total['peak_rss_mb'] = max(total['peak_rss_mb'] or 0, record['peak_rss_mb'])
+
+    lines = [f"{'Step':<16}{'Calls':>7}{'Wall (s)':>11}{'Share':>8}{'Rows':>11}{'Rows/s':>12}{'Peak RSS (MB)':>15}"]
+    grand_total = sum(t['wall_s'] for t in totals.values()) or 1
+    for name, t in sorted(totals.items(), key=lambda item: -item[1]['wall_s']):
+        rate = f"{t['rows'] / t['wall_s']:,.0f}" if t['rows'] and t['wall_s'] > 0 else '-'
+        peak = f"{t['peak_rss_mb']:.1f}" if t['peak_rss_mb'] is not None else '-'
+        lines.append(f"{name:<16}{t['calls']:>7}{t['wall_s']:>11.3f}{t['wall_s'] / grand_total:>8.1%}"
+                     f"{t['rows']:>11,}{rate:>12}{peak:>15}")
+    return '\n'.join(lines)
+
+
+def finish_run(output_dir):
+    """Appends the run's spans to TRACE_FILE in output_dir and prints the summary table."""
+    if not TRACE_ENABLED or not SPANS:
+        return None
+    trace_path = path.join(output_dir, TRACE_FILE)
+    with open(trace_path, 'a', encoding='utf-8') as f:
+        for record in SPANS:
+            f.write(json.dumps({**_RUN, **record}, ensure_ascii=False, default=str) + '\n')
+
+    if PRINT_SUMMARY:
+        print(f"\n⏱️ {_RUN.get('run', 'Run')} timings ({len(SPANS)} spans, trace: {trace_path})")
+        print(summary_table())
+    SPANS.clear()
+    return trace_path
@@ -0,0 +1,108 @@
+import json
+import re
+from glob import glob
+from os import path
+
+from clean_excel import (INPUT_DIR, OUTPUT_DIR, PARQUET_DIR, _clean_sheet_columnar, load_player_registry,
+                         report_unresolved_names, save_player_registry)
+from instrumentation import finish_run, span, start_run
+from parquet_output import columns_to_frame, parquet_enabled, write_cleaned_seasons
+
+# --- CONFIGURATION ---
+# Record type -> prefix of the per-season JSON files written by scrape_players_seasonwise.js
+JSON_PREFIXES = {
+    'Batting': 'batting',
+    'Bowling': 'bowling',
+    'Fielding': 'fielding'
+}
+
+# The scraper names files by the Statsguru season it queried. The 2007/08 season is IPL 2008,
+# which is why the raw workbooks have a 'Season_2008' sheet built from batting_2007.json.
+JSON_SEASON_OVERRIDES = {
+    2007: 2008
+}
+# -------------------------------------
+
+
+def _season_json_files(record_type, input_dir=INPUT_DIR):
+    """Returns [(season, file_path)] for one record type, sorted by season."""
+    pattern = re.compile(rf"{JSON_PREFIXES[record_type]}_(\d{{4}})\.json$")
+    files = []
+    for file_path in glob(path.join(input_dir, f"{JSON_PREFIXES[record_type]}_*.json")):
+        match = pattern.search(path.basename(file_path))
+        if match:
+            year = int(match.group(1))
+            files.append((JSON_SEASON_OVERRIDES.get(year, year), file_path))
+    return sorted(files)
+
+
+def _read_season_json(file_path):
+    """Reads one season JSON file into (headers, columns), like the raw workbook sheet."""
+    with open(file_path, encoding='utf-8') as f:
+        records = json.load(f)
+
+    # Header = keys in order of first appearance, as XLSX.utils.json_to_sheet lays them out
+    headers = []
+    for record in records:
+        for key in record:
+            if key not in headers:
+                headers.append(key)
+
+    # Empty strings are written as blank cells in the raw workbooks
+    columns = [[record.get(h) if record.get(h) != '' else None for record in records] for h in headers]
+    return headers, columns
+
+
+def clean_season_json(record_type, season, file_path):
+    """
+    Cleans one season JSON file into (sheet_name, DataFrame); the frame is None if the file is
+    empty. The JSON holds every value as text; columns_to_frame types the cleaned columns as
+    pd.read_excel reads the cleaned workbook (Player_ID 2, not '002'), so both sources match.
+    """
+    sheet_name = f"Season_{season}"
+    with span('load', record_type=record_type, sheet=sheet_name) as loaded:
+        headers, columns = _read_season_json(file_path)
+        loaded['rows'] = len(columns[0]) if columns else 0
+    if not headers:
+        return sheet_name, None
+    _clean_sheet_columnar(record_type, sheet_name, headers, columns)
+    df = columns_to_frame(headers, columns)
+    print(f"    - {record_type} {sheet_name}: {len(df)} rows from {path.basename(file_path)}")
+    return sheet_name, df
+
+
+def load_season_json(record_type, input_dir=INPUT_DIR):
+    """Cleans every season JSON file of one record type into {sheet_name: DataFrame}."""
+    sheets = {}
+    for season, file_path in _season_json_files(record_type, input_dir):
+        sheet_name, df = clean_season_json(record_type, season, file_path)
+        if df is not None:
+            sheets[sheet_name] = df
+    return sheets
+
+
+def ingest_all_json(input_dir=INPUT_DIR, registry_path=None):
+    """
+    Streams the season JSON files straight into cleaned tables, skipping the raw and
+    cleaned workbooks. Player IDs come from the shared player registry, with new players
+    numbered in the same order as run_all_transformations. The cleaned tables are also
+    written as Parquet when OUTPUT_FORMATS includes it.
+    """
+    print(f"--- Ingesting season JSON files from {input_dir} ---")
+    start_run('json_ingest')
+    load_player_registry(registry_path)
+    records = {record_type: load_season_json(record_type, input_dir) for record_type in JSON_PREFIXES}
+    save_player_registry(registry_path)
+    report_unresolved_names()
+    if parquet_enabled():
+        for record_type, sheets in records.items():
+            with span('save_parquet', sum(len(df) for df in sheets.values()), record_type=record_type):
+                write_cleaned_seasons(record_type, sheets, PARQUET_DIR)
+    finish_run(OUTPUT_DIR)
+    return records
+
+
+if __name__ == "__main__":
+    from overall_records import combine_all_records
+
+    combine_all_records(ingest_all_json())
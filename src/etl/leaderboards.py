@@ -0,0 +1,206 @@
+import json
+import os
+import re
+from os import path
+
+import numpy as np
+import pandas as pd
+
+from career_metrics import CAREER_RATIOS, compute_ratios
+from clean_excel import FILE_PATHS, OUTPUT_DIR
+from fact_store import _player_dimension, _season_facts
+
+# --- CONFIGURATION ---
+# Sorted top-K boards for every metric, per season and all-time, kept as .npy Player_ID/value
+# arrays with offsets per board, so reading a leaderboard is one slice.
+LEADERBOARD_DIR = path.join(OUTPUT_DIR, 'leaderboards')
+LEADERBOARD_K = 100 # Entries kept per board
+
+# Metric -> True when higher is better. Counts are per-player sums of the season rows (so the
+# all-time boards agree with All_Players_Records); ratios come from career_metrics.compute_ratios.
+LEADERBOARD_METRICS = {
+    'Runs': True, 'Fours': True, 'Sixes': True, 'Fifties': True, 'Hundreds': True,
+    'Ave': True, 'SR': True,
+    'Wkts': True, '4_Wkts': True, 'Mdns': True, 'Ave_bowl': False, 'Econ': False, 'SR_bowl': False,
+    'Dis': True, 'Ct': True, 'St': True, 'Ct_Fi': True
+}
+
+# Qualification for ratio boards: metric -> (column, minimum in one season, minimum all-time)
+QUALIFICATION = {
+    'Ave': ('Inns', 5, 20),
+    'SR': ('BF', 60, 250),
+    'Ave_bowl': ('Balls_bowl', 60, 300),
+    'Econ': ('Balls_bowl', 60, 300), # 10 overs in a season, 50 all-time
+    'SR_bowl': ('Balls_bowl', 60, 300)
+}
+
+# Additive season columns the boards are computed from
+LEADERBOARD_STATS = ['Runs', 'Fours', 'Sixes', 'Fifties', 'Hundreds', 'Inns', 'NO', 'BF',
+                     'Wkts', '4_Wkts', 'Mdns', 'Runs_bowl', 'Balls_bowl', 'Dis', 'Ct', 'St', 'Ct_Fi']
+# -------------------------------------
+
+ALL_TIME = 0 # Scope key of the all-time boards (seasons are keyed by year)
+
+
+def _season_stats(records):
+    """LEADERBOARD_STATS per (Player_ID, Season) from cleaned tables, indexed by both keys."""
+    facts = _season_facts(records)
+    return facts.set_index(['Player_ID', 'Season'])[LEADERBOARD_STATS].astype(np.int64)
+
+
+def _season_records(records, season):
+    """The sheets of one season (sheet names carry the year, e.g. Season_2023) from cleaned tables."""
+    return {record_type: {name: df for name, df in sheets.items() if re.search(rf'(?<!\d){season}(?!\d)', name)}
+            for record_type, sheets in records.items()}
+
+
+def _rank(stats, scope):
+    """{metric: (Player_IDs, values)} of the top LEADERBOARD_K rows of `stats` (indexed by Player_ID)."""
+    ratios = compute_ratios(stats.assign(Dismissals=stats['Inns'] - stats['NO']),
+                            [m for m in LEADERBOARD_METRICS if m in CAREER_RATIOS])
+    player_ids = stats.index.to_numpy().astype(np.int32)
+    boards = {}
+    for metric, higher_is_better in LEADERBOARD_METRICS.items():
+        if metric in ratios.columns:
+            values = ratios[metric].to_numpy(dtype=float)
+            eligible = ~np.isnan(values)
+            if metric in QUALIFICATION:
+                column, season_min, all_time_min = QUALIFICATION[metric]
+                eligible &= stats[column].to_numpy() >= (all_time_min if scope == ALL_TIME else season_min)
+        else:
+            values = stats[metric].to_numpy(dtype=float)
+            eligible = values > 0
+        ids, values = player_ids[eligible], values[eligible]
+        order = np.lexsort((ids, -values if higher_is_better else values))[:LEADERBOARD_K] # Ties in Player_ID order
+        boards[metric] = (ids[order], values[order])
+    return boards
+
+
+class Leaderboards:
+    """
+    Top-K leaderboards per metric, for every season and all-time. Each board is sorted once
+    when built, so top() is a slice. update_season() re-ranks only the changed season and the
+    all-time boards, adjusting the all-time totals by the season's old and new rows.
+    """
+
+    def __init__(self, season_stats, players):
+        self.season_stats = season_stats.sort_index()
+        self.players = players
+        self.totals = self.season_stats.groupby(level='Player_ID').sum()
+        self.boards = {ALL_TIME: _rank(self.totals, ALL_TIME)}
+        for season, stats in self.season_stats.groupby(level='Season'):
+            self.boards[int(season)] = _rank(stats.droplevel('Season'), int(season))
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds every board from cleaned tables ({record_type: {sheet_name: DataFrame}})."""
+        return cls(_season_stats(records), _player_dimension(records))
+
+    @property
+    def seasons(self):
+        return sorted(scope for scope in self.boards if scope != ALL_TIME)
+
+    def top(self, metric, season=None, n=10):
+        """The n best players for a metric in one season (None = all-time), best first."""
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"Unknown metric '{metric}'; expected one of {list(LEADERBOARD_METRICS)}.")
+        ids, values = self.boards.get(ALL_TIME if season is None else season, {}).get(metric, (np.empty(0, np.int32), np.empty(0)))
+        ids, values = ids[:n], values[:n]
+        # Tied values share the rank of the first of them (1, 2, 2, 4)
+        first_of_tie = np.r_[True, values[1:] != values[:-1]]
+        rank = np.maximum.accumulate(np.where(first_of_tie, np.arange(len(values)), 0)) + 1
+        return pd.DataFrame({'Rank': rank, 'Player_ID': ids,
+                             'Player': [self.players.get(int(p), ('-', '-'))[0] for p in ids],
+                             metric: values if metric in CAREER_RATIOS else values.astype(np.int64)})
+
+    def update_season(self, season, records):
+        """
+        Replaces one season's data with the season rows in `records` (cleaned tables; other
+        seasons in them are ignored; no rows removes the season) and re-ranks that season and
+        the all-time boards. No other season is recomputed.
+        """
+        new = _season_stats(_season_records(records, season))
+        new = new[new.index.get_level_values('Season') == season]
+        old = self.season_stats[self.season_stats.index.get_level_values('Season') == season]
+
+        # All-time totals: add the new season and take the old one away, as in update_career_stats
+        totals = self.totals.add(new.groupby(level='Player_ID').sum(), fill_value=0)
+        totals = totals.sub(old.groupby(level='Player_ID').sum(), fill_value=0).astype(np.int64)
+        self.totals = totals[(totals != 0).any(axis=1)]
+
+        self.season_stats = pd.concat([self.season_stats.drop(old.index), new]).sort_index()
+        for pid, names in _player_dimension(_season_records(records, season)).items():
+            self.players.setdefault(pid, names)
+        if len(new):
+            self.boards[season] = _rank(new.droplevel('Season'), season)
+        else:
+            self.boards.pop(season, None)
+        self.boards[ALL_TIME] = _rank(self.totals, ALL_TIME)
+
+    def save(self, board_dir=LEADERBOARD_DIR):
+        """
+        Writes the boards as <metric>_ids.npy / <metric>_values.npy (every scope's board
+        back to back, all-time first), <metric>_offsets.npy and the season rows they came from.
+        """
+        os.makedirs(board_dir, exist_ok=True)
+        scopes = [ALL_TIME] + self.seasons
+        for metric in LEADERBOARD_METRICS:
+            boards = [self.boards[scope][metric] for scope in scopes]
+            np.save(path.join(board_dir, f"{metric}_ids.npy"), np.concatenate([ids for ids, _ in boards]).astype(np.int32))
+            np.save(path.join(board_dir, f"{metric}_values.npy"), np.concatenate([v for _, v in boards]).astype(float))
+            np.save(path.join(board_dir, f"{metric}_offsets.npy"),
+                    np.concatenate([[0], np.cumsum([len(ids) for ids, _ in boards])]).astype(np.int32))
+        self.season_stats.to_pickle(path.join(board_dir, 'season_stats.pkl'))
+
+        # Metadata last: a directory without meta.json is an incomplete build
+        meta = {'scopes': scopes, 'players': self.players}
+        with open(path.join(board_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        return board_dir
+
+    @classmethod
+    def load(cls, board_dir=LEADERBOARD_DIR):
+        """Reads saved boards without re-ranking anything."""
+        with open(path.join(board_dir, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        boards = cls.__new__(cls)
+        boards.season_stats = pd.read_pickle(path.join(board_dir, 'season_stats.pkl'))
+        boards.players = {int(pid): tuple(names) for pid, names in meta['players'].items()}
+        boards.totals = boards.season_stats.groupby(level='Player_ID').sum()
+        boards.boards = {scope: {} for scope in meta['scopes']}
+        for metric in LEADERBOARD_METRICS:
+            ids = np.load(path.join(board_dir, f"{metric}_ids.npy"))
+            values = np.load(path.join(board_dir, f"{metric}_values.npy"))
+            offsets = np.load(path.join(board_dir, f"{metric}_offsets.npy"))
+            for i, scope in enumerate(meta['scopes']):
+                boards.boards[scope][metric] = (ids[offsets[i]:offsets[i + 1]], values[offsets[i]:offsets[i + 1]])
+        return boards
+
+
+def refresh_leaderboards(records, changed_seasons=None, board_dir=LEADERBOARD_DIR):
+    """
+    Brings the saved leaderboards up to date: only the given seasons are re-ranked when
+    boards already exist, otherwise (or with changed_seasons=None) every board is built.
+    """
+    if changed_seasons is not None and path.exists(path.join(board_dir, 'meta.json')):
+        boards = Leaderboards.load(board_dir)
+        for season in sorted(changed_seasons):
+            boards.update_season(season, records)
+        print(f"✅ Leaderboards updated for season(s) {', '.join(map(str, sorted(changed_seasons)))}.")
+    else:
+        boards = Leaderboards.from_records(records)
+        print(f"✅ Leaderboards built: {len(LEADERBOARD_METRICS)} metrics x {len(boards.seasons)} seasons + all-time.")
+    boards.save(board_dir)
+    return boards
+
+
+if __name__ == "__main__":
+    from overall_records import load_cleaned_records
+
+    cleaned_paths = {record_type: path.join(OUTPUT_DIR, path.basename(file_path).replace('.xlsx', '_cleaned.xlsx'))
+                     for record_type, file_path in FILE_PATHS.items()}
+    boards = refresh_leaderboards(load_cleaned_records(cleaned_paths))
+    print("\nMost runs, all-time:")
+    print(boards.top('Runs', n=5).to_string(index=False))
+    print("\nBest economy, 2023:")
+    print(boards.top('Econ', 2023, n=5).to_string(index=False))
@@ -0,0 +1,187 @@
+import json
+import os
+from os import path
+
+import numpy as np
+import pandas as pd
+
+from clean_excel import INPUT_DIR, OUTPUT_DIR, PARQUET_DIR
+from excel_output import write_excel
+from parquet_output import excel_enabled, parquet_enabled, write_tables
+
+# --- CONFIGURATION ---
+TEAM_RESULTS_CSV = path.join(INPUT_DIR, 'team_results_allpages.csv')
+MATCH_OUTPUT = path.join(OUTPUT_DIR, 'team_results_cleaned.xlsx')
+MATCH_STORE_DIR = path.join(OUTPUT_DIR, 'match_store')
+
+TEAM = 'CSK'
+HOME_GROUNDS = ['Chennai'] # Matches anywhere else count as away, as in match_results.xlsx
+
+# Statsguru uses the name of the season; Franchise groups renamed sides together
+FRANCHISES = {
+    'Kings XI': 'PBKS', 'Punjab Kings': 'PBKS',
+    'Daredevils': 'DC', 'DC': 'DC',
+    'Chargers': 'Deccan Chargers', 'Warriors': 'Pune Warriors', 'Kochi': 'Kochi Tuskers'
+}
+
+# Columns of the match store, in table order; integers use -1 for missing, and the coded
+# columns hold integer codes with their labels in meta.json
+STORE_COLUMNS = ['Date', 'Season', 'Outcome', 'Margin_Value', 'Margin_Unit', 'Balls_Remaining', 'Opponent',
+                 'Franchise', 'Ground', 'Home_Away']
+INTEGER_COLUMNS = ['Season', 'Margin_Value', 'Balls_Remaining']
+CODED_COLUMNS = ['Outcome', 'Margin_Unit', 'Opponent', 'Franchise', 'Ground', 'Home_Away']
+# -------------------------------------
+
+
+def parse_team_results(csv_path=TEAM_RESULTS_CSV, team=TEAM):
+    """
+    Parses the scraped results table once, with vectorized string operations, into typed
+    columns: date and season, outcome for `team`, margin value and unit, balls remaining,
+    opponent and franchise, ground and home/away. Rows are sorted by date.
+    """
+    raw = pd.read_csv(csv_path, dtype=str)
+    teams = raw['Match'].str.extract(r'^\s*(.+?)\s+v\s+(.+?)\s*$')
+    margin = raw['Margin'].str.extract(r'^\s*(\d+)\s+(run|wicket)s?\s*$')
+    date = pd.to_datetime(raw['Start Date'].str.strip(), format='%d-%b-%y', errors='coerce')
+    winner = raw['Winner'].str.strip()
+    result = raw['Result'].str.strip()
+
+    opponent = teams[1].where(teams[0] == team, teams[0])
+    ground = raw['Ground'].str.strip()
+    matches = pd.DataFrame({
+        'Date': date,
+        'Season': date.dt.year.astype('Int64'),
+        'Outcome': np.select([winner == team, winner.notna()], ['won', 'lost'], default=result),
+        'Margin_Value': pd.to_numeric(margin[0], errors='coerce').astype('Int64'),
+        'Margin_Unit': (margin[1] + 's').where(margin[1].notna()),
+        'Balls_Remaining': pd.to_numeric(raw['BR'], errors='coerce').astype('Int64'),
+        'Opponent': opponent,
+        'Franchise': opponent.map(FRANCHISES).fillna(opponent),
+        'Ground': ground,
+        'Home_Away': np.where(ground.isin(HOME_GROUNDS), 'Home', 'Away'),
+        'Match': raw['Match'].str.strip()
+    })
+    return matches.sort_values('Date', kind='mergesort').reset_index(drop=True)
+
+
+def _group_index(codes):
+    """Rows of each code in date order (rows are date-sorted) plus per-code offsets."""
+    rows = np.argsort(codes, kind='stable').astype(np.int32)
+    offsets = np.searchsorted(codes[rows], np.arange(codes.max() + 2 if len(codes) else 1)).astype(np.int32)
+    return rows, offsets
+
+
+def build_match_store(matches, store_dir=MATCH_STORE_DIR):
+    """
+    Persists the typed matches as .npy columns sorted by date (dates as datetime64[D],
+    text as integer codes), with date-ordered row indexes per opponent, franchise and ground.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    np.save(path.join(store_dir, 'Date.npy'), matches['Date'].to_numpy().astype('datetime64[D]'))
+    for col in INTEGER_COLUMNS:
+        np.save(path.join(store_dir, f"{col}.npy"), matches[col].fillna(-1).to_numpy(dtype=np.int32))
+
+    labels = {}
+    for col in CODED_COLUMNS:
+        codes, uniques = pd.factorize(matches[col], sort=True) # Missing values get code -1
+        labels[col] = [str(u) for u in uniques]
+        np.save(path.join(store_dir, f"{col}.npy"), codes.astype(np.int16))
+        if col in ['Opponent', 'Franchise', 'Ground']:
+            rows, offsets = _group_index(codes)
+            np.save(path.join(store_dir, f"{col}_rows.npy"), rows)
+            np.save(path.join(store_dir, f"{col}_offsets.npy"), offsets)
+
+    with open(path.join(store_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'n_rows': len(matches), 'labels': labels}, f, ensure_ascii=False)
+    return store_dir
+
+
+class MatchStore:
+    """
+    Memory-mapped match results. Date ranges are binary searches on the date-sorted rows;
+    opponent/franchise/ground filters read one group's row list, itself in date order, so
+    "since 2018 at Chennai" is two binary searches inside that group.
+    """
+
+    def __init__(self, store_dir=MATCH_STORE_DIR):
+        with open(path.join(store_dir, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.n_rows = meta['n_rows']
+        self.labels = meta['labels']
+        self._codes = {col: {label: i for i, label in enumerate(values)} for col, values in self.labels.items()}
+        load = lambda name: np.load(path.join(store_dir, f"{name}.npy"), mmap_mode='r')
+        self.columns = {col: load(col) for col in STORE_COLUMNS}
+        self.indexes = {col: (load(f"{col}_rows"), load(f"{col}_offsets")) for col in ['Opponent', 'Franchise', 'Ground']}
+
+    def _rows(self, since=None, until=None, **groups):
+        """Row numbers (in date order) matching an optional date range and group filters."""
+        dates = self.columns['Date']
+        rows = None
+        for col, label in groups.items():
+            if label is None:
+                continue
+            code = self._codes[col].get(label)
+            if code is None:
+                return np.empty(0, dtype=np.int32)
+            index_rows, offsets = self.indexes[col]
+            group = np.asarray(index_rows[offsets[code]:offsets[code + 1]])
+            rows = group if rows is None else np.intersect1d(rows, group, assume_unique=True)
+
+        if rows is None:
+            start = np.searchsorted(dates, np.datetime64(since, 'D')) if since else 0
+            end = np.searchsorted(dates, np.datetime64(until, 'D'), side='right') if until else self.n_rows
+            return np.arange(start, end, dtype=np.int32)
+
+        # Within a group rows are in date order, so the range is two binary searches
+        group_dates = dates[rows]
+        start = np.searchsorted(group_dates, np.datetime64(since, 'D')) if since else 0
+        end = np.searchsorted(group_dates, np.datetime64(until, 'D'), side='right') if until else len(rows)
+        return rows[start:end]
+
+    def matches(self, since=None, until=None, opponent=None, franchise=None, ground=None):
+        """Matching rows as a DataFrame, in date order; dates are 'YYYY-MM-DD' strings or dates."""
+        rows = self._rows(since, until, Opponent=opponent, Franchise=franchise, Ground=ground)
+        data = {}
+        for col, values in self.columns.items():
+            values = np.asarray(values[rows])
+            if col in self.labels:
+                data[col] = pd.Categorical.from_codes(values, categories=self.labels[col])
+            elif col in INTEGER_COLUMNS:
+                data[col] = pd.Series(values, dtype='Int64').mask(values < 0)
+            else:
+                data[col] = values
+        return pd.DataFrame(data)
+
+    def record(self, since=None, until=None, opponent=None, franchise=None, ground=None):
+        """Won/lost/other counts and win % (of matches with a result) for the matching rows."""
+        rows = self._rows(since, until, Opponent=opponent, Franchise=franchise, Ground=ground)
+        outcomes = np.asarray(self.columns['Outcome'][rows])
+        won = int((outcomes == self._codes['Outcome'].get('won', -2)).sum())
+        lost = int((outcomes == self._codes['Outcome'].get('lost', -2)).sum())
+        return {'Mat': len(rows), 'Won': won, 'Lost': lost, 'Other': len(rows) - won - lost,
+                'Win_%': round(100 * won / (won + lost), 2) if won + lost else None}
+
+    def record_by(self, column, since=None, until=None):
+        """record() for every opponent, franchise or ground, using that column's index."""
+        return pd.DataFrame([{column: label, **self.record(since, until, **{column.lower(): label})}
+                             for label in self.labels[column]])
+
+
+def run_match_results(csv_path=TEAM_RESULTS_CSV, output_path=MATCH_OUTPUT, store_dir=MATCH_STORE_DIR):
+    """Parses the results table, saves the typed table and builds the indexed match store."""
+    print(f"--- Building match results from {path.basename(csv_path)} ---")
+    matches = parse_team_results(csv_path)
+    if excel_enabled():
+        write_excel({'Matches': matches.assign(Date=matches['Date'].dt.date)}, output_path)
+    if parquet_enabled():
+        write_tables({'Matches': matches}, PARQUET_DIR)
+    build_match_store(matches, store_dir)
+    print(f"✅ {len(matches)} matches from {matches['Date'].min():%Y-%m-%d} to {matches['Date'].max():%Y-%m-%d} "
+          f"saved with date, opponent and ground indexes in {store_dir}")
+    return matches
+
+
+if __name__ == "__main__":
+    run_match_results()
+    store = MatchStore()
+    print(f"\nAt Chennai since 2018: {store.record(since='2018-01-01', ground='Chennai')}")
@@ -1,34 +1,170 @@
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter
-
-def combine_all_records():
-    # File paths
-    base_path = r"F:\Data Analytics\Projects\csk_analysis\data\final_excel"
-    batting_path = base_path + r"\batting_records_csk_cleaned.xlsx"
-    bowling_path = base_path + r"\bowling_records_csk_cleaned.xlsx"
-    fielding_path = base_path + r"\fielding_records_csk_cleaned.xlsx"
-
-    output_excel = base_path + r"\All_Players_Records.xlsx"
-
-    print(f"--- Combining Records into {output_excel.split(r'\\')[-1]} ---")
-
-    # Helper to read all sheets
-    def read_all_sheets(file_path, dtype=None):
-        excel_file = pd.ExcelFile(file_path)
-        dfs = []
-        for sheet in excel_file.sheet_names:
-            # Read the sheet
-            df = pd.read_excel(file_path, sheet_name=sheet, dtype=dtype)
-            df.columns = df.columns.str.strip().str.replace(' ', '_', regex=False) # Clean column names
-            # No need to add Season here, it's already in the cleaned files
-            dfs.append(df)
-        return pd.concat(dfs, ignore_index=True)
-
-    # ----------------------------- 🟡 1. BATTING -----------------------------
-    print("Processing Batting data...")
-    df_bat = read_all_sheets(batting_path)
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from os import path
 
+import pandas as pd
+from career_metrics import balls_to_overs, compute_ratios, overs_to_balls
+from excel_output import write_excel
+from instrumentation import finish_run, start_run
+from instrumentation import span as trace_span # 'span' is the Span_Years table below
+from parquet_output import excel_enabled, load_cleaned_parquet, parquet_enabled, write_tables
+from player_join import multiway_join
+from season_bits import SeasonBits
+
+# --- CONFIGURATION ---
+# The cleaned workbooks are parsed sequentially unless a pool is asked for: LOAD_EXECUTOR
+# 'process' (sidesteps the GIL that openpyxl's XML parsing holds) or 'thread'. Even then the
+# pool is only used once the workbooks add up to LOAD_PARALLEL_MIN_BYTES; smaller ones parse
+# faster than the workers start. LOAD_WORKERS None = one per CPU; one worker is sequential.
+LOAD_EXECUTOR = None
+LOAD_WORKERS = None
+LOAD_PARALLEL_MIN_BYTES = 16 * 2 ** 20
+# -------------------------------------
+
+
+def _parse_sheets(file_path, sheet_names):
+    """
+    Loader task: parses some sheets of one cleaned workbook, opened and closed by the task.
+    Returns (frames, CPU seconds the task spent parsing in its worker thread); CPU rather
+    than wall time, so tasks sharing a core are not counted twice.
+    """
+    start = time.thread_time()
+    with pd.ExcelFile(file_path) as excel_file:
+        frames = [excel_file.parse(sheet) for sheet in sheet_names]
+    return frames, time.thread_time() - start
+
+
+def load_cleaned_records(file_paths, executor=None, workers=None, report=None):
+    """
+    Parses each cleaned workbook exactly once and keeps the raw frames in memory, as
+    {record_type: {sheet_name: DataFrame}}. Every later step derives what it needs from this.
+
+    With a 'process' or 'thread' executor (LOAD_EXECUTOR by default) and workbooks of at
+    least LOAD_PARALLEL_MIN_BYTES, each workbook's sheets are split into one task per
+    worker, fanned out over `workers` and reassembled in workbook and sheet order. The
+    achieved speedup (parse time of all tasks, measured in the workers / wall time of the pool)
+    is printed and, when `report` is a dict (e.g. a trace span), stored in it with the
+    executor, workers and task count.
+    """
+    executor = LOAD_EXECUTOR if executor is None else executor
+    workers = workers or LOAD_WORKERS or os.cpu_count() or 1
+    total_bytes = sum(path.getsize(file_path) for file_path in file_paths.values())
+    if not executor or workers == 1 or total_bytes < LOAD_PARALLEL_MIN_BYTES:
+        records = {}
+        for record_type, file_path in file_paths.items():
+            with pd.ExcelFile(file_path) as excel_file:
+                records[record_type] = {sheet: excel_file.parse(sheet) for sheet in excel_file.sheet_names}
+        if report is not None:
+            report.update({'executor': 'sequential', 'workers': 1, 'tasks': len(file_paths), 'speedup': 1.0})
+        return records
+
+    # Every worker opens a workbook once per task, so sheets are dealt out in `workers` chunks
+    tasks, sheet_order = [], {}
+    for record_type, file_path in file_paths.items():
+        with pd.ExcelFile(file_path) as excel_file:
+            sheet_names = sheet_order[record_type] = excel_file.sheet_names
+        tasks.extend((record_type, file_path, sheet_names[i::workers]) for i in range(min(workers, len(sheet_names))))
+
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    start = time.perf_counter()
+    with pool_class(max_workers=min(workers, len(tasks))) as pool:
+        results = list(pool.map(_parse_sheets, [t[1] for t in tasks], [t[2] for t in tasks]))
+    wall = time.perf_counter() - start
+
+    parsed = {}
+    for (record_type, _, sheet_names), (frames, _) in zip(tasks, results):
+        parsed.update({(record_type, sheet): df for sheet, df in zip(sheet_names, frames)})
+    records = {record_type: {sheet: parsed[record_type, sheet] for sheet in sheet_names}
+               for record_type, sheet_names in sheet_order.items()}
+    busy = sum(seconds for _, seconds in results)
+    speedup = busy / wall if wall > 0 else 1.0
+    print(f"    - Parsed {len(parsed)} sheets from {len(file_paths)} workbooks in {len(tasks)} tasks on "
+          f"{min(workers, len(tasks))} {executor} workers in {wall:.2f}s ({busy:.2f}s of task parse time, "
+          f"{speedup:.2f}x speedup)")
+    if report is not None:
+        report.update({'executor': executor, 'workers': workers, 'tasks': len(tasks),
+                       'parse_s': round(busy, 6), 'speedup': round(speedup, 2)})
+    return records
+
+
+# Strings that carry no fielding detail in the MD column
+MD_EMPTY_VALUES = ['0', 'nan', '-', '0.0']
+
+
+def best_bbi(players, bbi):
+    """
+    Best BBI per player (highest wickets, then lowest runs), vectorized: the figures are
+    parsed into integer wickets/runs columns once and the best row is picked by sorting.
+    Players with no 'w/r' figure get '-'; if any of a player's figures cannot be parsed,
+    their first figure is kept as-is.
+    """
+    is_figure = bbi.str.contains('/', regex=False, na=False)
+    # Same figures int(s.split('/')[0]) / int(s.split('/')[1]) accept
+    parts = bbi.str.extract(r'^\s*([+-]?\d+)\s*/\s*([+-]?\d+)\s*(?:/|$)')
+    parsed = is_figure & parts[0].notna() & parts[1].notna()
+
+    figures = pd.DataFrame({
+        'Player': players,
+        'Wkts': pd.to_numeric(parts[0], errors='coerce'),
+        'Runs': pd.to_numeric(parts[1], errors='coerce'),
+    })[parsed]
+    best = (figures.sort_values(['Player', 'Wkts', 'Runs'], ascending=[True, False, True], kind='mergesort')
+                   .drop_duplicates('Player'))
+    result = pd.Series('-', index=pd.Index(players.dropna().unique()), dtype=object)
+    result[best['Player'].to_numpy()] = (best['Wkts'].astype(int).astype(str) + '/'
+                                         + best['Runs'].astype(int).astype(str)).to_numpy()
+
+    unparsed = (is_figure & ~parsed).groupby(players).any()
+    unparsed = unparsed[unparsed].index
+    if len(unparsed):
+        first_figure = bbi[is_figure].groupby(players[is_figure]).first()
+        result[unparsed] = first_figure[unparsed].to_numpy()
+    return result
+
+
+def best_hs(df_bat):
+    """
+    Career-best innings per player, vectorized: the row with the highest HS_Numeric, a
+    not-out ahead of an out on the same score, then the earliest row. Returns HS and
+    Not_out_status indexed by Player.
+    """
+    ranked = pd.DataFrame({
+        'Player': df_bat['Player'],
+        'HS_Numeric': df_bat['HS_Numeric'],
+        'Not_out': df_bat['Not_out_status'].eq('Not Out'),
+        'Row': range(len(df_bat)),
+        'HS': df_bat['HS'],
+        'Not_out_status': df_bat['Not_out_status'],
+    }).dropna(subset=['Player'])
+    best = (ranked.sort_values(['Player', 'HS_Numeric', 'Not_out', 'Row'], ascending=[True, False, False, True],
+                               kind='mergesort')
+                  .drop_duplicates('Player'))
+    return best.set_index('Player')[['HS', 'Not_out_status']]
+
+
+def max_md_string(players, md):
+    """
+    Most detailed MD string per player, vectorized: the longest value containing '(', else
+    the first informative value, else '-'. Ties keep the earliest row.
+    """
+    informative = md.notna() & ~md.isin(MD_EMPTY_VALUES)
+    detailed = informative & md.str.contains('(', regex=False, na=False)
+    ranked = pd.DataFrame({
+        'Player': players,
+        'Tier': detailed.astype(int) + informative.astype(int),
+        'Length': md.str.len().where(detailed, 0),
+        'Row': range(len(md)),
+        'MD': md.where(informative, '-'),
+    }).dropna(subset=['Player'])
+    best = (ranked.sort_values(['Player', 'Tier', 'Length', 'Row'], ascending=[True, False, False, True],
+                               kind='mergesort')
+                  .drop_duplicates('Player'))
+    return pd.Series(best['MD'].to_numpy(), index=best['Player'].to_numpy())
+
+
+def aggregate_batting(df_bat):
+    """Career batting totals per player from the concatenated season rows."""
     # Explicitly define columns and ensure they exist, using 0 as default for numeric
     bat_cols = ['Player_ID', 'Player', 'Full_Name', 'Season', 'Mat', 'Inns', 'NO', 'Runs', 'HS', 'HS_Numeric',
                 'Not_out_status', 'Ave', 'BF', 'SR', 'Fours', 'Sixes', 'Ducks', 'Fifties', 'Hundreds']
@@ -45,7 +181,7 @@ def combine_all_records():
                     'Fours', 'Sixes', 'Ducks', 'Fifties', 'Hundreds']
     for col in numeric_cols:
         df_bat[col] = pd.to_numeric(df_bat[col], errors='coerce').fillna(0)
-    
+
     # Ensure Player_ID is numeric/integer for aggregation later
     df_bat['Player_ID'] = pd.to_numeric(df_bat['Player_ID'], errors='coerce').fillna(0).astype(int)
 
@@ -53,24 +189,34 @@ def combine_all_records():
     df_bat_grouped = df_bat.groupby('Player', as_index=False).agg({
         'Player_ID': 'first', # Keep one Player_ID per player
         'Full_Name': 'first', # Keep the Full_Name
-        'Season': lambda x: x.nunique(),
+        'Season': 'nunique',
         'Mat': 'sum', 'Inns': 'sum', 'NO': 'sum', 'Runs': 'sum',
         'HS': 'first', 
         'HS_Numeric': 'max', # Use max for best HS
-        'Not_out_status': 'first',
-        'Ave': lambda x: pd.to_numeric(x, errors='coerce').mean(skipna=True), # Use mean of seasonal Ave
-        'BF': 'sum', 'SR': lambda x: pd.to_numeric(x, errors='coerce').mean(skipna=True), # Use mean of seasonal SR
+        'Not_out_status': 'first', # HS and Not_out_status are replaced by the best innings below
+        'BF': 'sum',
         'Hundreds': 'sum', 'Fifties': 'sum', 'Ducks': 'sum',
         'Fours': 'sum', 'Sixes': 'sum'
     })
+    # HS text and Not_out_status of the season with the highest HS_Numeric (a not-out wins a tie)
+    best = best_hs(df_bat).reindex(df_bat_grouped['Player'])
+    df_bat_grouped['HS'] = best['HS'].to_numpy()
+    df_bat_grouped['Not_out_status'] = best['Not_out_status'].to_numpy()
+    # Career Ave and SR from the summed runs, dismissals (Inns - NO) and balls faced
+    ratios = compute_ratios(pd.DataFrame({
+        'Runs': df_bat_grouped['Runs'],
+        'Dismissals': df_bat_grouped['Inns'] - df_bat_grouped['NO'],
+        'BF': df_bat_grouped['BF']
+    }), ['Ave', 'SR'])
+    df_bat_grouped.insert(df_bat_grouped.columns.get_loc('BF'), 'Ave', ratios['Ave'])
+    df_bat_grouped.insert(df_bat_grouped.columns.get_loc('BF') + 1, 'SR', ratios['SR'])
     df_bat_grouped = df_bat_grouped.rename(columns={'Season': 'Seasons_Played'})
     df_bat_grouped['Player_ID'] = df_bat_grouped['Player_ID'].replace(0, pd.NA).combine_first(df_bat_grouped['Player_ID'])
+    return df_bat_grouped
 
 
-    # ----------------------------- 🟢 2. BOWLING -----------------------------
-    print("Processing Bowling data...")
-    df_bowl = read_all_sheets(bowling_path, dtype=str)
-    
+def aggregate_bowling(df_bowl):
+    """Career bowling totals per player from the concatenated season rows (read as text)."""
     # Explicitly define columns and ensure they exist
     bowl_cols = ['Player_ID', 'Player', 'Full_Name', 'Season', 'Mat', 'Inns', 'Overs', 'Mdns', 'Runs', 'Wkts',
                  'BBI', 'Ave', 'Econ', 'SR', '4_Wkts', '5_Wkts']
@@ -79,8 +225,9 @@ def combine_all_records():
         if col not in df_bowl.columns:
             df_bowl[col] = "0" if col not in ['Full_Name'] else '-'
 
-    # Convert numeric safely
-    numeric_cols = ['Mat', 'Inns', 'Overs', 'Mdns', 'Runs', 'Wkts', 'Ave', 'Econ', 'SR', '4_Wkts', '5_Wkts']
+    # Convert numeric safely (Overs via balls, since 37.2 overs is 37 overs and 2 balls)
+    df_bowl['Balls_bowl'] = overs_to_balls(df_bowl['Overs'])
+    numeric_cols = ['Mat', 'Inns', 'Mdns', 'Runs', 'Wkts', '4_Wkts', '5_Wkts']
     for col in numeric_cols:
         df_bowl[col] = pd.to_numeric(df_bowl[col], errors='coerce').fillna(0)
     
@@ -88,32 +235,26 @@ def combine_all_records():
 
     # Ensure BBI is clean and string type
     df_bowl['BBI'] = df_bowl['BBI'].astype(str).str.strip()
-    df_bowl['BBI'] = df_bowl['BBI'].apply(lambda x: x if '/' in x else '-')
-
-    def best_bbi(series):
-        """Return best BBI (highest wickets, then lowest runs)."""
-        valid = [s for s in series if isinstance(s, str) and '/' in s]
-        if not valid:
-            return '-'
-        try:
-            parsed = [(int(s.split('/')[0]), int(s.split('/')[1])) for s in valid]
-            best = sorted(parsed, key=lambda x: (-x[0], x[1]))[0]
-            return f"{best[0]}/{best[1]}"
-        except Exception:
-            return valid[0]
+    df_bowl['BBI'] = df_bowl['BBI'].where(df_bowl['BBI'].str.contains('/', regex=False, na=False), '-')
 
     df_bowl_grouped = df_bowl.groupby(['Player'], as_index=False).agg({
         'Player_ID': 'first', # Keep one Player_ID per player
         'Full_Name': 'first', # Keep the Full_Name
-        'Season': lambda x: x.nunique(),
-        'Mat': 'sum', 'Inns': 'sum', 'Overs': 'sum', 'Mdns': 'sum', 'Runs': 'sum',
+        'Season': 'nunique',
+        'Mat': 'sum', 'Inns': 'sum', 'Balls_bowl': 'sum', 'Mdns': 'sum', 'Runs': 'sum',
         'Wkts': 'sum',
-        'BBI': best_bbi,
-        'Ave': lambda x: pd.to_numeric(x, errors='coerce').mean(skipna=True),
-        'Econ': lambda x: pd.to_numeric(x, errors='coerce').mean(skipna=True),
-        'SR': lambda x: pd.to_numeric(x, errors='coerce').mean(skipna=True),
         '4_Wkts': 'sum', '5_Wkts': 'sum'
     })
+    df_bowl_grouped['BBI'] = best_bbi(df_bowl['Player'], df_bowl['BBI']).reindex(df_bowl_grouped['Player']).to_numpy()
+
+    # Career Overs, Ave, Econ and SR from the summed balls, runs conceded and wickets
+    ratios = compute_ratios(df_bowl_grouped.rename(columns={'Runs': 'Runs_bowl'}), ['Ave_bowl', 'Econ', 'SR_bowl'])
+    df_bowl_grouped['Overs'] = balls_to_overs(df_bowl_grouped['Balls_bowl'])
+    df_bowl_grouped['Ave'] = ratios['Ave_bowl']
+    df_bowl_grouped['Econ'] = ratios['Econ']
+    df_bowl_grouped['SR'] = ratios['SR_bowl']
+    df_bowl_grouped = df_bowl_grouped[['Player', 'Player_ID', 'Full_Name', 'Season', 'Mat', 'Inns', 'Overs', 'Mdns',
+                                       'Runs', 'Wkts', 'BBI', 'Ave', 'Econ', 'SR', '4_Wkts', '5_Wkts']]
 
     df_bowl_grouped = df_bowl_grouped.rename(columns={
         'Season': 'Seasons_Played',
@@ -123,11 +264,11 @@ def combine_all_records():
 
     # Force text format for BBI
     df_bowl_grouped['BBI'] = df_bowl_grouped['BBI'].astype(str)
+    return df_bowl_grouped
 
-    # ----------------------------- 🔵 3. FIELDING -----------------------------
-    print("Processing Fielding data...")
-    df_field = read_all_sheets(fielding_path)
-    
+
+def aggregate_fielding(df_field):
+    """Career fielding totals per player from the concatenated season rows."""
     # Explicitly define columns and ensure they exist
     field_cols = ['Player_ID', 'Player', 'Full_Name', 'Season', 'Mat_field', 'Inns_field', 'Dis', 'Ct', 'St', 'Ct_Wk', 'Ct_Fi', 'MD', 'D/I']
     
@@ -148,121 +289,147 @@ def combine_all_records():
     
     df_field['Player_ID'] = pd.to_numeric(df_field['Player_ID'], errors='coerce').fillna(0).astype(int)
 
-    # Function to get the most detailed MD string (or the first non-empty one)
-    def get_max_md_string(series):
-        valid = [s for s in series if s not in ['0', 'nan', '-', '0.0'] and '(' in s]
-        if valid:
-            return max(valid, key=len)
-        valid_fallback = [s for s in series if s not in ['0', 'nan', '-', '0.0']]
-        if valid_fallback:
-            return valid_fallback[0]
-        return '-'
-
     df_field_grouped = df_field.groupby(['Player'], as_index=False).agg({
         'Player_ID': 'first', # Keep one Player_ID per player
         'Full_Name': 'first', # Keep the Full_Name
-        'Season': lambda x: x.nunique(),
+        'Season': 'nunique',
         'Mat_field': 'sum', 'Inns_field': 'sum', 'Dis': 'sum', 'Ct': 'sum', 'St': 'sum',
         'Ct_Wk': 'sum', 'Ct_Fi': 'sum', 
-        'MD_Numeric': 'sum', # Aggregate the numeric value
-        'MD_Full_String': get_max_md_string, # Keep the best representative string
-        'D/I': 'mean'
+        'MD_Numeric': 'sum' # Aggregate the numeric value
     })
-    df_field_grouped = df_field_grouped.rename(columns={'Season': 'Seasons_Played', 'MD_Full_String': 'MD_String'})
+    # Keep the best representative MD string
+    df_field_grouped['MD_String'] = (max_md_string(df_field['Player'], df_field['MD_Full_String'])
+                                     .reindex(df_field_grouped['Player']).to_numpy())
+    # Career dismissals per innings from the summed totals
+    df_field_grouped['D/I'] = compute_ratios(df_field_grouped, ['D/I'])['D/I']
+    df_field_grouped = df_field_grouped.rename(columns={'Season': 'Seasons_Played'})
     # Drop the original 'MD' column which was a mix of string/numeric before grouping
     df_field_grouped = df_field_grouped.drop(columns=['MD_Numeric'], errors='ignore').rename(columns={'MD_String': 'MD'})
+    return df_field_grouped
+
+
+def combine_all_records(records=None, base_path=None, team='csk', keep_spans=False):
+    """Builds All_Players_Records.xlsx from the cleaned season sheets.
+
+    `records` optionally supplies the cleaned tables already in memory, as
+    {'Batting' | 'Bowling' | 'Fielding': {sheet_name: DataFrame}} (see json_ingest.py),
+    in which case the cleaned workbooks are not read. `base_path` overrides the
+    final_excel directory the files are read from and written to, and `team` picks
+    the <record>_records_<team>_cleaned.xlsx workbooks in it. With `keep_spans` the
+    spans collected before the call (e.g. cleaning the season files) go into this run's trace.
+    """
+    # File paths
+    base_path = base_path or r"F:\Data Analytics\Projects\csk_analysis\data\final_excel"
+    batting_path = path.join(base_path, f"batting_records_{team}_cleaned.xlsx")
+    bowling_path = path.join(base_path, f"bowling_records_{team}_cleaned.xlsx")
+    fielding_path = path.join(base_path, f"fielding_records_{team}_cleaned.xlsx")
+
+    output_excel = path.join(base_path, "All_Players_Records.xlsx")
+    parquet_dir = path.join(base_path, 'parquet')
+
+    output_name = path.basename(output_excel)
+    print(f"--- Combining Records into {output_name} ---")
+    start_run('overall_records', keep_spans=keep_spans)
+
+    # Load every workbook once; all steps below work from this in-memory cache
+    with trace_span('load') as loaded:
+        if records is None and not excel_enabled():
+            records = load_cleaned_parquet(parquet_dir)
+        elif records is None:
+            records = load_cleaned_records({'Batting': batting_path, 'Bowling': bowling_path, 'Fielding': fielding_path},
+                                           report=loaded)
+        loaded['rows'] = sum(len(df) for sheets in records.values() for df in sheets.values())
+
+    # Helper to iterate (sheet name, frame) pairs from the cache
+    def iter_sheets(record_type, dtype=None):
+        for sheet, df in records[record_type].items():
+            df = df.copy()
+            df.columns = df.columns.str.strip().str.replace(' ', '_', regex=False) # Clean column names
+            if dtype is str:
+                df = df.astype(str).mask(df.isna()) # Same values read_excel(dtype=str) gives
+            yield sheet, df
+
+    # Helper to read all sheets
+    def read_all_sheets(record_type, dtype=None):
+        # No need to add Season here, it's already in the cleaned files
+        dfs = [df for _, df in iter_sheets(record_type, dtype=dtype)]
+        return pd.concat(dfs, ignore_index=True)
+
+    # ----------------------------- 🟡 1. BATTING -----------------------------
+    print("Processing Batting data...")
+    with trace_span('aggregate', record_type='Batting') as step:
+        df_bat = read_all_sheets('Batting')
+        step['rows'] = len(df_bat)
+        df_bat_grouped = aggregate_batting(df_bat)
+
+
+    # ----------------------------- 🟢 2. BOWLING -----------------------------
+    print("Processing Bowling data...")
+    with trace_span('aggregate', record_type='Bowling') as step:
+        df_bowl = read_all_sheets('Bowling', dtype=str)
+        step['rows'] = len(df_bowl)
+        df_bowl_grouped = aggregate_bowling(df_bowl)
+
+    # ----------------------------- 🔵 3. FIELDING -----------------------------
+    print("Processing Fielding data...")
+    with trace_span('aggregate', record_type='Fielding') as step:
+        df_field = read_all_sheets('Fielding')
+        step['rows'] = len(df_field)
+        df_field_grouped = aggregate_fielding(df_field)
 
     # ----------------------------- 🟣 4. SPAN YEARS -----------------------------
     print("Calculating Player Spans...")
-    all_seasons = []
-    for path in [batting_path, bowling_path, fielding_path]:
-        excel = pd.ExcelFile(path)
-        for sheet in excel.sheet_names:
-            df = pd.read_excel(path, sheet_name=sheet, dtype=str)
-            df.columns = df.columns.str.strip().str.replace(' ', '_', regex=False)
-            df["Season"] = sheet.split("_")[-1]
-            all_seasons.append(df[["Player", "Season"]])
-
-    if not all_seasons:
-        print("⚠️ Warning: No seasonal data found for span calculation.")
-        span = pd.DataFrame(columns=["Player", "min", "max", "Span_Years"])
-    else:
-        df_span = pd.concat(all_seasons, ignore_index=True).drop_duplicates()
-        df_span["Season"] = pd.to_numeric(df_span["Season"], errors="coerce")
-        span = df_span.groupby("Player")["Season"].agg(["min", "max"]).reset_index()
-        span["Span_Years"] = span["min"].fillna(0).astype(int).astype(str) + "-" + span["max"].fillna(0).astype(int).astype(str)
-        # Handle single year span case
-        span.loc[span['min'] == span['max'], 'Span_Years'] = span['min'].astype(int).astype(str)
-
-    # Merge Span_Years into individual grouped sheets
-    df_bat_grouped = pd.merge(df_bat_grouped, span[['Player', 'Span_Years']], on='Player', how='left')
-    df_bowl_grouped = pd.merge(df_bowl_grouped, span[['Player', 'Span_Years']], on='Player', how='left')
-    df_field_grouped = pd.merge(df_field_grouped, span[['Player', 'Span_Years']], on='Player', how='left')
-    
+    with trace_span('span_years') as step:
+        # One season bitset per player from the loaded sheets; span and gaps are bit operations
+        season_bits = SeasonBits.from_records(records)
+        if not len(season_bits.players):
+            print("⚠️ Warning: No seasonal data found for span calculation.")
+        span = season_bits.summary()
+
+        # Add Span_Years to the individual grouped sheets
+        span_years = span.set_index('Player')['Span_Years']
+        for df_grouped in [df_bat_grouped, df_bowl_grouped, df_field_grouped]:
+            df_grouped['Span_Years'] = df_grouped['Player'].map(span_years)
+        step['rows'] = len(span)
+
     # ----------------------------- ⚫ 5. MERGE ALL -----------------------------
     print("Merging all data frames...")
-    # Base merge using Player, including Full_Name from Batting (will be overwritten if empty)
-    df_final = pd.merge(
-        df_bat_grouped.drop(columns=['Seasons_Played', 'Player_ID', 'Span_Years'], errors='ignore'), 
-        df_bowl_grouped.drop(columns=['Seasons_Played', 'Player_ID', 'Full_Name', 'Span_Years'], errors='ignore'), # Drop duplicate columns
-        on="Player", 
-        how="outer", 
-        suffixes=('_bat', '_bowl')
-    )
-    
-    # Merge with Fielding
-    df_final = pd.merge(
-        df_final, 
-        df_field_grouped.drop(columns=['Seasons_Played', 'Player_ID', 'Full_Name', 'Span_Years'], errors='ignore'), # Drop duplicate columns
-        on="Player", 
-        how="outer", 
-        suffixes=('_bat_bowl', '_field')
-    )
-    
-    # Merge Span, Seasons, and Player_ID (master)
-    df_final = pd.merge(df_final, span[['Player', 'Span_Years']], on='Player', how='left')
-    
-    # Consolidate Seasons_Played (using max from all three dataframes)
-    df_seasons = pd.concat([
-        df_bat_grouped[['Player', 'Seasons_Played']].rename(columns={'Seasons_Played': 'SP_bat'}),
-        df_bowl_grouped[['Player', 'Seasons_Played']].rename(columns={'Seasons_Played': 'SP_bowl'}),
-        df_field_grouped[['Player', 'Seasons_Played']].rename(columns={'Seasons_Played': 'SP_field'})
-    ]).groupby('Player').max().reset_index()
-    df_seasons['Seasons_Played'] = df_seasons[['SP_bat', 'SP_bowl', 'SP_field']].max(axis=1)
-    df_final = pd.merge(df_final, df_seasons[['Player', 'Seasons_Played']], on='Player', how='left')
-    
-    # Consolidate Player_ID (using max, which ignores NA and finds the highest non-zero ID)
-    df_ids = pd.concat([
-        df_bat_grouped[['Player', 'Player_ID']],
-        df_bowl_grouped[['Player', 'Player_ID']],
-        df_field_grouped[['Player', 'Player_ID']]
-    ]).groupby('Player')['Player_ID'].max().reset_index()
-    
-    df_final = pd.merge(df_final, df_ids.rename(columns={'Player_ID': 'Player_ID_master'}), on='Player', how='left')
-    df_final['Player_ID'] = df_final['Player_ID_master'].fillna(0).astype(int)
-    df_final = df_final.drop(columns=['Player_ID_master'], errors='ignore')
-
-    # Final cleanup and NaN replacement
-    df_final = df_final.rename(columns={'Full_Name_bat': 'Full_Name'}, errors='ignore') # Ensure Full_Name is consistently named
-
-    for col in df_final.select_dtypes(include='number').columns:
-        df_final[col] = df_final[col].fillna(0)
-    for col in df_final.select_dtypes(include='object').columns:
-        df_final[col] = df_final[col].fillna('-')
-
-    # Column order for Combined Sheet
-    final_order = [
-        'Player_ID', 'Player', 'Full_Name', 'Span_Years', 'Seasons_Played',
-        # Batting
-        'Mat', 'Inns', 'NO', 'Runs', 'HS', 'HS_Numeric', 'Not_out_status',
-        'Ave', 'BF', 'SR', 'Fours', 'Sixes', 'Ducks', 'Fifties', 'Hundreds',
-        # Bowling
-        'Mat_bowl', 'Inns_bowl', 'Overs', 'Mdns', 'Runs_bowl', 'Wkts', 'BBI', 'Ave_bowl', 'Econ', 'SR_bowl', '4_Wkts', '5_Wkts',
-        # Fielding
-        'Mat_field', 'Inns_field', 'Dis', 'Ct', 'St', 'Ct_Wk', 'Ct_Fi', 'MD', 'D/I' # MD is the string column
-    ]
-    # Reindex columns, dropping any that might not exist after cleaning/merging
-    df_final = df_final.reindex(columns=[col for col in final_order if col in df_final.columns])
+    with trace_span('merge') as step:
+        # One outer join of Batting, Bowling and Fielding (plus Span_Years and Seasons_Played from
+        # the season bitsets) on an integer player key; Full_Name comes from Batting, Player_ID
+        # from all three tables
+        per_table = lambda suffix: {'Seasons_Played': f'SP{suffix}', 'Player_ID': f'ID{suffix}'}
+        df_final = multiway_join(
+            [df_bat_grouped.drop(columns=['Span_Years']).rename(columns=per_table('_bat')),
+             df_bowl_grouped.drop(columns=['Full_Name', 'Span_Years']).rename(columns=per_table('_bowl')),
+             df_field_grouped.drop(columns=['Full_Name', 'Span_Years']).rename(columns=per_table('_field'))],
+            on='Player', suffixes=['_bat', '_bowl', '_field', '_span'], attach=[span[['Player', 'Span_Years', 'Seasons_Played']]]
+        )
+
+        # Consolidate Player_ID (max across the three tables, ignoring NA)
+        df_final['Player_ID'] = df_final[['ID_bat', 'ID_bowl', 'ID_field']].max(axis=1).fillna(0).astype(int)
+
+        # Final cleanup and NaN replacement
+
+        for col in df_final.select_dtypes(include='number').columns:
+            df_final[col] = df_final[col].fillna(0)
+        for col in df_final.select_dtypes(include='object').columns:
+            df_final[col] = df_final[col].fillna('-')
+
+        # Column order for Combined Sheet
+        final_order = [
+            'Player_ID', 'Player', 'Full_Name', 'Span_Years', 'Seasons_Played',
+            # Batting
+            'Mat', 'Inns', 'NO', 'Runs', 'HS', 'HS_Numeric', 'Not_out_status',
+            'Ave', 'BF', 'SR', 'Fours', 'Sixes', 'Ducks', 'Fifties', 'Hundreds',
+            # Bowling
+            'Mat_bowl', 'Inns_bowl', 'Overs', 'Mdns', 'Runs_bowl', 'Wkts', 'BBI', 'Ave_bowl', 'Econ', 'SR_bowl', '4_Wkts', '5_Wkts',
+            # Fielding
+            'Mat_field', 'Inns_field', 'Dis', 'Ct', 'St', 'Ct_Wk', 'Ct_Fi', 'MD', 'D/I' # MD is the string column
+        ]
+        # Reindex columns, dropping any that might not exist after cleaning/merging
+        df_final = df_final.reindex(columns=[col for col in final_order if col in df_final.columns])
+        step['rows'] = len(df_final)
 
     # ----------------------------- 🧾 6. SAVE FILES -----------------------------
     # Define preferred column order for individual sheets to place Span_Years and Full_Name early
@@ -270,45 +437,34 @@ def combine_all_records():
         base_cols = ['Player_ID', 'Player', 'Full_Name', 'Span_Years', 'Seasons_Played']
         return base_cols + [c for c in df.columns if c not in base_cols]
 
-    with pd.ExcelWriter(output_excel, engine="openpyxl") as writer:
-        
-        # Prepare and save Batting sheet
-        df_bat_grouped.reindex(columns=get_sheet_order(df_bat_grouped)).to_excel(writer, index=False, sheet_name="Batting")
-
-        # Prepare and save Bowling sheet (and rename for standalone view)
-        df_bowl_temp = df_bowl_grouped.rename(columns={'Mat_bowl': 'Mat', 'Inns_bowl': 'Inns', 'Runs_bowl': 'Runs', 'Ave_bowl': 'Ave', 'SR_bowl': 'SR'}).copy()
-        df_bowl_temp.reindex(columns=get_sheet_order(df_bowl_temp)).to_excel(writer, index=False, sheet_name="Bowling")
-        
-        # Prepare and save Fielding sheet (Ensure the final MD is the string one)
-        df_field_temp = df_field_grouped.rename(columns={'Mat_field': 'Mat', 'Inns_field': 'Inns'}).copy()
-        df_field_temp.reindex(columns=get_sheet_order(df_field_temp)).to_excel(writer, index=False, sheet_name="Fielding")
-        
-        # Save Combined sheet
-        df_final.to_excel(writer, index=False, sheet_name="Combined")
-
-    # Format BBI and MD columns as text using openpyxl
-    wb = load_workbook(output_excel)
-    
-    # List of sheet/column pairs to format as text
-    text_formats = [
-        ("Bowling", "BBI"), ("Combined", "BBI"),
-        ("Fielding", "MD"), ("Combined", "MD")
-    ]
-    
-    for sheet_name, col_header in text_formats:
-        if sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            # Find the column
-            for col_idx in range(1, ws.max_column + 1):
-                header = ws.cell(row=1, column=col_idx).value
-                if header == col_header:
-                    col_letter = get_column_letter(col_idx)
-                    # Apply text format to the entire column
-                    for row in range(2, ws.max_row + 1):
-                        ws[f"{col_letter}{row}"].number_format = "@"
-                    break
-    
-    wb.save(output_excel)
+    # Prepare the Bowling and Fielding sheets (renamed for standalone view; the final MD is the string one)
+    df_bowl_temp = df_bowl_grouped.rename(columns={'Mat_bowl': 'Mat', 'Inns_bowl': 'Inns', 'Runs_bowl': 'Runs', 'Ave_bowl': 'Ave', 'SR_bowl': 'SR'}).copy()
+    df_field_temp = df_field_grouped.rename(columns={'Mat_field': 'Mat', 'Inns_field': 'Inns'}).copy()
+    outputs = {
+        "Batting": df_bat_grouped.reindex(columns=get_sheet_order(df_bat_grouped)),
+        "Bowling": df_bowl_temp.reindex(columns=get_sheet_order(df_bowl_temp)),
+        "Fielding": df_field_temp.reindex(columns=get_sheet_order(df_field_temp)),
+        "Combined": df_final
+    }
+
+    # Typed Parquet tables (BBI and MD are stored as strings)
+    n_rows = sum(len(df) for df in outputs.values())
+    if parquet_enabled():
+        with trace_span('save_parquet', n_rows):
+            write_tables(outputs, path.join(parquet_dir, 'All_Players_Records'))
+
+    if not excel_enabled():
+        print(f"\n✅ All records successfully combined & saved as Parquet in {parquet_dir}")
+        finish_run(base_path)
+        return outputs
+
+    # One streaming pass; BBI and MD are written as text (see COLUMN_FORMATS in excel_output.py)
+    with trace_span('save', n_rows):
+        write_excel(outputs, output_excel)
     print(f"\n✅ All records successfully combined & saved as {output_excel}")
+    finish_run(base_path)
+    return outputs
+
 
-combine_all_records()
\ No newline at end of file
+if __name__ == "__main__":
+    combine_all_records()
@@ -0,0 +1,139 @@
+from glob import glob
+from os import makedirs, path
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # Parquet output is optional; the Excel deliverables do not need pyarrow
+    pa = pq = None
+
+# --- CONFIGURATION ---
+# Output backends written by clean_excel.py and overall_records.py. Drop 'excel' to skip the
+# .xlsx deliverables entirely; drop 'parquet' to keep the old Excel-only behaviour.
+OUTPUT_FORMATS = ('excel', 'parquet')
+PARQUET_COMPRESSION = 'zstd'
+
+# Low-cardinality columns stored dictionary-encoded (read back as pandas categoricals)
+DICTIONARY_COLUMNS = ['Player', 'Full_Name', 'Season']
+
+# Columns that stay text even where every value looks numeric (e.g. HS '64' next to '64*')
+TEXT_COLUMNS = ['Player', 'Full_Name', 'HS', 'Not_out_status', 'BBI', 'MD', 'Span_Years']
+# -------------------------------------
+
+_WARNED_MISSING_PYARROW = False
+
+
+def parquet_enabled(formats=None):
+    """True when Parquet output is requested and pyarrow is installed (warns once otherwise)."""
+    global _WARNED_MISSING_PYARROW
+    if 'parquet' not in (OUTPUT_FORMATS if formats is None else formats):
+        return False
+    if pq is None:
+        if not _WARNED_MISSING_PYARROW:
+            print("⚠️ Warning: pyarrow is not installed; skipping Parquet output (pip install pyarrow).")
+            _WARNED_MISSING_PYARROW = True
+        return False
+    return True
+
+
+def excel_enabled(formats=None):
+    return 'excel' in (OUTPUT_FORMATS if formats is None else formats)
+
+
+def columns_to_frame(headers, columns):
+    """
+    Builds the DataFrame pd.read_excel would return for a cleaned (headers, columns) sheet.
+    The rows go through the same TextParser read_excel uses, so text cells that hold numbers
+    ('002', '38.27') become int/float columns whichever source the sheet came from.
+    """
+    # Blank cells are '' as read_excel's openpyxl reader gives them. Formula strings (HS_Numeric/
+    # Not_out_status in workbooks cleaned before those columns held values) are never evaluated,
+    # so they read as blank too.
+    rows = [['' if v is None or (isinstance(v, str) and v.startswith('=')) else v for v in row]
+            for row in zip(*columns)]
+    while rows and all(v == '' for v in rows[-1]): # Trailing empty rows are not read
+        rows.pop()
+    if not rows:
+        return pd.DataFrame(columns=[str(h) for h in headers])
+    return TextParser([[str(h) for h in headers]] + rows, header=0, skip_blank_lines=False).read()
+
+
+def typed_frame(df):
+    """
+    Gives every column a single Parquet type: text columns as strings, columns whose values
+    all parse as numbers as numeric, and Player/Full_Name/Season as dictionary-encoded categoricals.
+    """
+    typed = {}
+    for col in df.columns:
+        values = df[col]
+        if col == 'Player_ID':
+            values = pd.to_numeric(values, errors='coerce').astype('Int32')
+        elif col in TEXT_COLUMNS:
+            if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+                values = values.astype('Int64') # A numeric HS of 64 stays the text '64', not '64.0'
+            values = values.astype(str).mask(values.isna()).astype('string')
+        elif values.dtype == object or pd.api.types.is_string_dtype(values):
+            numeric = pd.to_numeric(values, errors='coerce')
+            # Only convert when no non-blank value is lost
+            if (numeric.notna() | values.isna()).all():
+                values = numeric
+            else:
+                values = values.astype(str).mask(values.isna()).astype('string')
+        if col in DICTIONARY_COLUMNS:
+            values = values.astype('category')
+        typed[col] = values
+    return pd.DataFrame(typed, index=df.index)
+
+
+def write_parquet(df, file_path, compression=None, typed=True):
+    """Writes one table as a typed, compressed Parquet file (typed=False keeps the frame's own dtypes)."""
+    table = pa.Table.from_pandas(typed_frame(df) if typed else df, preserve_index=False)
+    makedirs(path.dirname(file_path) or '.', exist_ok=True)
+    pq.write_table(table, file_path, compression=compression or PARQUET_COMPRESSION,
+                   use_dictionary=[c for c in DICTIONARY_COLUMNS if c in table.column_names])
+    return file_path
+
+
+def cleaned_parquet_dir(parquet_dir, record_type):
+    """Directory holding one Parquet file per cleaned season sheet of a record type."""
+    return path.join(parquet_dir, f"{record_type.lower()}_cleaned")
+
+
+def write_cleaned_seasons(record_type, sheets, parquet_dir):
+    """Writes {sheet_name: DataFrame} as <parquet_dir>/<record>_cleaned/<sheet_name>.parquet."""
+    out_dir = cleaned_parquet_dir(parquet_dir, record_type)
+    for sheet_name, df in sheets.items():
+        write_parquet(df, path.join(out_dir, f"{sheet_name}.parquet"))
+    print(f"    - {record_type}: {len(sheets)} season table(s) written as Parquet to {out_dir}")
+    return out_dir
+
+
+def write_tables(tables, out_dir, typed=True):
+    """Writes {table_name: DataFrame} as <out_dir>/<table_name>.parquet."""
+    for table_name, df in tables.items():
+        write_parquet(df, path.join(out_dir, f"{table_name}.parquet"), typed=typed)
+    print(f"    - {len(tables)} table(s) written as Parquet to {out_dir}")
+    return out_dir
+
+
+def _plain_frame(df):
+    """Turns categoricals back into plain columns so frames behave like read_excel output."""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(df[col].cat.categories.dtype)
+        elif df[col].isna().all():
+            df[col] = df[col].astype(float) # read_excel gives an all-blank column as float NaN
+    return df
+
+
+def load_cleaned_parquet(parquet_dir, record_types=('Batting', 'Bowling', 'Fielding')):
+    """Reads the cleaned season tables back as {record_type: {sheet_name: DataFrame}}."""
+    records = {}
+    for record_type in record_types:
+        files = sorted(glob(path.join(cleaned_parquet_dir(parquet_dir, record_type), '*.parquet')))
+        records[record_type] = {path.splitext(path.basename(f))[0]: _plain_frame(pd.read_parquet(f))
+                                for f in files}
+    return records
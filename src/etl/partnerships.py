@@ -0,0 +1,210 @@
+from os import path
+
+import numpy as np
+import pandas as pd
+
+from career_metrics import compute_ratios
+from clean_excel import INPUT_DIR, OUTPUT_DIR, PARQUET_DIR, read_player_registry
+from excel_output import write_excel
+from parquet_output import excel_enabled, parquet_enabled, write_tables
+
+# --- CONFIGURATION ---
+PARTNERSHIP_CSV = path.join(INPUT_DIR, 'partnership_allpages.csv')
+PARTNERSHIP_OUTPUT = path.join(OUTPUT_DIR, 'partnership_records_cleaned.xlsx')
+
+# Columns of one normalized partnership (edge); Player_ID_1 < Player_ID_2 in every row
+EDGE_COLUMNS = ['Player_ID_1', 'Player_1', 'Full_Name_1', 'Player_ID_2', 'Player_2', 'Full_Name_2',
+                'First_Season', 'Last_Season', 'Inns', 'NO', 'Runs', 'High', 'High_Not_out', 'Ave',
+                'Fifties', 'Hundreds']
+# -------------------------------------
+
+
+def _to_int(values):
+    return pd.to_numeric(values, errors='coerce').fillna(0).astype(int)
+
+
+def load_partnerships(csv_path=PARTNERSHIP_CSV, registry_path=None):
+    """
+    Reads the scraped partnership table and normalizes it into one row per player pair:
+    names trimmed, both players linked to their Player_ID and full name in the existing
+    player registry, the pair ordered by Player_ID, and the span, high score and average
+    parsed into typed columns. The registry is only read: a partnership with a player it
+    does not know is left out (with a warning) until clean_excel has registered them.
+    """
+    raw = pd.read_csv(csv_path, dtype=str)
+    names_1 = raw['Player_1'].str.strip()
+    names_2 = raw['Player_2'].str.strip()
+
+    registry = read_player_registry(registry_path)
+    unknown = sorted(set(pd.concat([names_1, names_2]).dropna()) - set(registry))
+    if unknown:
+        print(f"⚠️ Warning: {len(unknown)} partnership player(s) not in the player registry, "
+              f"their partnerships are skipped: {', '.join(unknown[:10])}{', ...' if len(unknown) > 10 else ''}")
+    known = names_1.isin(registry) & names_2.isin(registry)
+    raw, names_1, names_2 = raw[known], names_1[known], names_2[known]
+    ids = {name: registry[name][0] for name in pd.unique(pd.concat([names_1, names_2]))}
+
+    id_1, id_2 = names_1.map(ids), names_2.map(ids)
+    swap = id_1 > id_2
+    span = raw['Span'].str.extract(r'(\d{4})\s*-\s*(\d{4})')
+    high = raw['High'].str.strip()
+    rows = pd.DataFrame({
+        'Player_ID_1': id_1.where(~swap, id_2),
+        'Player_ID_2': id_2.where(~swap, id_1),
+        'First_Season': _to_int(span[0]),
+        'Last_Season': _to_int(span[1]),
+        'Inns': _to_int(raw['Inns']),
+        'NO': _to_int(raw['NO']),
+        'Runs': _to_int(raw['Runs']),
+        'High': _to_int(high.str.rstrip('*')),
+        'High_Not_out': high.str.endswith('*').fillna(False),
+        'Fifties': _to_int(raw['Fifties']),
+        'Hundreds': _to_int(raw['Hundreds'])
+    })
+
+    # A pair scraped twice (e.g. as 'A, B' and 'B, A') is merged into one partnership
+    edges = (rows.sort_values(['High', 'High_Not_out'], ascending=False, kind='mergesort')
+                 .groupby(['Player_ID_1', 'Player_ID_2'], as_index=False)
+                 .agg({'First_Season': 'min', 'Last_Season': 'max', 'Inns': 'sum', 'NO': 'sum', 'Runs': 'sum',
+                       'High': 'first', 'High_Not_out': 'first', 'Fifties': 'sum', 'Hundreds': 'sum'}))
+    edges['Ave'] = compute_ratios(pd.DataFrame({'Runs': edges['Runs'], 'Dismissals': edges['Inns'] - edges['NO']}),
+                                  ['Ave'])['Ave']
+
+    names = {player_id: name for name, player_id in ids.items()}
+    full_names = {player_id: full_name for player_id, full_name in registry.values()}
+    for side in ['1', '2']:
+        edges[f'Player_{side}'] = edges[f'Player_ID_{side}'].map(names)
+        edges[f'Full_Name_{side}'] = edges[f'Player_ID_{side}'].map(full_names)
+    return edges[EDGE_COLUMNS]
+
+
+class PartnershipGraph:
+    """
+    Adjacency-indexed partnership graph. Every player's edges are stored twice in CSR form:
+    sorted by runs (top partners are a prefix slice) and sorted by partner ID (a pair is a
+    binary search). Triangles of players who have all batted with each other are found once
+    at build time and kept sorted by combined runs.
+    """
+
+    def __init__(self, edges):
+        self.edges = edges.reset_index(drop=True)
+        id_1 = self.edges['Player_ID_1'].to_numpy()
+        id_2 = self.edges['Player_ID_2'].to_numpy()
+        runs = self.edges['Runs'].to_numpy()
+
+        # Each edge from both ends: (player, partner, edge row)
+        player = np.concatenate([id_1, id_2])
+        partner = np.concatenate([id_2, id_1])
+        edge_row = np.concatenate([np.arange(len(id_1))] * 2)
+        n_nodes = int(player.max()) + 2 if len(player) else 1
+
+        by_runs = np.lexsort((partner, -runs[edge_row], player))
+        self.runs_partner = partner[by_runs]
+        self.runs_edge = edge_row[by_runs]
+        by_partner = np.lexsort((partner, player))
+        self.sorted_partner = partner[by_partner]
+        self.sorted_edge = edge_row[by_partner]
+        self.offsets = np.searchsorted(player[by_partner], np.arange(n_nodes))
+
+        self.names = dict(zip(id_1, self.edges['Player_1'])) | dict(zip(id_2, self.edges['Player_2']))
+        self._ids_by_name = {}
+        for side in ['1', '2']:
+            for pid, short, full in self.edges[[f'Player_ID_{side}', f'Player_{side}', f'Full_Name_{side}']].itertuples(index=False):
+                self._ids_by_name.setdefault(short, int(pid))
+                self._ids_by_name.setdefault(full, int(pid))
+
+        self.triangles = self._find_triangles()
+
+    def player_id(self, player):
+        """Player_ID for an ID, short name or full name; KeyError if the player has no partnerships."""
+        if isinstance(player, (int, np.integer)):
+            return int(player)
+        return self._ids_by_name[player]
+
+    def _node_range(self, player_id):
+        if player_id < 0 or player_id + 1 >= len(self.offsets):
+            return 0, 0
+        return int(self.offsets[player_id]), int(self.offsets[player_id + 1])
+
+    def _edge(self, id_1, id_2):
+        """Edge row of a pair, or -1: binary search in id_1's partner-sorted edge list."""
+        start, end = self._node_range(id_1)
+        i = start + int(np.searchsorted(self.sorted_partner[start:end], id_2))
+        return int(self.sorted_edge[i]) if i < end and self.sorted_partner[i] == id_2 else -1
+
+    def top_partners(self, player, n=5):
+        """A player's n most productive partners by runs added together."""
+        player_id = self.player_id(player)
+        start, end = self._node_range(player_id)
+        rows = self.edges.iloc[self.runs_edge[start:min(end, start + n)]].copy()
+        rows.insert(0, 'Partner', self.runs_partner[start:min(end, start + n)])
+        rows['Partner'] = rows['Partner'].map(self.names)
+        return rows.reset_index(drop=True)
+
+    def pair(self, player_1, player_2):
+        """All partnership records between two players (empty if they never batted together)."""
+        id_1, id_2 = sorted([self.player_id(player_1), self.player_id(player_2)])
+        edge = self._edge(id_1, id_2)
+        return self.edges.iloc[[edge] if edge >= 0 else []].reset_index(drop=True)
+
+    def _find_triangles(self):
+        """
+        Every triangle u < v < w, scoring each by the runs of its three partnerships. For each
+        edge u < v the third players are the intersection of the partner-sorted neighbour
+        slices of u and v above v, so memory follows the edges, not the largest Player_ID.
+        """
+        triangles = []
+        for u in np.unique(self.edges['Player_ID_1'].to_numpy().astype(np.int64)):
+            start, end = self._node_range(int(u))
+            higher_u = self.sorted_partner[start:end][self.sorted_partner[start:end] > u]
+            for i, v in enumerate(higher_u[:-1]):
+                v_start, v_end = self._node_range(int(v))
+                common = np.intersect1d(higher_u[i + 1:], self.sorted_partner[v_start:v_end], assume_unique=True)
+                triangles.extend((int(u), int(v), int(w)) for w in common)
+        found = pd.DataFrame(triangles, columns=['Player_ID_1', 'Player_ID_2', 'Player_ID_3'], dtype=np.int64)
+
+        # Pair runs by binary search over the edges keyed (Player_ID_1, Player_ID_2)
+        id_1 = self.edges['Player_ID_1'].to_numpy().astype(np.int64)
+        id_2 = self.edges['Player_ID_2'].to_numpy().astype(np.int64)
+        width = int(id_2.max()) + 1 if len(id_2) else 1
+        keys = id_1 * width + id_2
+        order = np.argsort(keys, kind='stable')
+        runs = self.edges['Runs'].to_numpy().astype(np.int64)[order]
+        pair_runs = lambda a, b: runs[np.searchsorted(keys[order], found[a].to_numpy() * width + found[b].to_numpy())]
+        found['Runs'] = (pair_runs('Player_ID_1', 'Player_ID_2') + pair_runs('Player_ID_1', 'Player_ID_3')
+                         + pair_runs('Player_ID_2', 'Player_ID_3'))
+        return found.sort_values(['Runs', 'Player_ID_1', 'Player_ID_2', 'Player_ID_3'],
+                                 ascending=[False, True, True, True], kind='mergesort').reset_index(drop=True)
+
+    def cliques(self, n=10, player=None):
+        """The n most productive triangles (three players who all partnered each other), optionally containing a player."""
+        triangles = self.triangles
+        if player is not None:
+            player_id = self.player_id(player)
+            triangles = triangles[(triangles[['Player_ID_1', 'Player_ID_2', 'Player_ID_3']] == player_id).any(axis=1)]
+        top = triangles.head(n).copy()
+        for i in ['1', '2', '3']:
+            top[f'Player_{i}'] = top[f'Player_ID_{i}'].map(self.names)
+        return top[['Player_1', 'Player_2', 'Player_3', 'Runs']].reset_index(drop=True)
+
+
+def run_partnerships(csv_path=PARTNERSHIP_CSV, output_path=PARTNERSHIP_OUTPUT):
+    """Normalizes the partnership table, saves it and returns the graph built over it."""
+    print(f"--- Building partnership graph from {path.basename(csv_path)} ---")
+    edges = load_partnerships(csv_path)
+    if excel_enabled():
+        write_excel({'Partnerships': edges}, output_path)
+    if parquet_enabled():
+        write_tables({'Partnerships': edges}, PARQUET_DIR)
+
+    graph = PartnershipGraph(edges)
+    print(f"✅ {len(edges)} partnerships between {len(graph.names)} players, {len(graph.triangles)} triangles.")
+    return graph
+
+
+if __name__ == "__main__":
+    graph = run_partnerships()
+    print("\nTop partners of MS Dhoni:")
+    print(graph.top_partners('MS Dhoni', 5)[['Partner', 'Inns', 'Runs', 'High', 'Ave']].to_string(index=False))
+    print("\nMost productive trios:")
+    print(graph.cliques(5).to_string(index=False))
@@ -0,0 +1,58 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+
+def player_keys(key_columns):
+    """
+    Maps every player in several key columns to one dense integer key, in sorted name order.
+    The concatenated names are factorized once, so this is the only step that hashes strings.
+    Returns (int codes per column, -1 where the key is missing; the names by key).
+    """
+    lengths = [len(keys) for keys in key_columns]
+    all_keys = pd.concat([pd.Series(keys).reset_index(drop=True) for keys in key_columns], ignore_index=True)
+    all_codes, names = pd.factorize(all_keys, sort=True)
+    return np.split(all_codes, np.cumsum(lengths)[:-1]), names
+
+
+def multiway_join(tables, on='Player', suffixes=None, attach=()):
+    """
+    Outer-joins any number of tables (one row per player each) on the player key in a single
+    pass: players get integer keys, every column is gathered once into key order, and the
+    result has one row per player of `tables`, sorted by name, like chained outer merges.
+    Tables in `attach` only add columns to those rows (a left join). Column names found in
+    more than one table get that table's suffix; rows without a key are dropped.
+    """
+    frames = list(tables) + list(attach)
+    codes, names = player_keys([df[on] for df in frames])
+
+    # Keys of the joined tables define the rows; attached tables do not add players
+    present = np.zeros(len(names), dtype=bool)
+    for table_codes in codes[:len(tables)]:
+        present[table_codes[table_codes >= 0]] = True
+    row_of_key = np.cumsum(present) - 1
+    n_rows = int(present.sum())
+
+    counts = Counter(col for df in frames for col in df.columns if col != on)
+    shared = sorted(col for col, n in counts.items() if n > 1)
+    if shared and suffixes is None:
+        raise ValueError(f"Columns {shared} appear in more than one table; pass suffixes to tell them apart.")
+
+    columns = {on: names[present]}
+    for i, (df, table_codes) in enumerate(zip(frames, codes)):
+        keep = table_codes >= 0
+        keep[keep] = present[table_codes[keep]]
+        rows = row_of_key[table_codes[keep]]
+        if len(rows) and np.bincount(rows, minlength=n_rows).max() > 1:
+            duplicated = df.loc[keep, on][pd.Series(rows).duplicated().to_numpy()].unique()[:5]
+            raise ValueError(f"Table {i} has more than one row for {list(duplicated)}; aggregate it per {on} first.")
+
+        # indexer[row] = position of that player's row in this table, -1 (filled with NaN) if absent
+        indexer = np.full(n_rows, -1, dtype=np.intp)
+        indexer[rows] = np.flatnonzero(keep)
+        for col in df.columns:
+            if col != on:
+                name = f"{col}{suffixes[i]}" if counts[col] > 1 else col
+                columns[name] = pd.api.extensions.take(df[col].array, indexer, allow_fill=True)
+    return pd.DataFrame(columns, copy=False) # The gathered columns are new arrays; no consolidation copy
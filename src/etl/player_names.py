@@ -0,0 +1,183 @@
+import csv
+import re
+import unicodedata
+from collections import defaultdict
+from os import path
+
+import numpy as np
+import pandas as pd
+
+# --- CONFIGURATION ---
+# Names no index resolves are listed here with their closest trigram (fuzzy) candidate; a
+# fuzzy candidate is only ever reported, never used as the player's name or ID
+UNRESOLVED_REPORT_FILE = 'unresolved_player_names.csv'
+# -------------------------------------
+
+
+def normalize_name(name):
+    """Matching key for a name: accents, quotes and punctuation removed, lower case, single spaces."""
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    text = re.sub(r"[^a-z0-9 ]", ' ', text.lower().replace("'", ''))
+    return ' '.join(text.split())
+
+
+def _short_signature(name):
+    """(initials, surname) of an initials-style scorecard name ('M.E.K. Hussey' -> ('mek', 'hussey')), else None."""
+    tokens = str(name).strip().split()
+    initials = tokens[0].replace('.', '') if tokens else ''
+    if len(tokens) < 2 or not initials.isupper() or not initials.isalpha() or len(initials) > 5:
+        return None
+    return initials.lower(), normalize_name(' '.join(tokens[1:]))
+
+
+def _full_signatures(full_name):
+    """Every (initials, surname) a full name can be written as, one per split of given names and surname."""
+    tokens = normalize_name(full_name).split()
+    return {(''.join(t[0] for t in tokens[:i]), ' '.join(tokens[i:])) for i in range(1, len(tokens))}
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameResolver:
+    """
+    Resolves scorecard names to canonical players from a {short name: full name} directory.
+    Lookups go through these indexes, in order:
+      1. normalized key of every directory short name and full name (exact match);
+      2. (initials, surname) of players whose short name is initials-style, where every
+         initial agrees, in order, with the full name ('M.E.K. Hussey' -> Michael Edward
+         Killeen Hussey, but not 'MJ Hussey' or 'M Hussey'), or (first name, surname) for
+         names written out in full ('Michael Hussey'), accepted only when unique.
+    Names that neither resolves are kept as they are and listed by unresolved_report(), with
+    the closest candidate from a trigram inverted index (Dice similarity) for review.
+    """
+
+    def __init__(self, directory):
+        # One canonical player per distinct full name; the first short name is the canonical one
+        self.short_names, self.full_names = [], []
+        player_by_full = {}
+        self._exact = {}
+        for short_name, full_name in directory.items():
+            full_key = normalize_name(full_name)
+            player = player_by_full.get(full_key)
+            if player is None:
+                player = player_by_full[full_key] = len(self.full_names)
+                self.short_names.append(short_name)
+                self.full_names.append(full_name)
+            self._exact.setdefault(normalize_name(short_name), player)
+        for player, full_name in enumerate(self.full_names):
+            self._exact.setdefault(normalize_name(full_name), player)
+
+        # Only players listed by initials get initials signatures: the scorecard writes a
+        # player listed as 'Simarjeet Singh' in full, so 'S Singh' is someone else
+        self._initials = defaultdict(set)
+        self._first_last = defaultdict(set) # ('michael', 'hussey') for names written without middle names
+        for player, (short_name, full_name) in enumerate(zip(self.short_names, self.full_names)):
+            short_signature = _short_signature(short_name)
+            if short_signature:
+                self._initials[short_signature].add(player)
+                for initials, surname in _full_signatures(full_name):
+                    if initials == short_signature[0]:
+                        self._initials[(initials, surname)].add(player)
+            tokens = normalize_name(full_name).split()
+            if len(tokens) > 1:
+                self._first_last[(tokens[0], tokens[-1])].add(player)
+
+        # Trigram -> keys containing it; every key points back to its player
+        self._keys = list(self._exact)
+        self._key_player = np.array([self._exact[k] for k in self._keys], dtype=np.int32)
+        self._key_sizes = np.array([len(_trigrams(k)) for k in self._keys], dtype=np.int32)
+        postings = defaultdict(list)
+        for i, key in enumerate(self._keys):
+            for gram in _trigrams(key):
+                postings[gram].append(i)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+        self._cache = {}
+        self.unresolved = {}
+
+    def _fuzzy(self, key):
+        """(closest player, Dice score) from the trigram index, or (None, 0)."""
+        grams = _trigrams(key)
+        hits = [self._postings[g] for g in grams if g in self._postings]
+        if not hits:
+            return None, 0.0
+        shared = np.bincount(np.concatenate(hits), minlength=len(self._keys))
+        dice = 2 * shared / (len(grams) + self._key_sizes)
+        best_key = int(dice.argmax())
+        return int(self._key_player[best_key]), float(dice[best_key])
+
+    def match(self, name):
+        """
+        (player index or None, method, score) for one name; methods: exact, initials, first_last,
+        or unresolved, where the player is only the closest fuzzy candidate (None if none).
+        """
+        key = normalize_name(name)
+        if key in self._exact:
+            return self._exact[key], 'exact', 1.0
+
+        signature = _short_signature(name)
+        tokens = key.split()
+        if signature:
+            players, method = self._initials.get(signature), 'initials'
+        else:
+            players, method = (self._first_last.get((tokens[0], tokens[-1])) if len(tokens) > 1 else None), 'first_last'
+        if players and len(players) == 1:
+            return next(iter(players)), method, 1.0
+
+        player, score = self._fuzzy(key)
+        return player, 'unresolved', round(score, 3)
+
+    def _resolve_one(self, name):
+        """Cached (Player, Full_Name, Method, Score) of one name; unresolved names map to themselves."""
+        resolved = self._cache.get(name)
+        if resolved is None:
+            trimmed = str(name).strip()
+            player, method, score = self.match(trimmed)
+            if method == 'unresolved':
+                candidate = self.full_names[player] if player is not None else None
+                self.unresolved[trimmed] = {'Name': trimmed, 'Best_Candidate': candidate, 'Score': score}
+                resolved = (trimmed, trimmed, method, score)
+            else:
+                resolved = (self.short_names[player], self.full_names[player], method, score)
+            self._cache[name] = resolved
+        return resolved
+
+    def resolve(self, names):
+        """
+        Resolves a batch of names, matching each distinct name once. Returns a DataFrame with
+        Name, Player (canonical short name), Full_Name, Method and Score; unresolved names keep
+        their own (trimmed) name and are recorded for unresolved_report().
+        """
+        names = pd.Series(names, dtype=object)
+        codes, distinct = pd.factorize(names)
+        table = pd.DataFrame([self._resolve_one(name) for name in distinct] + [(None, None, None, None)],
+                             columns=['Player', 'Full_Name', 'Method', 'Score'])
+        resolved = table.iloc[codes].set_axis(names.index) # code -1 (missing name) picks the empty last row
+        resolved.insert(0, 'Name', names)
+        return resolved
+
+    def full_name(self, name):
+        """Canonical full name of one scorecard name (the name itself if unresolved)."""
+        return self._resolve_one(name)[1]
+
+    def canonical_player(self, names):
+        """Canonical short name for each name, e.g. to join tables whose spellings differ."""
+        return self.resolve(names)['Player']
+
+    def unresolved_report(self):
+        """Names seen so far that could not be resolved, with the closest candidate and its score."""
+        return pd.DataFrame(sorted(self.unresolved.values(), key=lambda r: r['Name']),
+                            columns=['Name', 'Best_Candidate', 'Score'])
+
+    def write_unresolved_report(self, output_dir):
+        """Writes the unresolved-names report to output_dir (nothing if every name resolved)."""
+        report = self.unresolved_report()
+        if report.empty:
+            return None
+        report_path = path.join(output_dir, UNRESOLVED_REPORT_FILE)
+        report.to_csv(report_path, index=False, quoting=csv.QUOTE_MINIMAL)
+        print(f"⚠️ Warning: {len(report)} player name(s) could not be resolved to a full name; see {report_path}")
+        return report_path
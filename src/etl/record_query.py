@@ -0,0 +1,202 @@
+import operator
+import re
+from glob import glob
+from os import path
+
+import openpyxl
+import pandas as pd
+
+from clean_excel import OUTPUT_DIR, RAW_FILE_NAME, TEAM
+from parquet_output import _plain_frame, cleaned_parquet_dir
+
+try:
+    import pyarrow.parquet as pq
+except ImportError: # Without pyarrow only the cleaned workbooks can be scanned
+    pq = None
+
+# --- CONFIGURATION ---
+# Filter operators; the ordering ones compare numerically ('-' and other text count as missing)
+OPERATORS = {
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    'in': lambda values, allowed: values.isin(list(allowed)),
+    'between': lambda values, bounds: values.between(*bounds)
+}
+NUMERIC_OPERATORS = ['<', '<=', '>', '>=', 'between']
+# -------------------------------------
+
+
+def _clean_name(name):
+    """Column name as combine_all_records sees it ('Ct Wk' -> 'Ct_Wk')."""
+    return str(name).strip().replace(' ', '_')
+
+
+def _partition_season(name):
+    match = re.search(r'\d{4}', name)
+    return int(match.group(0)) if match else 0
+
+
+def season_partitions(record_type, base_path=None, source=None, team=TEAM):
+    """
+    Lists the season partitions of one record type without decoding any of them, as
+    [(season, source, file_path, sheet_name)]: the per-season Parquet files when they exist
+    (or source='parquet'), otherwise the sheets of the cleaned workbook (source='excel').
+    """
+    base_path = base_path or OUTPUT_DIR
+    files = sorted(glob(path.join(cleaned_parquet_dir(path.join(base_path, 'parquet'), record_type), '*.parquet')))
+    if source == 'parquet' or (source is None and files and pq is not None):
+        return [(_partition_season(path.basename(f)), 'parquet', f, path.splitext(path.basename(f))[0]) for f in files]
+
+    workbook = path.join(base_path, RAW_FILE_NAME.format(record=record_type.lower(), team=team)
+                         .replace('.xlsx', '_cleaned.xlsx'))
+    wb = openpyxl.load_workbook(workbook, read_only=True) # Reads the sheet list only
+    sheets = wb.sheetnames
+    wb.close()
+    return [(_partition_season(sheet), 'excel', workbook, sheet) for sheet in sheets]
+
+
+def _partition_columns(source, file_path, sheet_name):
+    """Raw column names of one partition, from the Parquet schema or the sheet's header row."""
+    if source == 'parquet':
+        return pq.read_schema(file_path).names
+    wb = openpyxl.load_workbook(file_path, read_only=True)
+    header = next(wb[sheet_name].iter_rows(max_row=1, values_only=True), ())
+    wb.close()
+    return [h for h in header if h is not None]
+
+
+def _read_partitions(partitions, columns):
+    """
+    Decodes the given partitions, reading only `columns` (cleaned names; None = all), as
+    [(sheet_name, DataFrame)] with cleaned column names, in partition order.
+    """
+    frames = []
+    excel_files = {}
+    for season, source, file_path, sheet_name in partitions:
+        if source == 'parquet':
+            raw = None
+            if columns is not None:
+                raw = [c for c in _partition_columns(source, file_path, sheet_name) if _clean_name(c) in columns]
+            df = _plain_frame(pd.read_parquet(file_path, columns=raw))
+        else:
+            if file_path not in excel_files:
+                excel_files[file_path] = pd.ExcelFile(file_path)
+            usecols = None if columns is None else (lambda c: _clean_name(c) in columns)
+            df = excel_files[file_path].parse(sheet_name, usecols=usecols)
+        df.columns = [_clean_name(c) for c in df.columns]
+        frames.append((sheet_name, df))
+    for excel_file in excel_files.values():
+        excel_file.close()
+    return frames
+
+
+class RecordQuery:
+    """
+    A lazy query over the cleaned season tables of one record type. filter(), seasons(),
+    select(), group_by() and agg() only extend the plan; collect() runs it. Filters on Season
+    prune whole partitions (a season's Parquet file or sheet is never opened), and only the
+    columns the plan uses are decoded. Without a Season filter, projection or aggregation the
+    result is exactly what combine_all_records' read_all_sheets() gives.
+    """
+
+    def __init__(self, record_type, partitions, as_text=False, filters=(), columns=None, group_keys=(),
+                 aggregations=None):
+        self.record_type = record_type
+        self.partitions = partitions
+        self.as_text = as_text
+        self.filters = list(filters)
+        self.columns = columns
+        self.group_keys = list(group_keys)
+        self.aggregations = aggregations
+
+    def _with(self, **changes):
+        plan = {'as_text': self.as_text, 'filters': self.filters, 'columns': self.columns,
+                'group_keys': self.group_keys, 'aggregations': self.aggregations, **changes}
+        return RecordQuery(self.record_type, self.partitions, **plan)
+
+    def filter(self, column, op, value):
+        """Keeps rows where `column op value` holds, e.g. filter('Runs', '>=', 300)."""
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator '{op}'; expected one of {list(OPERATORS)}.")
+        return self._with(filters=self.filters + [(column, op, value)])
+
+    def seasons(self, *seasons):
+        """Keeps the given seasons only (pruned before anything is read)."""
+        return self.filter('Season', 'in', seasons)
+
+    def select(self, *columns):
+        """Output columns (the rows before any aggregation)."""
+        return self._with(columns=list(columns))
+
+    def group_by(self, *keys):
+        return self._with(group_keys=list(keys))
+
+    def agg(self, **aggregations):
+        """Named aggregations over the groups, as in DataFrame.agg: agg(Runs=('Runs', 'sum'))."""
+        return self._with(aggregations=aggregations)
+
+    def _needed_columns(self):
+        """Cleaned columns the plan reads, or None when it needs every column."""
+        if self.aggregations is not None:
+            output = self.group_keys + [column for column, _ in self.aggregations.values()]
+        elif self.columns is not None:
+            output = self.columns
+        else:
+            return None
+        return set(output) | {column for column, _, _ in self.filters}
+
+    def _pruned_partitions(self):
+        """Partitions whose season passes every Season filter."""
+        season_filters = [(op, value) for column, op, value in self.filters if column == 'Season']
+        kept = []
+        for partition in self.partitions:
+            season = pd.Series([partition[0]])
+            if all(OPERATORS[op](season, value).iloc[0] for op, value in season_filters):
+                kept.append(partition)
+        return kept
+
+    def explain(self):
+        """The plan as text: partitions read after pruning and columns decoded."""
+        partitions = self._pruned_partitions()
+        columns = self._needed_columns()
+        lines = [f"Scan {self.record_type}: {len(partitions)} of {len(self.partitions)} season partitions "
+                 f"({', '.join(str(p[0]) for p in partitions) or 'none'})",
+                 f"  columns: {'all' if columns is None else ', '.join(sorted(columns))}"]
+        lines += [f"  filter: {column} {op} {value!r}" for column, op, value in self.filters]
+        if self.aggregations is not None:
+            lines.append(f"  aggregate by {self.group_keys or 'all rows'}: {self.aggregations}")
+        elif self.columns is not None:
+            lines.append(f"  select: {self.columns}")
+        return '\n'.join(lines)
+
+    def collect(self):
+        """Runs the plan and returns a DataFrame."""
+        frames = [df for _, df in _read_partitions(self._pruned_partitions(), self._needed_columns())]
+        if self.as_text:
+            frames = [df.astype(str).mask(df.isna()) for df in frames] # As read_excel(dtype=str)
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=list(self._needed_columns() or []))
+
+        mask = pd.Series(True, index=df.index)
+        for column, op, value in self.filters:
+            if column == 'Season':
+                continue # Already applied by partition pruning: every row of a partition has its season
+            values = df[column]
+            if op in NUMERIC_OPERATORS:
+                values = pd.to_numeric(values, errors='coerce')
+            mask &= OPERATORS[op](values, value).fillna(False).astype(bool)
+        if not mask.all():
+            df = df[mask].reset_index(drop=True)
+
+        if self.aggregations is not None:
+            if self.group_keys:
+                return df.groupby(self.group_keys, as_index=False).agg(**self.aggregations)
+            return pd.DataFrame({name: [df[column].agg(func)] for name, (column, func) in self.aggregations.items()})
+        return df[self.columns] if self.columns is not None else df
+
+
+def scan(record_type, base_path=None, source=None, as_text=False, team=TEAM):
+    """
+    Starts a lazy query over the cleaned tables of one record type, e.g.
+    scan('Batting').seasons(2010, 2011).group_by('Player').agg(Runs=('Runs', 'sum')).collect().
+    as_text=True gives every value as text, as combine_all_records reads the bowling sheets.
+    """
+    return RecordQuery(record_type, season_partitions(record_type, base_path, source, team), as_text=as_text)
@@ -0,0 +1,140 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# --- CONFIGURATION ---
+# Each player's seasons are one uint64: bit k is set when the player appears in season
+# first_season + k (the earliest season loaded), so 64 consecutive seasons fit. Gaps such
+# as the 2016-17 suspension stay visible as unset bits.
+MAX_SEASONS = 64
+# -------------------------------------
+
+
+def popcount(bits):
+    """Set bits per element of a uint64 array."""
+    if hasattr(np, 'bitwise_count'): # numpy >= 2.0
+        return np.bitwise_count(bits).astype(np.int64)
+    as_bytes = bits.astype(np.uint64).view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(as_bytes, axis=1).sum(axis=1).astype(np.int64)
+
+
+def _bit_position(single_bits):
+    """Index of the one set bit of each (non-zero) element; -1 for zero."""
+    out = np.full(len(single_bits), -1, dtype=np.int64)
+    nonzero = single_bits != 0
+    out[nonzero] = np.log2(single_bits[nonzero].astype(np.float64)).astype(np.int64) # Exact for powers of two
+    return out
+
+
+def _sheet_season(sheet_name):
+    match = re.search(r'\d{4}', str(sheet_name))
+    return int(match.group(0)) if match else None
+
+
+class SeasonBits:
+    """
+    Season-presence bitsets for every player, built once from the cleaned season tables
+    ({record_type: {sheet_name: DataFrame}}, sheets named by season as in Season_2010).
+    All per-player answers are vectorized over every player at once: Seasons_Played is a
+    popcount, the span is the lowest and highest set bit, a streak is repeated m & (m >> 1),
+    and a cohort ("played in 2010 and 2024") is one AND/OR mask over the whole array.
+    """
+
+    def __init__(self, players, bits, first_season):
+        self.players = pd.Index(players, name='Player')
+        self.bits = np.asarray(bits, dtype=np.uint64)
+        self.first_season = first_season
+
+    @classmethod
+    def from_records(cls, records):
+        """Sets a player's bit for every season sheet they appear in, in any record type."""
+        pairs = []
+        for sheets in records.values():
+            for sheet, df in sheets.items():
+                season = _sheet_season(sheet)
+                if season is not None and 'Player' in df.columns:
+                    names = df['Player'].dropna().unique()
+                    pairs.append(pd.DataFrame({'Player': names, 'Season': np.full(len(names), season)}))
+        if not pairs:
+            return cls([], [], 0)
+
+        pairs = pd.concat(pairs, ignore_index=True)
+        first_season = int(pairs['Season'].min())
+        offsets = pairs['Season'].to_numpy() - first_season
+        if offsets.max() >= MAX_SEASONS:
+            raise ValueError(f"Seasons {first_season}-{pairs['Season'].max()} do not fit in {MAX_SEASONS} bits.")
+
+        codes, players = pd.factorize(pairs['Player'], sort=True)
+        bits = np.zeros(len(players), dtype=np.uint64)
+        np.bitwise_or.at(bits, codes, np.left_shift(np.uint64(1), offsets.astype(np.uint64)))
+        return cls(players, bits, first_season)
+
+    def season_mask(self, seasons):
+        """The bitset of a collection of seasons (seasons outside the loaded range are ignored)."""
+        mask = np.uint64(0)
+        for season in seasons:
+            offset = season - self.first_season
+            if 0 <= offset < MAX_SEASONS:
+                mask |= np.uint64(1) << np.uint64(offset)
+        return mask
+
+    def seasons_played(self):
+        return popcount(self.bits)
+
+    def first_last(self):
+        """(first season, last season) of every player (0 for a player with no seasons)."""
+        lowest = self.bits & (~self.bits + np.uint64(1)) # m & -m
+        highest = self.bits.copy()
+        for shift in [1, 2, 4, 8, 16, 32]: # Smear the top bit down, then keep only it
+            highest |= highest >> np.uint64(shift)
+        highest ^= highest >> np.uint64(1)
+        played = self.bits != 0
+        return (np.where(played, _bit_position(lowest) + self.first_season, 0),
+                np.where(played, _bit_position(highest) + self.first_season, 0))
+
+    def span_years(self):
+        """'2008-2015', or '2010' for a single season, as combine_all_records shows it."""
+        first, last = self.first_last()
+        first, last = pd.Series(first).astype(str), pd.Series(last).astype(str)
+        return first.where(first == last, first + '-' + last).set_axis(self.players)
+
+    def longest_streak(self):
+        """Most consecutive seasons played: the number of m &= m >> 1 steps until m is 0."""
+        streak = np.zeros(len(self.bits), dtype=np.int64)
+        bits = self.bits.copy()
+        while bits.any():
+            streak += bits != 0
+            bits &= bits >> np.uint64(1)
+        return streak
+
+    def comebacks(self):
+        """Returns after one or more missed seasons: runs of consecutive seasons, minus the first."""
+        run_starts = self.bits & ~(self.bits << np.uint64(1))
+        return np.maximum(popcount(run_starts) - 1, 0)
+
+    def summary(self):
+        """One row per player: Span_Years, Seasons_Played, First/Last season, Longest_Streak and Comebacks."""
+        first, last = self.first_last()
+        return pd.DataFrame({
+            'Player': self.players,
+            'Span_Years': self.span_years().to_numpy(),
+            'Seasons_Played': self.seasons_played(),
+            'First_Season': first,
+            'Last_Season': last,
+            'Longest_Streak': self.longest_streak(),
+            'Comebacks': self.comebacks()
+        })
+
+    def cohort(self, all_of=(), any_of=(), none_of=()):
+        """Players who played in every season of all_of, at least one of any_of and none of none_of."""
+        keep = np.ones(len(self.bits), dtype=bool)
+        if all_of:
+            required = self.season_mask(all_of)
+            keep &= (self.bits & required) == required
+            keep &= len(set(all_of)) == popcount(np.array([required], dtype=np.uint64))[0] # A season outside the range
+        if any_of:
+            keep &= (self.bits & self.season_mask(any_of)) != 0
+        if none_of:
+            keep &= (self.bits & self.season_mask(none_of)) == 0
+        return list(self.players[keep])
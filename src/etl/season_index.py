@@ -0,0 +1,133 @@
+import json
+import os
+from os import path
+
+import numpy as np
+import pandas as pd
+
+from career_metrics import CAREER_RATIOS, compute_ratios
+from clean_excel import FILE_PATHS, OUTPUT_DIR
+from fact_store import _player_dimension, _season_facts
+
+# --- CONFIGURATION ---
+# One (player x season) cumulative grid per stat, as .npy files opened with mmap_mode='r'.
+# Row p is Player_ID p; column j holds the player's total over every season before
+# first_season + j, so column 0 is all zeros and a season range is one subtraction.
+SEASON_INDEX_DIR = path.join(OUTPUT_DIR, 'season_index')
+
+# Additive stats kept cumulatively (Balls_bowl is Overs as balls). Runs_bowl, Dis and
+# Inns_field are kept too so every career_metrics ratio can be derived from a range, and
+# Seasons counts the seasons a player appears in.
+PREFIX_COLUMNS = ['Seasons', 'Runs', 'BF', 'Inns', 'NO', 'Fours', 'Sixes', 'Wkts', 'Balls_bowl', 'Runs_bowl',
+                  'Ct', 'St', 'Dis', 'Inns_field']
+# -------------------------------------
+
+
+def build_season_index(records, index_dir=SEASON_INDEX_DIR):
+    """
+    Writes the cumulative season index from cleaned tables ({record_type: {sheet_name: DataFrame}}).
+    Seasons are consecutive years from the first to the last season played, so a missing
+    season (e.g. 2016-17) is a column that adds nothing.
+    """
+    print(f"--- Building cumulative season index in {index_dir} ---")
+    os.makedirs(index_dir, exist_ok=True)
+    facts = _season_facts(records).assign(Seasons=1)
+
+    player_ids = facts['Player_ID'].to_numpy()
+    seasons = facts['Season'].to_numpy().astype(np.int32)
+    first_season = int(seasons.min()) if len(seasons) else 0
+    n_years = int(seasons.max()) - first_season + 1 if len(seasons) else 0
+    n_players = int(player_ids.max()) + 1 if len(player_ids) else 1
+
+    for col in PREFIX_COLUMNS:
+        grid = np.zeros((n_players, n_years + 1), dtype=np.int32)
+        grid[player_ids, seasons - first_season + 1] = facts[col].to_numpy()
+        np.cumsum(grid, axis=1, out=grid)
+        np.save(path.join(index_dir, f"{col}.npy"), grid)
+
+    # Metadata last: a directory without meta.json is an incomplete build
+    meta = {'first_season': first_season, 'n_years': n_years, 'columns': PREFIX_COLUMNS,
+            'players': _player_dimension(records)}
+    with open(path.join(index_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    print(f"✅ Season index written: {n_players - 1} player rows x {n_years} seasons "
+          f"({first_season}-{first_season + n_years - 1}), {len(PREFIX_COLUMNS)} stats.")
+    return index_dir
+
+
+class SeasonIndex:
+    """
+    Read-only view of a season index. The total of any stat over seasons first..last is
+    grid[p, last - first_season + 1] - grid[p, first - first_season]: two lookups, whatever
+    the length of the range. totals() and stats() answer for one player, span_table() for all.
+    """
+
+    def __init__(self, index_dir=SEASON_INDEX_DIR):
+        with open(path.join(index_dir, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.first_season = meta['first_season']
+        self.last_season = meta['first_season'] + meta['n_years'] - 1
+        self.grids = {col: np.load(path.join(index_dir, f"{col}.npy"), mmap_mode='r') for col in meta['columns']}
+
+        self.players = {int(pid): tuple(names) for pid, names in meta['players'].items()}
+        self._ids_by_name = {}
+        for pid, (player, full_name) in self.players.items():
+            self._ids_by_name.setdefault(player, pid)
+            self._ids_by_name.setdefault(full_name, pid)
+
+    def player_id(self, player):
+        """Player_ID for an ID, short name ('MS Dhoni') or full name; KeyError if unknown."""
+        if isinstance(player, (int, np.integer)):
+            return int(player)
+        return self._ids_by_name[player]
+
+    def _bounds(self, first=None, last=None):
+        """Grid columns (lo, hi) of seasons first..last (None = open-ended), clipped to the indexed seasons."""
+        first = self.first_season if first is None else max(first, self.first_season)
+        last = self.last_season if last is None else min(last, self.last_season)
+        if first > last:
+            return 0, 0
+        return first - self.first_season, last - self.first_season + 1
+
+    def totals(self, player, first=None, last=None, columns=None):
+        """{stat: total} for one player over seasons first..last inclusive."""
+        pid = self.player_id(player)
+        lo, hi = self._bounds(first, last)
+        columns = columns or list(self.grids)
+        if pid < 0 or pid >= len(self.grids[columns[0]]):
+            return {col: 0 for col in columns}
+        return {col: int(self.grids[col][pid, hi]) - int(self.grids[col][pid, lo]) for col in columns}
+
+    def stats(self, player, first=None, last=None):
+        """Totals of one player over seasons first..last plus the ratios derived from them."""
+        totals = pd.DataFrame({col: [value] for col, value in self.totals(player, first, last).items()})
+        stats = totals.assign(Dismissals=totals['Inns'] - totals['NO'])
+        return pd.concat([totals, compute_ratios(stats)], axis=1).iloc[0]
+
+    def span_table(self, first=None, last=None, columns=None, ratios=True):
+        """Totals (and ratios) of every player over seasons first..last, one row per player who played in it."""
+        lo, hi = self._bounds(first, last)
+        columns = columns or list(self.grids)
+        totals = pd.DataFrame({col: np.asarray(self.grids[col][:, hi]) - np.asarray(self.grids[col][:, lo])
+                               for col in columns})
+        totals = totals[(totals != 0).any(axis=1)] if 'Seasons' not in columns else totals[totals['Seasons'] > 0]
+        totals.insert(0, 'Player_ID', totals.index.astype(np.int32))
+        totals.insert(1, 'Player', [self.players.get(int(p), ('-', '-'))[0] for p in totals['Player_ID']])
+        if ratios:
+            stats = totals.assign(Dismissals=totals['Inns'] - totals['NO']) if {'Inns', 'NO'} <= set(columns) else totals
+            available = [name for name, (num, denom, _, _) in CAREER_RATIOS.items()
+                         if num in stats.columns and denom in stats.columns]
+            totals = pd.concat([totals, compute_ratios(stats, available)], axis=1)
+        return totals.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    from overall_records import load_cleaned_records
+
+    cleaned_paths = {record_type: path.join(OUTPUT_DIR, path.basename(file_path).replace('.xlsx', '_cleaned.xlsx'))
+                     for record_type, file_path in FILE_PATHS.items()}
+    build_season_index(load_cleaned_records(cleaned_paths))
+    index = SeasonIndex()
+    print("\nMS Dhoni, 2018-2021:")
+    print(index.stats('MS Dhoni', 2018, 2021)[['Seasons', 'Runs', 'BF', 'Ave', 'SR']].to_string())
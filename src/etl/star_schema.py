@@ -0,0 +1,199 @@
+from os import path
+
+import numpy as np
+import pandas as pd
+
+from career_metrics import overs_to_balls, parse_hs
+from clean_excel import FILE_PATHS, OUTPUT_DIR
+from excel_output import write_excel
+from fact_store import _concat_sheets
+from matches import TEAM_RESULTS_CSV, parse_team_results
+from parquet_output import excel_enabled, parquet_enabled, write_tables
+from partnerships import PARTNERSHIP_CSV, load_partnerships
+
+# --- CONFIGURATION ---
+# Pre-shaped tables for the Power BI model: dimensions keyed by small integer surrogate keys
+# and narrow fact tables holding only keys and additive counts (ratios such as Ave, SR and
+# Econ are DAX measures over these sums, as in career_metrics.compute_ratios).
+STAR_SCHEMA_DIR = path.join(OUTPUT_DIR, 'star_schema') # One Parquet file per table
+STAR_SCHEMA_OUTPUT = path.join(OUTPUT_DIR, 'star_schema.xlsx') # One sheet per table
+
+# Fact table -> {fact column: cleaned column}; Player_Key and Season_Key come first in each
+SEASON_FACTS = {
+    'fact_batting_season': ('Batting', {
+        'Mat': 'Mat', 'Inns': 'Inns', 'NO': 'NO', 'Runs': 'Runs', 'BF': 'BF', 'Fours': 'Fours',
+        'Sixes': 'Sixes', 'Ducks': 'Ducks', 'Fifties': 'Fifties', 'Hundreds': 'Hundreds'
+    }),
+    'fact_bowling_season': ('Bowling', {
+        'Mat': 'Mat', 'Inns': 'Inns', 'Mdns': 'Mdns', 'Runs': 'Runs', 'Wkts': 'Wkts',
+        '4_Wkts': '4_Wkts', '5_Wkts': '5_Wkts'
+    }),
+    'fact_fielding_season': ('Fielding', {
+        'Mat': 'Mat_field', 'Inns': 'Inns_field', 'Dis': 'Dis', 'Ct': 'Ct', 'St': 'St',
+        'Ct_Wk': 'Ct_Wk', 'Ct_Fi': 'Ct_Fi'
+    })
+}
+# -------------------------------------
+
+
+def _compact_int(values):
+    """Counts as int16, or int32 when a value does not fit; missing counts become 0."""
+    values = pd.to_numeric(values, errors='coerce').fillna(0)
+    fits = values.abs().max() <= np.iinfo(np.int16).max if len(values) else True
+    return values.astype(np.int16 if fits else np.int32).to_numpy()
+
+
+def _code_dimension(values, key, name):
+    """(dimension table, key of each value) for a text column: keys 1..n in sorted order, 0 where missing."""
+    codes, labels = pd.factorize(values, sort=True)
+    dimension = pd.DataFrame({key: np.arange(1, len(labels) + 1, dtype=np.int16),
+                              name: pd.Series(labels, dtype='string')})
+    return dimension, (codes + 1).astype(np.int16)
+
+
+def build_season_facts(records):
+    """One narrow fact table per record type: Player_Key, Season_Key and that record's counts."""
+    facts = {}
+    for table_name, (record_type, columns) in SEASON_FACTS.items():
+        df = _concat_sheets(records.get(record_type, {}))
+        keys = pd.DataFrame({'Player_Key': pd.to_numeric(df['Player_ID'], errors='coerce'),
+                             'Season_Key': pd.to_numeric(df['Season'], errors='coerce')})
+        rows = keys.notna().all(axis=1).to_numpy()
+        fact = pd.DataFrame({'Player_Key': keys['Player_Key'][rows].astype(np.int32).to_numpy(),
+                             'Season_Key': keys['Season_Key'][rows].astype(np.int16).to_numpy()})
+        df = df[rows]
+        for fact_col, col in columns.items():
+            fact[fact_col] = _compact_int(df[col]) if col in df.columns else np.zeros(len(df), dtype=np.int16)
+
+        if record_type == 'Batting':
+            hs_numeric, not_out_status = parse_hs(df['HS'] if 'HS' in df.columns else [None] * len(df))
+            fact['HS'] = hs_numeric.fillna(-1).astype(np.int16).to_numpy() # -1: no innings
+            fact['HS_Not_out'] = (not_out_status == 'Not Out').to_numpy()
+        elif record_type == 'Bowling':
+            fact.insert(4, 'Balls', overs_to_balls(df['Overs']).astype(np.int16).to_numpy()
+                        if 'Overs' in df.columns else np.zeros(len(df), dtype=np.int16))
+            figures = df['BBI'].astype(str).str.extract(r'^\s*(\d+)\s*/\s*(\d+)\s*$') if 'BBI' in df.columns \
+                else pd.DataFrame({0: [None] * len(df), 1: [None] * len(df)})
+            fact['BBI_Wkts'] = pd.to_numeric(figures[0], errors='coerce').fillna(-1).astype(np.int16).to_numpy()
+            fact['BBI_Runs'] = pd.to_numeric(figures[1], errors='coerce').fillna(-1).astype(np.int16).to_numpy()
+        facts[table_name] = fact.sort_values(['Player_Key', 'Season_Key'], kind='mergesort').reset_index(drop=True)
+    return facts
+
+
+def build_dim_player(records, edges=None):
+    """Player_Key (the registry Player_ID), Player and Full_Name of every player in the facts."""
+    frames = [_concat_sheets(records.get(t, {})).reindex(columns=['Player_ID', 'Player', 'Full_Name'])
+              for t in ['Batting', 'Bowling', 'Fielding']]
+    if edges is not None:
+        for side in ['1', '2']:
+            frames.append(edges[[f'Player_ID_{side}', f'Player_{side}', f'Full_Name_{side}']]
+                          .set_axis(['Player_ID', 'Player', 'Full_Name'], axis=1))
+    names = pd.concat(frames, ignore_index=True)
+    names['Player_ID'] = pd.to_numeric(names['Player_ID'], errors='coerce')
+    names = names.dropna(subset=['Player_ID']).drop_duplicates('Player_ID').sort_values('Player_ID')
+    return pd.DataFrame({'Player_Key': names['Player_ID'].astype(np.int32).to_numpy(),
+                         'Player': names['Player'].astype('string').to_numpy(),
+                         'Full_Name': names['Full_Name'].fillna(names['Player']).astype('string').to_numpy()})
+
+
+def build_match_tables(matches):
+    """(dim_opponent, dim_ground, fact_match) from parse_team_results() output."""
+    dim_opponent, opponent_keys = _code_dimension(matches['Opponent'], 'Opponent_Key', 'Opponent')
+    dim_opponent['Franchise'] = dim_opponent['Opponent'].map(
+        matches.drop_duplicates('Opponent').set_index('Opponent')['Franchise']).astype('string')
+    dim_ground, ground_keys = _code_dimension(matches['Ground'], 'Ground_Key', 'Ground')
+    dim_ground['Home_Away'] = dim_ground['Ground'].map(
+        matches.drop_duplicates('Ground').set_index('Ground')['Home_Away']).astype('category')
+
+    fact_match = pd.DataFrame({
+        'Match_Key': np.arange(1, len(matches) + 1, dtype=np.int32), # Date order
+        'Date': matches['Date'].to_numpy().astype('datetime64[D]'),
+        'Season_Key': matches['Season'].astype('Int16').array,
+        'Opponent_Key': opponent_keys,
+        'Ground_Key': ground_keys,
+        'Outcome': matches['Outcome'].astype('category').array,
+        'Margin_Value': matches['Margin_Value'].astype('Int16').array,
+        'Margin_Unit': matches['Margin_Unit'].astype('category').array,
+        'Balls_Remaining': matches['Balls_Remaining'].astype('Int16').array
+    })
+    return dim_opponent, dim_ground, fact_match
+
+
+def build_fact_partnership(edges):
+    """One row per player pair: both Player_Keys, first/last Season_Key and additive counts."""
+    fact = pd.DataFrame({
+        'Player_Key_1': edges['Player_ID_1'].astype(np.int32).to_numpy(),
+        'Player_Key_2': edges['Player_ID_2'].astype(np.int32).to_numpy(),
+        'First_Season_Key': edges['First_Season'].replace(0, np.nan).astype('Int16').array,
+        'Last_Season_Key': edges['Last_Season'].replace(0, np.nan).astype('Int16').array
+    })
+    for col in ['Inns', 'NO', 'Runs', 'High', 'Fifties', 'Hundreds']:
+        fact[col] = _compact_int(edges[col])
+    fact.insert(fact.columns.get_loc('High') + 1, 'High_Not_out', edges['High_Not_out'].astype(bool).to_numpy())
+    return fact
+
+
+def build_dim_season(*season_keys):
+    """Season_Key (the year) of every season referenced by a fact table."""
+    seasons = pd.concat([pd.Series(keys, dtype='Int16') for keys in season_keys], ignore_index=True)
+    seasons = np.sort(seasons.dropna().unique().astype(np.int16))
+    return pd.DataFrame({'Season_Key': seasons, 'Season': seasons.astype(str)})
+
+
+def build_star_schema(records, matches=None, edges=None):
+    """
+    Builds the dimension and fact tables, as {table_name: DataFrame}, from the cleaned season
+    tables ({record_type: {sheet_name: DataFrame}}), the parsed match results and the
+    normalized partnerships (either may be None). Nothing is read or written here.
+    """
+    tables = build_season_facts(records)
+    season_keys = [fact['Season_Key'] for fact in tables.values()]
+    dims = {'dim_player': build_dim_player(records, edges)}
+
+    if matches is not None:
+        dims['dim_opponent'], dims['dim_ground'], tables['fact_match'] = build_match_tables(matches)
+        season_keys.append(tables['fact_match']['Season_Key'])
+    if edges is not None:
+        tables['fact_partnership'] = build_fact_partnership(edges)
+        season_keys += [tables['fact_partnership']['First_Season_Key'], tables['fact_partnership']['Last_Season_Key']]
+
+    dims['dim_season'] = build_dim_season(*season_keys)
+    order = ['dim_player', 'dim_season', 'dim_opponent', 'dim_ground']
+    return {name: dims[name] for name in order if name in dims} | tables
+
+
+def run_star_schema(records=None, results_csv=TEAM_RESULTS_CSV, partnership_csv=PARTNERSHIP_CSV,
+                    out_dir=STAR_SCHEMA_DIR, output_path=STAR_SCHEMA_OUTPUT, registry_path=None):
+    """
+    Builds the star schema from the cleaned outputs and saves it as Parquet and/or Excel.
+    Only the tables are written: partnership players are looked up in the player registry
+    at registry_path, which is read but never changed.
+    """
+    print("--- Building star schema tables for Power BI ---")
+    if records is None:
+        from overall_records import load_cleaned_records
+
+        records = load_cleaned_records({
+            record_type: path.join(OUTPUT_DIR, path.basename(file_path).replace('.xlsx', '_cleaned.xlsx'))
+            for record_type, file_path in FILE_PATHS.items()})
+    matches = parse_team_results(results_csv) if path.exists(results_csv) else None
+    edges = load_partnerships(partnership_csv, registry_path) if path.exists(partnership_csv) else None
+    for name, csv_path, table in [('match results', results_csv, matches), ('partnerships', partnership_csv, edges)]:
+        if table is None:
+            print(f"⚠️ Warning: {csv_path} not found; no {name} tables built.")
+
+    tables = build_star_schema(records, matches, edges)
+    if parquet_enabled():
+        write_tables(tables, out_dir, typed=False) # Keep the compact dtypes chosen above
+    if excel_enabled():
+        write_excel({name: df.assign(Date=df['Date'].dt.date) if 'Date' in df.columns else df
+                     for name, df in tables.items()}, output_path)
+    for name, df in tables.items():
+        print(f"    - {name}: {len(df):,} rows x {len(df.columns)} columns, "
+              f"{df.memory_usage(deep=True).sum() / 1024:,.1f} KB")
+    print(f"✅ Star schema saved: {len(tables)} tables.")
+    return tables
+
+
+if __name__ == "__main__":
+    run_star_schema()
@@ -1,5 +1,12 @@
+import sys
+from os import path
+
 import pandas as pd
 
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), '..', 'etl'))
+from clean_excel import NAME_RESOLVER
+from player_join import multiway_join
+
 # ---------- STEP 1: LOAD DATA ----------
 # Change file paths to your actual Excel locations
 batting = pd.read_excel("data/raw_temp/batting_records_csk.xlsx")
@@ -7,29 +14,21 @@ bowling = pd.read_excel("data/raw_temp/bowling_records_csk.xlsx")
 fielding = pd.read_excel("data/raw_temp/fielding_records_csk.xlsx")
 
 # ---------- STEP 2: CLEAN PLAYER NAMES ----------
-batting["Player"] = batting["Player"].str.strip().str.title()
-bowling["Player"] = bowling["Player"].str.strip().str.title()
-fielding["Player"] = fielding["Player"].str.strip().str.title()
-
-# ---------- STEP 3: MERGE DATA (SEQUENTIALLY) ----------
-# 1. Merge Batting and Bowling DataFrames
-# Outer join ensures all players are included
-merged_df = pd.merge(
-    batting,
-    bowling,
-    on="Player",
-    how="outer", 
-    suffixes=("_bat", "_bowl") # Differentiates columns from batting and bowling
-)
+# Scorecard spellings are mapped to one canonical short name per player (e.g. "MEK Hussey"),
+# so the same player joins across the three files; names that cannot be resolved are kept
+# as they are and listed in unresolved_player_names.csv
+for df in [batting, bowling, fielding]:
+    df["Player"] = NAME_RESOLVER.canonical_player(df["Player"]).to_numpy()
+NAME_RESOLVER.write_unresolved_report(".")
 
-# 2. Merge the result with the Fielding DataFrame
-merged_df = pd.merge(
-    merged_df,
-    fielding,
+# ---------- STEP 3: JOIN DATA ON AN INTEGER PLAYER KEY ----------
+# Every player name is mapped once to a compact integer key, and the three tables are aligned
+# on it in a single outer join (all players are kept). Columns found in more than one table
+# get a _bat / _bowl / _field suffix.
+merged_df = multiway_join(
+    [batting, bowling, fielding],
     on="Player",
-    how="outer" # Keep outer merge to ensure all players remain
-    # No need for suffixes here unless 'fielding' has same column names as others, 
-    # but Pandas will add '_x' and '_y' if needed.
+    suffixes=("_bat", "_bowl", "_field")
 )
 
 # ---------- STEP 4: SORT & RESET INDEX ----------
@@ -11,9 +11,14 @@ const XLSX = require('xlsx');
 
 // --- CONFIGURATION ---
 const OUTPUT_BASE_DIR = 'F:\\Data Analytics\\Projects\\csk_analysis\\data\\';
-const RAW_DIR = path.join(OUTPUT_BASE_DIR, 'raw_temp'); // Temp directory for individual JSONs
-const FINAL_DIR = path.join(OUTPUT_BASE_DIR, 'raw_temp'); // Final output directory
-const TEAM_ID = 4343; // Chennai Super Kings
+// ESPN Cricinfo team IDs (same codes as TEAMS in src/etl/franchises.py)
+const TEAM_IDS = { csk: 4343, mi: 4346, rcb: 4340, kkr: 4341, dc: 4344, pbks: 4342, rr: 4345, srh: 5143, gt: 6904, lsg: 6903 };
+// Usage: node scrape_players_seasonwise.js [team]. Without a team code CSK is scraped into raw_temp;
+// with one, files go to raw_teams/<team>/, where franchises.py reads them.
+const TEAM = (process.argv[2] || 'csk').toLowerCase();
+const TEAM_ID = TEAM_IDS[TEAM];
+const RAW_DIR = process.argv[2] ? path.join(OUTPUT_BASE_DIR, 'raw_teams', TEAM) : path.join(OUTPUT_BASE_DIR, 'raw_temp'); // Temp directory for individual JSONs
+const FINAL_DIR = RAW_DIR; // Final output directory
 const START_YEAR = 2007;
 const END_YEAR = 2025;
 const RECORD_TYPES = ['batting', 'bowling', 'fielding']; // Now includes all three types
@@ -29,8 +34,6 @@ const delay = (ms) => new Promise(resolve => setTimeout(resolve, ms));
  * with a specific exception for the 2010 season to ensure IPL data is captured.
  */
 function buildSeasonUrl(type, season, use_range) {
-    const TEAM_ID = 4343; // CSK ID, keeping it local for clarity in this function
-
     // --- 🚨 2010 Season EXCEPTION ---
     if (season === 2010) {
         console.log(`\n🚨 Using specific 2010 URL structure for ${type.toUpperCase()}.`);
@@ -190,7 +193,7 @@ async function combineAndSave() {
     }
 
     if (hasData) {
-      const outPath = path.join(FINAL_DIR, `${type}_records_csk.xlsx`);
+      const outPath = path.join(FINAL_DIR, `${type}_records_${TEAM}.xlsx`);
       XLSX.writeFile(wb, outPath);
       console.log(`✅ Final Excel file created: ${outPath}`);
     } else {
@@ -200,7 +203,8 @@ async function combineAndSave() {
 }
 
 async function run() {
-  console.log('--- CSK Season-wise Scraper Started ---');
+  if (!TEAM_ID) throw new Error(`Unknown team code '${TEAM}'; expected one of ${Object.keys(TEAM_IDS).join(', ')}`);
+  console.log(`--- ${TEAM.toUpperCase()} Season-wise Scraper Started ---`);
   // Setup directories
   if (fs.existsSync(RAW_DIR)) fs.rmSync(RAW_DIR, { recursive: true, force: true });
   fs.mkdirSync(RAW_DIR, { recursive: true });
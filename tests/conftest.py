@@ -0,0 +1,21 @@
+import sys
+from os import path
+
+import pytest
+
+# The ETL modules are flat scripts that import each other by name, as when run from src/etl;
+# the benchmarks' synthetic.py writes raw workbooks for tests that run the pipeline
+SRC_DIR = path.join(path.dirname(path.abspath(__file__)), '..', 'src')
+sys.path[:0] = [path.join(SRC_DIR, 'etl'), path.join(SRC_DIR, 'benchmarks')]
+
+import clean_excel
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """An empty in-memory player registry, so IDs are assigned from 001."""
+    monkeypatch.setattr(clean_excel, 'GLOBAL_PLAYER_ID_MAP', {})
+    monkeypatch.setattr(clean_excel, 'PLAYER_ID_BY_FULL_NAME', {})
+    monkeypatch.setattr(clean_excel, '_REGISTRY_PERSISTED', set())
+    monkeypatch.setattr(clean_excel, 'CURRENT_PLAYER_ID_COUNTER', 1)
+    return clean_excel
@@ -0,0 +1,71 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from career_metrics import (balls_to_overs, career_stats, compute_ratios, overs_to_balls, parse_hs, season_stats,
+                            update_career_stats)
+from overall_records import best_hs
+
+
+def _stats(**columns):
+    return pd.DataFrame({k: [v] for k, v in columns.items()})
+
+
+def test_career_ratios_truncate_like_statsguru():
+    # RA Jadeja's CSK career bowling: 4051 runs, 143 wickets, 530.2 overs (3182 balls)
+    bowling = compute_ratios(_stats(Runs_bowl=4051, Wkts=143, Balls_bowl=overs_to_balls(pd.Series([530.2]))[0]),
+                             ['Ave_bowl', 'Econ', 'SR_bowl']).iloc[0]
+    assert (bowling['Ave_bowl'], bowling['Econ'], bowling['SR_bowl']) == (28.32, 7.63, 22.2) # Not 28.33 / 7.64 / 22.3
+
+    # MS Dhoni's batting: 4865 runs, 215 innings, 91 not outs, 3497 balls
+    batting = compute_ratios(_stats(Runs=4865, Dismissals=215 - 91, BF=3497), ['Ave', 'SR']).iloc[0]
+    assert (batting['Ave'], batting['SR']) == (39.23, 139.11)
+
+    # 0.29 * 100 is 28.999...; the epsilon keeps it at 29.0
+    assert compute_ratios(_stats(Runs=29, BF=100), ['SR']).iloc[0]['SR'] == 29.0
+
+
+def test_undefined_ratios_are_nan():
+    # Never dismissed (every innings not out), never took a wicket, never bowled
+    ratios = compute_ratios(_stats(Runs=120, Dismissals=0, BF=90, Runs_bowl=0, Wkts=0, Balls_bowl=0,
+                                   Dis=0, Inns_field=0)).iloc[0]
+    assert ratios['SR'] == 133.33
+    for name in ['Ave', 'Ave_bowl', 'Econ', 'SR_bowl', 'D/I']:
+        assert math.isnan(ratios[name]), name
+
+
+def test_overs_and_balls_round_trip():
+    overs = pd.Series([0.0, 0.5, 1.0, 37.2, 530.2, 3.5])
+    balls = overs_to_balls(overs)
+    assert balls.tolist() == [0, 5, 6, 224, 3182, 23]
+    assert balls_to_overs(balls).tolist() == overs.tolist()
+    # Summing through balls carries a full over: 37.2 + 0.5 is 38.1, not 37.7
+    assert balls_to_overs(pd.Series([overs_to_balls(pd.Series([37.2, 0.5])).sum()])).tolist() == [38.1]
+
+
+def test_update_career_stats_matches_a_full_recount():
+    seasons = pd.DataFrame({'Player': ['A', 'A', 'B'], 'Season': [2010, 2011, 2011],
+                            'Runs': ['300', '150', '90'], 'Inns': ['10', '8', '4'], 'NO': ['2', '3', '0'],
+                            'BF': ['250', '140', '70']})
+    career = career_stats(season_stats(seasons))
+    revised = seasons.assign(Runs=['300', '210', '90']) # 2011 corrected
+    updated = update_career_stats(career, season_stats(revised[revised['Season'] == 2011]),
+                                  season_stats(seasons[seasons['Season'] == 2011]))
+    pd.testing.assert_frame_equal(updated, career_stats(season_stats(revised)), check_dtype=False)
+    assert np.isclose(compute_ratios(updated, ['Ave']).loc['A', 'Ave'], 39.23) # 510 / 13, truncated
+
+
+def test_parse_hs_scores_and_not_out_status():
+    scores, statuses = parse_hs(['84*', '65', '-', '', None, ' 100* ', 'abc'])
+    assert scores.tolist() == [84, 65, pd.NA, pd.NA, pd.NA, 100, pd.NA]
+    assert str(scores.dtype) == 'Int64'
+    assert statuses.tolist() == ['Not Out', 'Out', '-', None, None, 'Not Out', None] # '-' = no innings; blank = unknown
+
+
+def test_best_hs_prefers_the_not_out_on_the_same_score():
+    # MS Dhoni's best CSK innings is 84*; an 84 out in another season does not replace it
+    hs = pd.Series(['70*', '84', '84*', '-'])
+    scores, statuses = parse_hs(hs)
+    df_bat = pd.DataFrame({'Player': ['MS Dhoni'] * 4, 'HS': hs, 'HS_Numeric': scores, 'Not_out_status': statuses})
+    assert best_hs(df_bat).loc['MS Dhoni'].tolist() == ['84*', 'Not Out']
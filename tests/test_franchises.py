@@ -0,0 +1,40 @@
+import os
+from os import path
+
+import pandas as pd
+
+from franchises import run_all_franchises, team_file_paths
+from parquet_output import load_cleaned_parquet
+from synthetic import synthetic_raw_seasons, write_raw_workbook
+
+# Each team's squad; DJ Bravo moved from csk to mi, the others only share a surname
+SQUADS = {
+    'csk': ['DJ Bravo', 'MEK Hussey', 'PA Patel'],
+    'mi': ['DM Bravo', 'MJ Hussey', 'A Patel', 'DJ Bravo']
+}
+
+
+def _write_team(input_dir, team, squad):
+    os.makedirs(path.join(input_dir, team), exist_ok=True)
+    for i, (record_type, file_path) in enumerate(team_file_paths(team, input_dir).items()):
+        seasons = synthetic_raw_seasons(record_type, len(squad), 3, seed=i)[1]
+        for df in seasons.values():
+            df['Player'] = [squad[int(name[-1])] for name in df['Player']] # 'AA Player0' -> squad[0]
+        write_raw_workbook(seasons, file_path)
+
+
+def test_players_sharing_a_surname_keep_separate_ids_across_franchises(registry, tmp_path):
+    input_dir, output_dir = str(tmp_path / 'raw_teams'), str(tmp_path / 'teams')
+    for team, squad in SQUADS.items():
+        _write_team(input_dir, team, squad)
+
+    registry_path = str(tmp_path / 'player_registry.csv')
+    run_all_franchises(list(SQUADS), workers=1, input_dir=input_dir, output_dir=output_dir,
+                       registry_path=registry_path)
+
+    ids = pd.read_csv(registry_path, dtype=str).set_index('Player')['Player_ID']
+    assert sorted(ids.index) == sorted(set(SQUADS['csk']) | set(SQUADS['mi']))
+    assert ids.is_unique # One ID per player, none shared
+    for team in SQUADS:
+        cleaned = pd.concat(load_cleaned_parquet(path.join(output_dir, team, 'parquet'))['Batting'].values())
+        assert (cleaned['Player_ID'].astype(int) == cleaned['Player'].map(ids).astype(int)).all()
@@ -0,0 +1,23 @@
+from os import path
+
+import pandas as pd
+
+import clean_excel
+from json_ingest import JSON_PREFIXES, load_season_json
+from synthetic import RAW_WORKBOOKS, write_synthetic_inputs
+
+
+def test_json_seasons_match_the_cleaned_workbooks(registry, tmp_path, monkeypatch):
+    input_dir = write_synthetic_inputs(str(tmp_path / 'raw'), 6, 3)[1]
+    monkeypatch.setattr(clean_excel, 'OUTPUT_DIR', str(tmp_path / 'out'))
+    monkeypatch.setattr(clean_excel, 'PARQUET_DIR', str(tmp_path / 'out' / 'parquet'))
+    (tmp_path / 'out').mkdir()
+
+    for record_type in JSON_PREFIXES:
+        cleaned_path = clean_excel.transform_sheets_columnar(record_type, path.join(input_dir, RAW_WORKBOOKS[record_type]))
+        from_workbook = pd.read_excel(cleaned_path, sheet_name=None)
+        from_json = load_season_json(record_type, input_dir) # Same in-memory registry, so the same IDs
+        assert list(from_json) == list(from_workbook)
+        for sheet_name, df in from_json.items():
+            pd.testing.assert_frame_equal(df, from_workbook[sheet_name])
+        assert pd.api.types.is_integer_dtype(df['Player_ID']) and pd.api.types.is_integer_dtype(df['Season'])
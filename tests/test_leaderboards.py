@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from leaderboards import ALL_TIME, LEADERBOARD_METRICS, Leaderboards
+from synthetic import synthetic_batting_frame, synthetic_bowling_frame, synthetic_fielding_frame
+
+
+def _batting(season, rows):
+    """Cleaned batting sheet from (Player_ID, Player, Inns, NO, Runs, BF) rows."""
+    df = pd.DataFrame(rows, columns=['Player_ID', 'Player', 'Inns', 'NO', 'Runs', 'BF'])
+    return df.assign(Full_Name=df['Player'], Season=season)
+
+
+def _records(frames):
+    """{record_type: {Season_YYYY: DataFrame}} from one cleaned frame per record type."""
+    return {record_type: {f"Season_{season}": df.reset_index(drop=True)
+                          for season, df in frame.groupby('Season')}
+            for record_type, frame in frames.items()}
+
+
+def _assert_same_boards(updated, rebuilt):
+    assert sorted(updated.boards) == sorted(rebuilt.boards)
+    for scope in rebuilt.boards:
+        for metric in LEADERBOARD_METRICS:
+            ids, values = updated.boards[scope][metric]
+            expected_ids, expected_values = rebuilt.boards[scope][metric]
+            assert ids.tolist() == expected_ids.tolist(), (scope, metric)
+            np.testing.assert_array_equal(values, expected_values)
+    pd.testing.assert_frame_equal(updated.totals, rebuilt.totals, check_dtype=False)
+
+
+def test_top_runs_by_season_and_all_time():
+    records = {'Batting': {
+        'Season_2010': _batting(2010, [(1, 'MS Dhoni', 10, 2, 300, 250), (2, 'SK Raina', 12, 1, 400, 300)]),
+        'Season_2011': _batting(2011, [(1, 'MS Dhoni', 8, 3, 210, 140)])}}
+    boards = Leaderboards.from_records(records)
+
+    assert boards.top('Runs', 2010)[['Player', 'Runs']].values.tolist() == [['SK Raina', 400], ['MS Dhoni', 300]]
+    # All-time: Dhoni 300 + 210 = 510 across two seasons overtakes Raina
+    assert boards.top('Runs')[['Rank', 'Player', 'Runs']].values.tolist() == [[1, 'MS Dhoni', 510], [2, 'SK Raina', 400]]
+
+
+def test_update_season_matches_a_full_rebuild():
+    frames = {'Batting': synthetic_batting_frame(30, 4), 'Bowling': synthetic_bowling_frame(30, 4),
+              'Fielding': synthetic_fielding_frame(30, 4)}
+    boards = Leaderboards.from_records(_records(frames))
+    season = int(frames['Batting']['Season'].max())
+
+    # Revise the season: more runs for every batter, one bowler dropped
+    revised = dict(frames)
+    bat = frames['Batting'].copy()
+    in_season = bat['Season'].astype(int) == season
+    bat.loc[in_season, 'Runs'] = pd.to_numeric(bat.loc[in_season, 'Runs']) + 17
+    revised['Batting'] = bat
+    bowl = frames['Bowling']
+    revised['Bowling'] = bowl.drop(bowl[bowl['Season'].astype(int) == season].index[:1])
+
+    boards.update_season(season, _records(revised))
+    _assert_same_boards(boards, Leaderboards.from_records(_records(revised)))
+
+
+def test_update_season_removes_a_season_without_rows():
+    frames = {'Batting': synthetic_batting_frame(20, 3)}
+    boards = Leaderboards.from_records(_records(frames))
+    season = int(frames['Batting']['Season'].min())
+    remaining = {'Batting': frames['Batting'][frames['Batting']['Season'].astype(int) != season]}
+
+    boards.update_season(season, _records(remaining))
+    assert season not in boards.seasons and ALL_TIME in boards.boards
+    _assert_same_boards(boards, Leaderboards.from_records(_records(remaining)))
@@ -0,0 +1,26 @@
+import openpyxl
+import pandas as pd
+
+from parquet_output import columns_to_frame, typed_frame
+
+
+def test_columns_to_frame_matches_read_excel(tmp_path):
+    headers = ['Player_ID', 'Player', 'Season', 'Runs', 'Ave', 'HS', 'HS_Numeric']
+    rows = [['002', 'MS Dhoni', 2008, '414', '41.40', '65', '=VALUE(H2)'],
+            ['007', 'JDP Oram', 2008, '94', '-', '36*', None],
+            ['011', 'M Muralidaran', 2008, None, None, None, None]]
+    wb = openpyxl.Workbook()
+    wb.active.append(headers)
+    for row in rows:
+        wb.active.append(row)
+    wb.save(tmp_path / 'sheet.xlsx')
+
+    df = columns_to_frame(headers, [list(col) for col in zip(*rows)])
+    pd.testing.assert_frame_equal(df, pd.read_excel(tmp_path / 'sheet.xlsx'))
+    assert df['Player_ID'].tolist() == [2, 7, 11] # Numbers, as from the workbook
+    assert df['Ave'].iloc[:2].tolist() == ['41.40', '-'] # A column with any text stays text
+
+
+def test_typed_frame_keeps_a_numeric_hs_as_text():
+    df = columns_to_frame(['Player', 'HS'], [['MS Dhoni', 'SK Raina'], ['64', None]])
+    assert typed_frame(df)['HS'].tolist()[0] == '64'
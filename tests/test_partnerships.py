@@ -0,0 +1,86 @@
+from itertools import combinations
+
+import pandas as pd
+
+from partnerships import PartnershipGraph, load_partnerships
+from star_schema import run_star_schema
+
+REGISTRY = """Player_ID,Player,Full_Name
+001,MS Dhoni,Mahendra Singh Dhoni
+002,SK Raina,Suresh Kumar Raina
+003,RA Jadeja,Ravindrasinh Anirudhsinh Jadeja
+004,F du Plessis,Francois du Plessis
+"""
+PARTNERSHIPS = """Partners,Player_1,Player_2,Span,Inns,NO,Runs,High,Ave,Fifties,Hundreds
+"MS Dhoni, RA Jadeja",MS Dhoni,RA Jadeja,2012-2025,68,16,1708,72,32.84,11,0
+"MS Dhoni, SK Raina",MS Dhoni,SK Raina,2008-2021,55,6,1482,74,30.24,10,0
+"SK Raina, RA Jadeja",SK Raina,RA Jadeja,2012-2021,20,4,512,61*,32.00,2,0
+"F du Plessis, SK Raina",F du Plessis,SK Raina,2012-2021,25,2,803,85,34.91,6,0
+"F du Plessis, MS Dhoni",F du Plessis,MS Dhoni,2012-2021,15,3,351,48,29.25,0,0
+"MS Dhoni, New Player",MS Dhoni,New Player,2025-2025,2,0,40,30,20.00,0,0
+"""
+
+
+def _write_inputs(tmp_path):
+    registry_path, csv_path = tmp_path / 'player_registry.csv', tmp_path / 'partnerships.csv'
+    registry_path.write_text(REGISTRY, encoding='utf-8')
+    csv_path.write_text(PARTNERSHIPS, encoding='utf-8')
+    return str(registry_path), str(csv_path)
+
+
+def test_load_partnerships_only_reads_the_registry(registry, tmp_path):
+    registry_path, csv_path = _write_inputs(tmp_path)
+    edges = load_partnerships(csv_path, registry_path)
+
+    assert (tmp_path / 'player_registry.csv').read_text(encoding='utf-8') == REGISTRY
+    assert registry.GLOBAL_PLAYER_ID_MAP == {} and registry.CURRENT_PLAYER_ID_COUNTER == 1
+    assert sorted(f.name for f in tmp_path.iterdir()) == ['partnerships.csv', 'player_registry.csv']
+
+    # The partnership with a player the registry does not know is skipped, not given a new ID
+    assert len(edges) == 5 and 'New Player' not in set(edges['Player_1']) | set(edges['Player_2'])
+    assert (edges['Player_ID_1'] < edges['Player_ID_2']).all()
+    dhoni = edges[edges['Player_1'] == 'MS Dhoni'].set_index('Player_2')
+    assert dhoni.loc['RA Jadeja', 'Full_Name_1'] == 'Mahendra Singh Dhoni'
+    assert dhoni.loc['RA Jadeja', 'Runs'] == 1708
+
+
+def test_triangles_match_every_trio_that_all_partnered(registry, tmp_path):
+    registry_path, csv_path = _write_inputs(tmp_path)
+    edges = load_partnerships(csv_path, registry_path)
+    graph = PartnershipGraph(edges)
+
+    runs = {(a, b): r for a, b, r in edges[['Player_ID_1', 'Player_ID_2', 'Runs']].itertuples(index=False)}
+    expected = sorted(((u, v, w, runs[u, v] + runs[u, w] + runs[v, w])
+                       for u, v, w in combinations(sorted(set(edges['Player_ID_1']) | set(edges['Player_ID_2'])), 3)
+                       if (u, v) in runs and (u, w) in runs and (v, w) in runs),
+                      key=lambda t: (-t[3], t[:3]))
+    assert [tuple(int(x) for x in row) for row in graph.triangles.itertuples(index=False)] == expected
+    assert len(expected) == 2
+
+
+def test_star_schema_leaves_the_registry_alone(registry, tmp_path):
+    registry_path, csv_path = _write_inputs(tmp_path)
+    records = {'Batting': {'Season_2012': pd.DataFrame({
+        'Player_ID': ['001', '003'], 'Player': ['MS Dhoni', 'RA Jadeja'],
+        'Full_Name': ['Mahendra Singh Dhoni', 'Ravindrasinh Anirudhsinh Jadeja'], 'Season': [2012, 2012],
+        'Runs': [358, 191], 'HS': ['70*', '48']})}}
+    tables = run_star_schema(records, str(tmp_path / 'no_results.csv'), csv_path, out_dir=str(tmp_path / 'star'),
+                             output_path=str(tmp_path / 'star.xlsx'), registry_path=registry_path)
+
+    assert (tmp_path / 'player_registry.csv').read_text(encoding='utf-8') == REGISTRY
+    assert registry.GLOBAL_PLAYER_ID_MAP == {} and registry.CURRENT_PLAYER_ID_COUNTER == 1
+    assert list(tables['dim_player']['Player_Key']) == [1, 2, 3, 4]
+    assert len(tables['fact_partnership']) == 5
+
+
+def test_triangles_with_large_registry_ids():
+    # Player_IDs from a shared multi-franchise registry; memory must follow the edges, not the IDs
+    pairs = [(7, 40001, 100), (7, 90002, 50), (40001, 90002, 25), (90002, 90003, 10)]
+    edges = pd.DataFrame({'Player_ID_1': [a for a, _, _ in pairs], 'Player_ID_2': [b for _, b, _ in pairs],
+                          'Runs': [r for _, _, r in pairs]})
+    for side in ['1', '2']:
+        edges[f'Player_{side}'] = edges[f'Player_ID_{side}'].map(lambda pid: f'P{pid}')
+        edges[f'Full_Name_{side}'] = edges[f'Player_{side}']
+    graph = PartnershipGraph(edges)
+
+    assert [tuple(int(x) for x in row) for row in graph.triangles.itertuples(index=False)] == [(7, 40001, 90002, 175)]
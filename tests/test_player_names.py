@@ -0,0 +1,43 @@
+import pytest
+
+import clean_excel
+from player_names import NameResolver
+
+
+@pytest.fixture
+def resolver():
+    return NameResolver(clean_excel.FULL_PLAYER_NAMES)
+
+
+@pytest.mark.parametrize('known, other', [('DJ Bravo', 'DM Bravo'), ('MEK Hussey', 'MJ Hussey'), ('PA Patel', 'A Patel')])
+def test_players_sharing_a_surname_keep_separate_ids(registry, known, other):
+    assert registry._get_or_assign_player_id(known) != registry._get_or_assign_player_id(other)
+    assert registry._get_or_assign_player_id(other) != registry._get_or_assign_player_id(known)
+
+
+def test_directory_aliases_still_share_an_id(registry, monkeypatch):
+    monkeypatch.setitem(registry.FULL_PLAYER_NAMES, 'Michael Hussey', 'Michael Edward Killeen Hussey')
+    assert registry._get_or_assign_player_id('MEK Hussey') == registry._get_or_assign_player_id('Michael Hussey')
+
+
+@pytest.mark.parametrize('name', ['DM Bravo', 'MJ Hussey', 'A Patel', 'S Singh', 'M Sharma', 'J Morkel'])
+def test_contradicting_initials_stay_unresolved(resolver, name):
+    assert resolver.full_name(name) == name
+    assert name in set(resolver.unresolved_report()['Name'])
+
+
+@pytest.mark.parametrize('name, full_name', [
+    ('MEK Hussey', 'Michael Edward Killeen Hussey'),
+    ('M.E.K. Hussey', 'Michael Edward Killeen Hussey'),
+    ('Michael Hussey', 'Michael Edward Killeen Hussey'),
+    ('Mohit Sharma', 'Mohit Mahipal Sharma')
+])
+def test_agreeing_names_resolve(resolver, name, full_name):
+    assert resolver.full_name(name) == full_name
+
+
+def test_fuzzy_candidate_is_only_reported(resolver):
+    player, method, score = resolver.match('DM Bravo')
+    assert method == 'unresolved'
+    report = resolver.resolve(['DM Bravo'])
+    assert report.loc[0, 'Player'] == 'DM Bravo' and report.loc[0, 'Method'] == 'unresolved'